@@ -1,81 +1,58 @@
 import streamlit as st
-import re
-import pyperclip
 
-# Mapping dictionary from number strings to characters
-number_to_char = {
-    '00': 'A', '01': 'B', '02': 'C', '03': 'D', '04': 'E', '05': 'F',
-    '06': 'G', '07': 'H', '08': 'I', '09': 'J', '10': 'K', '11': 'L',
-    '12': 'M', '13': 'N', '14': 'O', '15': 'P', '16': 'Q', '17': 'R',
-    '18': 'S', '19': 'T', '20': 'U', '21': 'V', '22': 'W', '23': 'X',
-    '24': 'Y', '25': 'Z', '26': 'a', '27': 'b', '28': 'c', '29': 'd',
-    '30': 'e', '31': 'f', '32': 'g', '33': 'h', '34': 'i', '35': 'j',
-    '36': 'k', '37': 'l', '38': 'm', '39': 'n', '40': 'o', '41': 'p',
-    '42': 'q', '43': 'r', '44': 's', '45': 't', '46': 'u', '47': 'v',
-    '48': 'w', '49': 'x', '50': 'y', '51': 'z', '52': '0', '53': '1',
-    '54': '2', '55': '3', '56': '4', '57': '5', '58': '6', '59': '7',
-    '60': '8', '61': '9', '62': '.', '63': ',', '64': '?', '65': '!',
-    '66': ';', '67': ':', '68': "'", '69': '"', '70': '-', '71': '—',
-    '72': '(', '73': ')', '74': '[', '75': ']', '76': '{', '77': '}',
-    '78': '/', '79': '\\', '80': '|', '81': '@', '82': '#', '83': '$',
-    '84': '%', '85': '^', '86': '&', '87': '*', '88': '_', '89': '~',
-    '90': '`', '91': '<', '92': '>', '93': '=', '94': ' ', '95': '\t',
-    '96': '\n', '97': '\r'
-}
+from leecode_codecs import iter_decode, iter_encode
+from leecode_core import char_to_number, enable_cache, get_codec
+from leecode_dispatch import decode_result, encode
 
-# Reverse the dictionary for encoding
-char_to_number = {v: k for k, v in number_to_char.items()}
+# Shared codec; repeated inputs are served from its result cache
+enable_cache()
 
-def clean_input(text):
-    """Clean input: collapse multiple spaces."""
-    text = re.sub(r' +', ' ', text)
-    return text
-
-def encode(text):
-    """Encode a string using Leecode format."""
-    if not text:
-        return ""
-    
-    text = clean_input(text)
-    encoded = ''
-    for char in text:
-        if char in char_to_number:
-            encoded += char_to_number[char]
-        else:
-            raise ValueError(f"Character '{char}' (Unicode: {ord(char)}) not supported in Leecode mapping.")
-    return encoded
-
-def decode(code):
-    """Decode a Leecode string (must be even-length)."""
-    if not code:
-        return ""
-    
-    # Remove any whitespace or non-digit characters
-    code = re.sub(r'[^0-9]', '', code)
-    
-    if len(code) % 2 != 0:
-        raise ValueError("Encoded string length must be even (pairs of digits).")
-    
-    decoded = ''
-    for i in range(0, len(code), 2):
-        part = code[i:i+2]
-        if part in number_to_char:
-            decoded += number_to_char[part]
-        else:
-            raise ValueError(f"Code '{part}' not found in Leecode mapping.")
-    return decoded
+# Characters of a result rendered on the page; the full result is offered as a
+# download. Inputs up to this size go through the dispatcher and its cache in
+# one call; larger ones are streamed so output shows up while it is produced.
+PREVIEW_CHARS = 20_000
 
 def copy_to_clipboard(text, label):
     """Helper function to create a copy button."""
     if st.button(f"📋 Copy {label}", key=f"copy_{label}"):
         try:
-            # Fallback method since pyperclip might not work in all environments
+            # The server has no access to the visitor's clipboard, so show the text for copying
             st.code(text, language=None)
             st.success(f"{label} copied to display! Select and copy manually if needed.")
         except Exception as e:
             st.code(text, language=None)
             st.info(f"Manual copy required. {label} displayed above.")
 
+def stream_result(pieces, placeholder, expected_length):
+    """Collect streamed result pieces, showing a capped preview as soon as the first one arrives."""
+    parts = []
+    produced = 0
+    shown = 0
+    progress = st.progress(0)
+    try:
+        for piece in pieces:
+            parts.append(piece)
+            if produced < PREVIEW_CHARS:
+                placeholder.code(''.join(parts)[:PREVIEW_CHARS], language=None)
+            produced += len(piece)
+            # Only whole-percent steps are sent to the browser
+            percent = min(100 * produced // max(expected_length, 1), 100)
+            if percent > shown:
+                progress.progress(percent)
+                shown = percent
+    finally:
+        progress.empty()
+    return ''.join(parts)
+
+def show_result(result, label, key, copy_label, file_name):
+    """Show a result capped to PREVIEW_CHARS, with the full result as a download."""
+    st.text_area(label, value=result[:PREVIEW_CHARS], height=200, disabled=True, key=key)
+    if len(result) > PREVIEW_CHARS:
+        st.caption(f"Showing the first {PREVIEW_CHARS:,} of {len(result):,} characters.")
+    else:
+        copy_to_clipboard(result, copy_label)
+    st.download_button("💾 Download", result, file_name=file_name, mime="text/plain", key=f"download_{key}")
+
 # Streamlit App Configuration
 st.set_page_config(
     page_title="Leecode Encoder/Decoder",
@@ -107,31 +84,33 @@ with tab1:
         
         if st.button("🔐 Encode Text", key="encode_btn"):
             if input_text:
-                try:
-                    encoded_result = encode(input_text)
-                    st.session_state.encoded_result = encoded_result
-                    st.success("Text encoded successfully!")
-                except ValueError as e:
-                    st.error(f"Encoding Error: {str(e)}")
-                    st.session_state.encoded_result = ""
+                # Encoded in the result column, so output shows up while it is produced
+                st.session_state.encode_pending = input_text
             else:
                 st.warning("Please enter some text to encode.")
                 st.session_state.encoded_result = ""
     
     with col2:
         st.subheader("Encoded Result")
-        if hasattr(st.session_state, 'encoded_result') and st.session_state.encoded_result:
-            st.text_area(
-                "Leecode:",
-                value=st.session_state.encoded_result,
-                height=200,
-                disabled=True,
-                key="encode_output"
-            )
-            copy_to_clipboard(st.session_state.encoded_result, "Encoded Text")
-            st.info(f"Character count: {len(input_text)} → Code length: {len(st.session_state.encoded_result)}")
+        output = st.empty()
+        pending = st.session_state.pop('encode_pending', None)
+        if pending is not None:
+            try:
+                if len(pending) <= PREVIEW_CHARS:
+                    st.session_state.encoded_result = encode(pending)
+                else:
+                    st.session_state.encoded_result = stream_result(
+                        iter_encode(pending), output, get_codec().width * len(pending))
+                st.success("Text encoded successfully!")
+            except ValueError as e:
+                st.error(f"Encoding Error: {str(e)}")
+                st.session_state.encoded_result = ""
+        if st.session_state.get('encoded_result'):
+            with output.container():
+                show_result(st.session_state.encoded_result, "Leecode:", "encode_output", "Encoded Text", "encoded.lc")
+                st.info(f"Character count: {len(input_text)} → Code length: {len(st.session_state.encoded_result)}")
         else:
-            st.text_area(
+            output.text_area(
                 "Leecode:",
                 value="",
                 height=200,
@@ -157,32 +136,36 @@ with tab2:
         
         if st.button("🔓 Decode Leecode", key="decode_btn"):
             if input_code:
-                try:
-                    decoded_result = decode(input_code)
-                    st.session_state.decoded_result = decoded_result
-                    st.success("Leecode decoded successfully!")
-                except ValueError as e:
-                    st.error(f"Decoding Error: {str(e)}")
-                    st.session_state.decoded_result = ""
+                # Decoded in the result column, so output shows up while it is produced
+                st.session_state.decode_pending = input_code
             else:
                 st.warning("Please enter a Leecode to decode.")
                 st.session_state.decoded_result = ""
     
     with col2:
         st.subheader("Decoded Result")
-        if hasattr(st.session_state, 'decoded_result') and st.session_state.decoded_result:
-            st.text_area(
-                "Decoded Text:",
-                value=st.session_state.decoded_result,
-                height=200,
-                disabled=True,
-                key="decode_output"
-            )
-            copy_to_clipboard(st.session_state.decoded_result, "Decoded Text")
-            clean_code = re.sub(r'[^0-9]', '', input_code)
-            st.info(f"Code length: {len(clean_code)} → Character count: {len(st.session_state.decoded_result)}")
+        output = st.empty()
+        pending = st.session_state.pop('decode_pending', None)
+        if pending is not None:
+            try:
+                if len(pending) <= PREVIEW_CHARS:
+                    result = decode_result(pending)
+                    st.session_state.decoded_result = result.output
+                    st.session_state.decoded_code_length = result.cleaned_length
+                else:
+                    decoded = stream_result(iter_decode(pending), output, len(pending) // get_codec().width)
+                    st.session_state.decoded_result = decoded
+                    st.session_state.decoded_code_length = get_codec().width * len(decoded)
+                st.success("Leecode decoded successfully!")
+            except ValueError as e:
+                st.error(f"Decoding Error: {str(e)}")
+                st.session_state.decoded_result = ""
+        if st.session_state.get('decoded_result'):
+            with output.container():
+                show_result(st.session_state.decoded_result, "Decoded Text:", "decode_output", "Decoded Text", "decoded.txt")
+                st.info(f"Code length: {st.session_state.decoded_code_length} → Character count: {len(st.session_state.decoded_result)}")
         else:
-            st.text_area(
+            output.text_area(
                 "Decoded Text:",
                 value="",
                 height=200,
@@ -237,4 +220,5 @@ st.markdown("""
 - Only characters in the reference table are supported
 - Whitespace is automatically cleaned (multiple spaces become single spaces)
 - Copy functionality displays the result for manual copying
+- Large results show a preview while they are produced; download the full result with the Download button
 """)
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Leecode Command Line
+Encodes or decodes whole files, streaming gzip/bz2/xz archives on either side,
+mirrors directory trees incrementally and searches encoded files directly
+or through an n-gram index, packs block-framed containers, ships encoded
+files as rsync-style deltas, reports symbol statistics and calibrates the
+encode/decode engine dispatcher for this machine.
+"""
+
+import argparse
+import os
+import sys
+
+# Subcommand modules are imported when their subcommand runs, so each
+# invocation only pays for what it uses
+from leecode_delta import BLOCK_SYMBOLS as DELTA_BLOCK_SYMBOLS
+from leecode_frame import BLOCK_SYMBOLS
+from leecode_io import COMPRESSION_MODULES, SUFFIX
+
+def _add_transcode_parser(subparsers, mode):
+    """Add the encode or decode subcommand."""
+    parser = subparsers.add_parser(mode, help=f"{mode} a file")
+    parser.add_argument('input', help="input file, or - for stdin")
+    parser.add_argument('output', help="output file, or - for stdout")
+    parser.add_argument('--codec', help="registered codec name (default: leecode)")
+    parser.add_argument('--compress', choices=sorted(COMPRESSION_MODULES) + ['none'],
+                        help="output compression (default: from the output extension)")
+    parser.add_argument('--decompress', choices=sorted(COMPRESSION_MODULES) + ['none'],
+                        help="input compression (default: from the input extension)")
+    parser.add_argument('--no-threads', action='store_true',
+                        help="read, convert and write on the main thread instead of a pipeline")
+    parser.add_argument('--stats', action='store_true',
+                        help="report how long each pipeline stage was busy and stalled")
+    if mode == 'encode':
+        parser.add_argument('--verify', action='store_true',
+                            help="decode the output again in the same pass and compare it with the input")
+
+def _run_verify(args):
+    """Encode with a same-pass round-trip check; exits 1 on the first mismatch."""
+    from leecode_io import verify_file
+    report = verify_file(args.input, args.output, codec=args.codec,
+                         compression=args.compress, input_compression=args.decompress)
+    print(f"Encoded {report.bytes_read} bytes into {report.bytes_written} bytes "
+          f"(source crc32 {report.source_crc:08x}, round trip crc32 {report.decoded_crc:08x})", file=sys.stderr)
+    if report.mismatch is not None:
+        print(f"Error: round trip differs at character {report.mismatch}", file=sys.stderr)
+        return 1
+    print(f"Verified {report.symbols} characters", file=sys.stderr)
+
+def _run_transcode(args):
+    """Run the encode or decode subcommand."""
+    from leecode_io import format_report, pipeline_file, transcode_file
+    if getattr(args, 'verify', False):
+        return _run_verify(args)
+    if args.stats and not args.no_threads:
+        report = pipeline_file(args.input, args.output, args.command, codec=args.codec,
+                               compression=args.compress, input_compression=args.decompress)
+        print(format_report(report), file=sys.stderr)
+        return
+    read, written = transcode_file(args.input, args.output, args.command, codec=args.codec,
+                                   compression=args.compress, input_compression=args.decompress,
+                                   threaded=not args.no_threads)
+    print(f"{args.command.capitalize()}d {read} bytes into {written} bytes", file=sys.stderr)
+
+def _add_mirror_parser(subparsers):
+    """Add the mirror subcommand."""
+    parser = subparsers.add_parser('mirror', help="mirror a directory tree, skipping unchanged files")
+    parser.add_argument('source', help="source directory")
+    parser.add_argument('target', help="mirrored directory (holds the manifest)")
+    parser.add_argument('--decode', action='store_true', help="decode an encoded tree instead")
+    parser.add_argument('--codec', help="registered codec name (default: leecode)")
+    parser.add_argument('--suffix', default=SUFFIX, help=f"encoded file suffix (default: {SUFFIX})")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (0 = in-process)")
+    parser.add_argument('--keep', action='store_true', help="keep outputs of deleted source files")
+    parser.add_argument('--watch', action='store_true', help="keep polling for changes")
+    parser.add_argument('--interval', type=float, default=2.0, help="watch polling interval in seconds")
+
+def _report(result):
+    """Print a one-line mirror summary and any per-file errors."""
+    for path, message in result.errors:
+        print(f"Error: {path}: {message}", file=sys.stderr)
+    print(f"Processed {result.processed}, skipped {result.skipped}, removed {result.removed}, "
+          f"failed {len(result.errors)}", file=sys.stderr)
+
+def _run_mirror(args):
+    """Run the mirror subcommand."""
+    from leecode_mirror import mirror, watch
+    options = dict(mode='decode' if args.decode else 'encode', codec=args.codec, suffix=args.suffix,
+                   workers=args.workers, prune=not args.keep)
+    if args.watch:
+        try:
+            watch(args.source, args.target, args.interval, on_update=_report, **options)
+        except KeyboardInterrupt:
+            pass
+        return 0
+    result = mirror(args.source, args.target, **options)
+    _report(result)
+    return 1 if result.errors else 0
+
+def _add_grep_parser(subparsers):
+    """Add the grep subcommand."""
+    parser = subparsers.add_parser('grep', help="search encoded files without decoding them")
+    parser.add_argument('pattern', help="plain text to search for")
+    parser.add_argument('files', nargs='+', help="encoded files (gzip/bz2/xz archives are streamed)")
+    parser.add_argument('-C', '--context', type=int, default=0, help="decoded characters of context")
+    parser.add_argument('-c', '--count', action='store_true', help="only print match counts per file")
+    parser.add_argument('--codec', help="registered codec name (default: leecode)")
+    parser.add_argument('--workers', type=int, default=0, help="worker processes (0 = in-process)")
+
+def _run_grep(args):
+    """Run the grep subcommand; exits 1 when nothing matched, like grep."""
+    from leecode_grep import grep
+    counts = dict.fromkeys(args.files, 0)
+    for match in grep(args.files, args.pattern, args.codec, args.context, args.workers):
+        counts[match.path] += 1
+        if not args.count:
+            line = f"{match.path}:{match.offset}"
+            if args.context:
+                line += ":" + repr(match.before + args.pattern + match.after)[1:-1]
+            print(line)
+    if args.count:
+        for path, count in counts.items():
+            print(f"{path}:{count}")
+    return 0 if any(counts.values()) else 1
+
+def _add_index_parsers(subparsers):
+    """Add the index and query subcommands."""
+    parser = subparsers.add_parser('index', help="add or refresh encoded files in an n-gram index")
+    parser.add_argument('index', help="index directory")
+    parser.add_argument('files', nargs='*', help="encoded files (default: re-check the indexed files)")
+    parser.add_argument('-n', type=int, default=3, help="n-gram length for a new index")
+    parser.add_argument('--block-size', type=int, default=4096, help="characters per block for a new index")
+    parser.add_argument('--codec', help="registered codec name for a new index (default: leecode)")
+
+    parser = subparsers.add_parser('query', help="search an n-gram index")
+    parser.add_argument('index', help="index directory")
+    parser.add_argument('pattern', help="plain text to search for")
+
+def _run_index(args):
+    """Run the index subcommand."""
+    from leecode_index import NgramIndex
+    with NgramIndex(args.index, args.n, args.codec, args.block_size) as index:
+        result = index.update(args.files or index.files)
+    print(f"Indexed {result.indexed}, unchanged {result.unchanged}, removed {result.removed}",
+          file=sys.stderr)
+
+def _run_query(args):
+    """Run the query subcommand; exits 1 when nothing matched."""
+    from leecode_index import NgramIndex
+    with NgramIndex(args.index) as index:
+        matches = index.search(args.pattern)
+    for match in matches:
+        print(f"{match.path}:{match.offset}")
+    return 0 if matches else 1
+
+def _add_stats_parser(subparsers):
+    """Add the stats subcommand."""
+    parser = subparsers.add_parser('stats', help="symbol frequency histogram of plain or encoded files")
+    parser.add_argument('files', nargs='+', help="plain or encoded files (gzip/bz2/xz archives are streamed)")
+    kind = parser.add_mutually_exclusive_group()
+    kind.add_argument('--encoded', action='store_true', default=None,
+                      help=f"treat all files as encoded (default: files ending in {SUFFIX})")
+    kind.add_argument('--plain', action='store_false', dest='encoded', help="treat all files as plain text")
+    parser.add_argument('--format', choices=['json', 'csv'], default='json')
+    parser.add_argument('--codec', help="registered codec name (default: leecode)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (0 = in-process)")
+
+def _run_stats(args):
+    """Run the stats subcommand."""
+    from leecode_stats import collect_stats, write_csv, write_json
+    stats = collect_stats(args.files, args.encoded, args.codec, args.workers)
+    write = write_csv if args.format == 'csv' else write_json
+    write(stats, sys.stdout, args.codec)
+
+def _add_frame_parsers(subparsers):
+    """Add the frame and unframe subcommands."""
+    parser = subparsers.add_parser('frame', help="write a block-framed container")
+    parser.add_argument('input', help="UTF-8 text file (or legacy Leecode file with --legacy), or - for stdin")
+    parser.add_argument('output', help="framed output file, or - for stdout")
+    parser.add_argument('--legacy', action='store_true', help="convert a legacy Leecode file instead of encoding text")
+    parser.add_argument('--block-size', type=int, default=BLOCK_SYMBOLS, help="characters per block")
+    parser.add_argument('--codec', help="registered codec name (default: leecode)")
+
+    parser = subparsers.add_parser('unframe', help="decode a block-framed container")
+    parser.add_argument('input', help="framed input file, or - for stdin")
+    parser.add_argument('output', help="UTF-8 text file (or legacy Leecode file with --legacy), or - for stdout")
+    parser.add_argument('--legacy', action='store_true', help="write a legacy Leecode file instead of text")
+    parser.add_argument('--replace', action='store_true',
+                        help="replace corrupt blocks with U+FFFD instead of stopping (--legacy: drop them)")
+    parser.add_argument('--codec', help="registered codec name (default: leecode)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (0 = in-process)")
+
+def _run_frame(args):
+    """Run the frame subcommand."""
+    from leecode_frame import encode_framed
+    blocks = encode_framed(args.input, args.output, args.codec, args.block_size, legacy=args.legacy)
+    print(f"Wrote {blocks} blocks", file=sys.stderr)
+
+def _run_unframe(args):
+    """Run the unframe subcommand; exits 1 when a block was corrupt."""
+    from leecode_frame import decode_framed
+    report = decode_framed(args.input, args.output, args.codec, args.workers,
+                           errors='replace' if args.replace else 'strict', legacy=args.legacy)
+    print(f"Read {report.blocks} blocks, {report.symbols} characters", file=sys.stderr)
+    for index in report.corrupt:
+        print(f"Error: block {index} is corrupt", file=sys.stderr)
+    return 1 if report.corrupt else 0
+
+def _add_calibrate_parser(subparsers):
+    """Add the calibrate subcommand."""
+    parser = subparsers.add_parser('calibrate', help="time the encode/decode engines and save the crossover sizes")
+    parser.add_argument('--profile', help="profile file (default: $LEECODE_PROFILE or ~/.config/leecode/profile.json)")
+
+def _run_calibrate(args):
+    """Run the calibrate subcommand."""
+    from leecode_dispatch import calibrate
+    profile = calibrate(args.profile)
+    for engine in ('numpy', 'wide', 'threads'):
+        threshold = profile[engine]
+        print(f"{engine}: " + ("never" if threshold is None else f"from {threshold} characters"))
+
+def _add_delta_parsers(subparsers):
+    """Add the signature, delta and patch subcommands."""
+    parser = subparsers.add_parser('signature', help="write the block signature of an encoded file")
+    parser.add_argument('old', help="encoded file the receiving side already has")
+    parser.add_argument('signature', help="signature file to write")
+    parser.add_argument('--block-size', type=int, default=DELTA_BLOCK_SYMBOLS, help="characters per block")
+    parser.add_argument('--codec', help="registered codec name (default: leecode)")
+
+    parser = subparsers.add_parser('delta', help="write the delta from a signature to a new encoded file")
+    parser.add_argument('signature', help="signature of the old file")
+    parser.add_argument('new', help="new encoded file")
+    parser.add_argument('delta', help="delta file to write")
+    parser.add_argument('--compress', choices=sorted(COMPRESSION_MODULES) + ['none'],
+                        help="delta compression (default: from the delta extension)")
+    parser.add_argument('--codec', help="registered codec name (default: leecode)")
+
+    parser = subparsers.add_parser('patch', help="rebuild a new encoded file from the old one and a delta")
+    parser.add_argument('old', help="old encoded file")
+    parser.add_argument('delta', help="delta file")
+    parser.add_argument('output', help="rebuilt file to write")
+    parser.add_argument('--decompress', choices=sorted(COMPRESSION_MODULES) + ['none'],
+                        help="delta compression (default: from the delta extension)")
+    parser.add_argument('--codec', help="registered codec name (default: leecode)")
+
+def _run_signature(args):
+    """Run the signature subcommand."""
+    from leecode_delta import signature_file
+    blocks = signature_file(args.old, args.signature, args.codec, args.block_size)
+    print(f"Wrote {blocks} block signatures", file=sys.stderr)
+
+def _run_delta(args):
+    """Run the delta subcommand."""
+    from leecode_delta import delta_file
+    report = delta_file(args.signature, args.new, args.delta, args.codec, args.compress)
+    print(f"Copied {report.copied} bytes, sent {report.literal} literal bytes in {report.ops} ops",
+          file=sys.stderr)
+
+def _run_patch(args):
+    """Run the patch subcommand."""
+    from leecode_delta import patch_file
+    written = patch_file(args.old, args.delta, args.output, args.codec, args.decompress)
+    print(f"Rebuilt {written} bytes", file=sys.stderr)
+
+def _add_fuzz_parser(subparsers):
+    """Add the fuzz subcommand."""
+    parser = subparsers.add_parser('fuzz', help="check every encode/decode engine against the reference")
+    parser.add_argument('--iterations', type=int, default=200, help="generated cases per mode")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    parser.add_argument('--max-size', type=int, default=200, help="largest generated input, in characters")
+    parser.add_argument('--huge', action='store_true', help="also run one input of about 1M characters")
+    parser.add_argument('--codec', help="registered codec name (default: leecode)")
+
+def _run_fuzz(args):
+    """Run the fuzz subcommand; exits 1 when any engine disagrees with the reference."""
+    from leecode_fuzz import fuzz
+    failures = fuzz(args.iterations, args.seed, args.codec, args.max_size, args.huge)
+    for failure in failures:
+        print(f"Error: {failure.backend} {failure.mode} {failure.input!r}: "
+              f"expected {failure.expected!r}, got {failure.actual!r}", file=sys.stderr)
+    if not failures:
+        print("All engines agree with the reference", file=sys.stderr)
+    return 1 if failures else 0
+
+COMMANDS = {
+    'encode': _run_transcode, 'decode': _run_transcode, 'mirror': _run_mirror, 'grep': _run_grep,
+    'index': _run_index, 'query': _run_query, 'stats': _run_stats, 'calibrate': _run_calibrate,
+    'frame': _run_frame, 'unframe': _run_unframe, 'fuzz': _run_fuzz,
+    'signature': _run_signature, 'delta': _run_delta, 'patch': _run_patch,
+}
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(prog='leecode', description="Leecode file tools.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    _add_transcode_parser(subparsers, 'encode')
+    _add_transcode_parser(subparsers, 'decode')
+    _add_mirror_parser(subparsers)
+    _add_grep_parser(subparsers)
+    _add_index_parsers(subparsers)
+    _add_stats_parser(subparsers)
+    _add_frame_parsers(subparsers)
+    _add_delta_parsers(subparsers)
+    _add_calibrate_parser(subparsers)
+    _add_fuzz_parser(subparsers)
+    args = parser.parse_args(argv)
+
+    try:
+        return COMMANDS[args.command](args) or 0
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
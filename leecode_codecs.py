@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Leecode Text Codec
+Registers Leecode with Python's codecs module, so files and streams can be
+opened with encoding='leecode' (or 'leecode-<name>' for registered alphabets).
+Pass newline='' to keep encoded carriage returns (code 97) intact.
+iter_encode()/iter_decode() stream a string piece by piece through the
+same incremental classes.
+"""
+
+import codecs
+
+from leecode_core import (
+    DEFAULT_CODEC, _NON_DIGIT_BYTES, _clean_chunk, _strip_non_digits, available_codecs, get_codec,
+)
+
+# Input characters converted per piece by iter_encode() and iter_decode()
+ITER_CHUNK = 1 << 16
+
+def _check_errors(errors):
+    """Leecode has no sensible replacement characters, so only strict errors are supported."""
+    if errors != 'strict':
+        raise ValueError(f"Leecode codec only supports errors='strict', not '{errors}'.")
+
+def _encode_error(codec, name, text, error):
+    """Turn a codec ValueError into a UnicodeEncodeError pointing at the bad character."""
+    for position, char in enumerate(text):
+        if char not in codec.char_to_number:
+            return UnicodeEncodeError(name, text, position, position + 1, str(error))
+    return UnicodeEncodeError(name, text, 0, len(text), str(error))
+
+def _decode_error(name, data, error):
+    """Turn a codec ValueError into a UnicodeDecodeError."""
+    return UnicodeDecodeError(name, bytes(data), 0, len(data), str(error))
+
+def _leftover_start(data, count):
+    """Return the index in data of the last count digits, which form an incomplete code."""
+    index = len(data)
+    while count:
+        index -= 1
+        if 48 <= data[index] <= 57:
+            count -= 1
+    return index
+
+def _decode_chunk(codec, name, data, final):
+    """Decode whole codes from data; returns (text, bytes consumed)."""
+    data = bytes(data)
+    digits = data.translate(None, _NON_DIGIT_BYTES)
+    # Unless this is the last chunk, hold back the digits of an incomplete code
+    leftover = 0 if final else len(digits) % codec.width
+    try:
+        text = codec.decode_digits(digits[:len(digits) - leftover])
+    except ValueError as e:
+        raise _decode_error(name, data, e) from None
+    return text, _leftover_start(data, leftover)
+
+def _codec_info(name, codec):
+    """Build the CodecInfo, with incremental and stream classes, for one compiled codec."""
+
+    def encode(input, errors='strict'):
+        _check_errors(errors)
+        try:
+            return codec.encode_bytes(input), len(input)
+        except ValueError as e:
+            raise _encode_error(codec, name, input, e) from None
+
+    def decode(input, errors='strict'):
+        _check_errors(errors)
+        return _decode_chunk(codec, name, input, True)[0], len(input)
+
+    class IncrementalEncoder(codecs.IncrementalEncoder):
+        """Encoder that collapses space runs across chunk boundaries."""
+
+        def __init__(self, errors='strict'):
+            _check_errors(errors)
+            super().__init__(errors)
+            self.after_space = False
+
+        def encode(self, input, final=False):
+            # A run that continues from the previous chunk already produced its space
+            input, self.after_space = _clean_chunk(input, self.after_space)
+            if not input:
+                return b''
+            try:
+                return codec.encode_bytes(input)
+            except ValueError as e:
+                raise _encode_error(codec, name, input, e) from None
+
+        def reset(self):
+            self.after_space = False
+
+        def getstate(self):
+            return int(self.after_space)
+
+        def setstate(self, state):
+            self.after_space = bool(state)
+
+    class IncrementalDecoder(codecs.BufferedIncrementalDecoder):
+        """Decoder that holds back the digits of an incomplete code until the next chunk."""
+
+        def __init__(self, errors='strict'):
+            _check_errors(errors)
+            super().__init__(errors)
+
+        def _buffer_decode(self, input, errors, final):
+            return _decode_chunk(codec, name, input, final)
+
+    class StreamWriter(codecs.StreamWriter):
+        def __init__(self, stream, errors='strict'):
+            super().__init__(stream, errors)
+            self.encoder = IncrementalEncoder(errors)
+
+        def encode(self, input, errors='strict'):
+            return self.encoder.encode(input), len(input)
+
+        def reset(self):
+            self.encoder.reset()
+            super().reset()
+
+    class StreamReader(codecs.StreamReader):
+        def decode(self, input, errors='strict'):
+            return _decode_chunk(codec, name, input, False)
+
+        def read(self, size=-1, chars=-1, firstline=False):
+            text = super().read(size, chars, firstline)
+            # At end of stream, digits of an incomplete code are an error
+            if size < 0 or not text:
+                _decode_chunk(codec, name, self.bytebuffer, True)
+            return text
+
+    return codecs.CodecInfo(
+        name=name,
+        encode=encode,
+        decode=decode,
+        incrementalencoder=IncrementalEncoder,
+        incrementaldecoder=IncrementalDecoder,
+        streamwriter=StreamWriter,
+        streamreader=StreamReader,
+    )
+
+def codec_info(codec=None):
+    """Return the CodecInfo for a Codec, registered name or mapping (default: Leecode)."""
+    codec = get_codec(codec)
+    if codec is DEFAULT_CODEC:
+        return codecs.lookup('leecode')
+    return _codec_info('leecode_custom', codec)
+
+def iter_encode(text, codec=None, chunk_size=ITER_CHUNK):
+    """Yield the Leecode of text as str pieces, chunk_size input characters at a time.
+
+    The first piece is ready after one chunk, however long text is. An
+    unsupported character raises the same ValueError as encode() once its
+    chunk is reached.
+    """
+    encoder = codec_info(codec).incrementalencoder()
+    for start in range(0, len(text), chunk_size):
+        try:
+            piece = encoder.encode(text[start:start + chunk_size])
+        except UnicodeError as e:
+            raise ValueError(e.reason) from None
+        if piece:
+            yield piece.decode('ascii')
+
+def iter_decode(code, codec=None, chunk_size=ITER_CHUNK):
+    """Yield the decoding of a Leecode string as str pieces, chunk_size input characters at a time.
+
+    Errors are the ones decode() raises, in the same order: an unknown code
+    is only reported once the whole input is known to have a whole number
+    of codes. Pieces before the error have already been yielded.
+    """
+    codec = get_codec(codec)
+    decoder = codec_info(codec).incrementaldecoder()
+    for start in range(0, len(code), chunk_size):
+        try:
+            piece = decoder.decode(code[start:start + chunk_size].encode('utf-8'), start + chunk_size >= len(code))
+        except UnicodeError as e:
+            # decode() checks the length before looking codes up
+            if len(_strip_non_digits(code)) % codec.width:
+                raise codec._length_error() from None
+            raise ValueError(e.reason) from None
+        if piece:
+            yield piece
+
+def _normalize(name):
+    """Normalize a codec name the way codecs.lookup() does."""
+    return name.lower().replace('-', '_').replace(' ', '_')
+
+def search(name):
+    """codecs search function for 'leecode' and 'leecode-<registered codec>'."""
+    name = _normalize(name)
+    if name == 'leecode':
+        return _codec_info('leecode', DEFAULT_CODEC)
+    if name.startswith('leecode_'):
+        for registered in available_codecs():
+            if _normalize(registered) == name[len('leecode_'):]:
+                return _codec_info(name, get_codec(registered))
+    return None
+
+_registered = False
+
+def register():
+    """Register the Leecode search function with codecs (once)."""
+    global _registered
+    if not _registered:
+        codecs.register(search)
+        _registered = True
+
+register()
@@ -0,0 +1,667 @@
+#!/usr/bin/env python3
+"""
+Leecode Core Codec
+Shared mapping and encode/decode logic used by the web, Android and desktop apps.
+"""
+
+import codecs
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from itertools import accumulate
+
+# Mapping dictionary from number strings to characters
+number_to_char = {
+    '00': 'A', '01': 'B', '02': 'C', '03': 'D', '04': 'E', '05': 'F',
+    '06': 'G', '07': 'H', '08': 'I', '09': 'J', '10': 'K', '11': 'L',
+    '12': 'M', '13': 'N', '14': 'O', '15': 'P', '16': 'Q', '17': 'R',
+    '18': 'S', '19': 'T', '20': 'U', '21': 'V', '22': 'W', '23': 'X',
+    '24': 'Y', '25': 'Z', '26': 'a', '27': 'b', '28': 'c', '29': 'd',
+    '30': 'e', '31': 'f', '32': 'g', '33': 'h', '34': 'i', '35': 'j',
+    '36': 'k', '37': 'l', '38': 'm', '39': 'n', '40': 'o', '41': 'p',
+    '42': 'q', '43': 'r', '44': 's', '45': 't', '46': 'u', '47': 'v',
+    '48': 'w', '49': 'x', '50': 'y', '51': 'z', '52': '0', '53': '1',
+    '54': '2', '55': '3', '56': '4', '57': '5', '58': '6', '59': '7',
+    '60': '8', '61': '9', '62': '.', '63': ',', '64': '?', '65': '!',
+    '66': ';', '67': ':', '68': "'", '69': '"', '70': '-', '71': '—',
+    '72': '(', '73': ')', '74': '[', '75': ']', '76': '{', '77': '}',
+    '78': '/', '79': '\\', '80': '|', '81': '@', '82': '#', '83': '$',
+    '84': '%', '85': '^', '86': '&', '87': '*', '88': '_', '89': '~',
+    '90': '`', '91': '<', '92': '>', '93': '=', '94': ' ', '95': '\t',
+    '96': '\n', '97': '\r'
+}
+
+# Reverse the dictionary for encoding
+char_to_number = {v: k for k, v in number_to_char.items()}
+
+# Supported code widths, in digits per character
+CODE_WIDTHS = (2, 3)
+
+# Byte tables turning an ASCII digit into its value times a place weight,
+# split into low and high bytes for weights that overflow one byte
+def _weight_table(weight, shift=0):
+    return bytes(((b - 48) * weight >> shift) & 0xFF if 48 <= b <= 57 else 0 for b in range(256))
+
+_WEIGHT_LOW = {weight: _weight_table(weight) for weight in (100, 10, 1)}
+_WEIGHT_HIGH = _weight_table(100, 8)
+# Offset of the low byte inside a native 16-bit word
+_LOW_BYTE = 0 if sys.byteorder == 'little' else 1
+
+# Delete tables for bytes.translate; the core avoids re so it imports in a few milliseconds
+_NON_DIGIT_BYTES = bytes(b for b in range(256) if not 48 <= b <= 57)
+
+# Separator placed between batch items while they are cleaned together; it
+# stops space runs from merging across neighbouring items.
+_BATCH_SEP = '\x00'
+_BATCH_NON_DIGIT_BYTES = _NON_DIGIT_BYTES.replace(b'\x00', b'')
+
+# Bytes processed per step by the buffer API, bounding its temporary copies
+_CHUNK_SIZE = 1 << 20
+
+# Codecs with more non-ASCII characters than this substitute them with one
+# translate call instead of a replace per character
+_MAX_REPLACES = 4
+
+# Codec output with the lengths callers report, so they never rescan the input.
+# Every character has the same code width, so the cleaned length follows from the output.
+CodecResult = namedtuple('CodecResult', ['output', 'input_length', 'cleaned_length', 'output_length'])
+
+# Per-item failure returned by the batch API in place of a result
+ItemError = namedtuple('ItemError', ['index', 'message'])
+
+class ResultCache:
+    """Thread-safe LRU cache of codec results, bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries=4096, max_bytes=16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached result for key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Store a result, evicting least recently used entries past either limit."""
+        size = sys.getsizeof(key[-1]) + sys.getsizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._evict()
+
+    def resize(self, max_entries, max_bytes):
+        """Change the limits, evicting entries as needed."""
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return a snapshot of the cache size and hit/miss counters."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            }
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+# Shared result cache used by encode()/decode(); off until enable_cache() is called
+_cache = None
+
+def enable_cache(max_entries=4096, max_bytes=16 * 1024 * 1024):
+    """Turn on the shared result cache, or resize it if it is already on."""
+    global _cache
+    if _cache is None:
+        _cache = ResultCache(max_entries, max_bytes)
+    else:
+        _cache.resize(max_entries, max_bytes)
+    return _cache
+
+def disable_cache():
+    """Turn off the shared result cache and drop its entries."""
+    global _cache
+    _cache = None
+
+def cache_stats():
+    """Return the shared cache statistics, or None when caching is off."""
+    cache = _cache
+    return cache.stats() if cache is not None else None
+
+def _cached(codec, mode, text, func):
+    """Return func(text), going through the shared cache when it is enabled."""
+    cache = _cache
+    if cache is None:
+        return func(text)
+    key = (codec, mode, text)
+    result = cache.get(key)
+    if result is None:
+        result = func(text)
+        cache.put(key, result)
+    return result
+
+def _collapse_spaces(data, space):
+    """Collapse runs of space (a str or bytes space) to one, in a single linear pass."""
+    pieces = data.split(space * 2)
+    if len(pieces) == 1:
+        return data
+    # Each piece after the first follows a double space; any odd space left of
+    # the run leads it, and pieces that are all spaces are the middle of a run
+    rest = [piece.lstrip(space) for piece in pieces[1:]]
+    collapsed = space.join([pieces[0]] + [piece for piece in rest if piece])
+    return collapsed if rest[-1] else collapsed + space
+
+def _clean_chunk(chunk, after_space, space=' '):
+    """clean_input() for one chunk of a stream (str or bytes); returns (chunk, after_space).
+
+    after_space says whether the stream so far ends in a space, so the leading
+    spaces of a run that straddles two chunks are dropped.
+    """
+    if after_space:
+        chunk = chunk.lstrip(space)
+    if space * 2 in chunk:
+        chunk = _collapse_spaces(chunk, space)
+    if chunk:
+        after_space = chunk.endswith(space)
+    return chunk, after_space
+
+def _strip_non_digits(text, delete=_NON_DIGIT_BYTES):
+    """Remove everything but ASCII digits (and any byte not in delete) from a string."""
+    return text.encode('ascii', 'ignore').translate(None, delete).decode('ascii')
+
+def clean_input(text):
+    """Clean input: collapse multiple spaces."""
+    if '  ' not in text:
+        return text
+    return _collapse_spaces(text, ' ')
+
+def _byte_view(buffer):
+    """Return a flat unsigned-byte memoryview of any buffer-protocol object."""
+    view = memoryview(buffer)
+    if view.format != 'B' or view.ndim != 1:
+        view = view.cast('B')
+    return view
+
+def _utf8_chunks(view):
+    """Yield bytes chunks of view that never split a UTF-8 sequence."""
+    start = 0
+    size = len(view)
+    while start < size:
+        end = min(start + _CHUNK_SIZE, size)
+        # Back up over continuation bytes so the next chunk starts on a character
+        while start < end < size and view[end] & 0xC0 == 0x80:
+            end -= 1
+        if end == start:
+            # Chunk smaller than one character: take the whole character instead
+            end = start + 1
+            while end < size and view[end] & 0xC0 == 0x80:
+                end += 1
+        yield view[start:end].tobytes()
+        start = end
+
+def _write(target, written, data):
+    """Copy data into target at offset written and return the new offset."""
+    end = written + len(data)
+    if end > len(target):
+        raise ValueError("Destination buffer is too small for the output.")
+    target[written:end] = data
+    return end
+
+def _count_digits(view):
+    """Count the ASCII digits in a byte view, chunk by chunk."""
+    count = 0
+    for start in range(0, len(view), _CHUNK_SIZE):
+        count += len(view[start:start + _CHUNK_SIZE].tobytes().translate(None, _NON_DIGIT_BYTES))
+    return count
+
+def _attempt(index, func, value):
+    """Run one codec call for a batch item, returning an ItemError on failure."""
+    try:
+        return func(value)
+    except ValueError as e:
+        return ItemError(index, str(e))
+
+def _split(buffer, sizes):
+    """Split buffer into consecutive slices of the given sizes."""
+    ends = list(accumulate(sizes))
+    return [buffer[start:end] for start, end in zip([0] + ends, ends)]
+
+class Codec:
+    """Leecode codec compiled from a bijective code → character mapping.
+
+    Codes are strings of 2 or 3 digits, all the same width. ASCII characters are
+    encoded through per-digit byte tables whose outputs are interleaved; other
+    characters travel through the same tables as stand-in ASCII control bytes
+    the mapping does not use. Decoding folds each group of digits into a single
+    value with big-integer additions and maps it through a lookup table.
+    """
+
+    def __init__(self, mapping):
+        self.number_to_char = dict(mapping)
+        self.char_to_number = {v: k for k, v in self.number_to_char.items()}
+        widths = {len(code) for code in self.number_to_char}
+        if len(widths) != 1 or not widths <= set(CODE_WIDTHS):
+            raise ValueError("Codes must all have the same width of 2 or 3 digits.")
+        self.width = widths.pop()
+        for code, char in self.number_to_char.items():
+            if not (code.isascii() and code.isdigit()):
+                raise ValueError(f"Code '{code}' must contain only digits.")
+            if not isinstance(char, str) or len(char) != 1 or char == '\ufffe':
+                raise ValueError(f"Code '{code}' must map to exactly one character.")
+        if len(self.char_to_number) != len(self.number_to_char):
+            raise ValueError("Mapping must be bijective: each character needs its own code.")
+        self._compile()
+
+    def __repr__(self):
+        return f"<Codec width={self.width} characters={len(self.number_to_char)}>"
+
+    def _compile(self):
+        """Build the encode and decode tables for this mapping."""
+        width = self.width
+        non_ascii = [char for char in self.char_to_number if not char.isascii()]
+        # Stand-ins are unused ASCII control/punctuation bytes; NUL and space are
+        # reserved for batch separators and space collapsing
+        free = [chr(b) for b in range(1, 128)
+                if chr(b) not in self.char_to_number and chr(b) != ' ' and not chr(b).isdigit()]
+        if len(non_ascii) <= len(free):
+            self._stand_ins = dict(zip(non_ascii, free))
+        else:
+            # Too many non-ASCII characters: encode with one str.translate pass instead
+            self._stand_ins = None
+            self._translate_table = str.maketrans(self.char_to_number)
+
+        plain = [bytearray(b'\xff' * 256) for _ in range(width)]
+        for char, code in self.char_to_number.items():
+            if char.isascii():
+                for table, digit in zip(plain, code):
+                    table[ord(char)] = ord(digit)
+        self._plain_tables = [bytes(table) for table in plain]
+        self._stand_in_tables = self._plain_tables
+        self._stand_in_utf8 = {}
+        if self._stand_ins:
+            substituted = [bytearray(table) for table in plain]
+            for char, stand_in in self._stand_ins.items():
+                for table, digit in zip(substituted, self.char_to_number[char]):
+                    table[ord(stand_in)] = ord(digit)
+                self._stand_in_utf8[char.encode('utf-8')] = stand_in.encode('ascii')
+            self._stand_in_tables = [bytes(table) for table in substituted]
+            self._stand_in_table = str.maketrans(self._stand_ins)
+
+        # Decoding: width 2 folds each pair into one byte and uses a charmap
+        # table; width 3 folds each triple into a native 16-bit word
+        if width == 2:
+            self._decoding_table = ''.join(
+                self.number_to_char.get(f'{i:02d}', '\ufffe') for i in range(256))
+        else:
+            self._group_table = [self.number_to_char.get(f'{i:03d}') for i in range(1000)]
+
+    def _unsupported(self, text):
+        """Build the encode error for the first unsupported character in text."""
+        for char in text:
+            if char not in self.char_to_number:
+                return ValueError(f"Character '{char}' (Unicode: {ord(char)}) not supported in Leecode mapping.")
+        return None
+
+    def _length_error(self):
+        """Build the error for a digit count that is not a whole number of codes."""
+        if self.width == 2:
+            return ValueError("Encoded string length must be even (pairs of digits).")
+        return ValueError(f"Encoded string length must be a multiple of {self.width} (groups of {self.width} digits).")
+
+    def _interleave(self, data, tables, out=None):
+        """Encode ASCII bytes with per-digit tables into out (or a new bytearray); None if unsupported."""
+        first = data.translate(tables[0])
+        if b'\xff' in first:
+            return None
+        width = self.width
+        size = width * len(data)
+        if out is None:
+            out = bytearray(size)
+        out[0:size:width] = first
+        for position in range(1, width):
+            out[position:size:width] = data.translate(tables[position])
+        return out
+
+    def _substitute(self, text):
+        """Swap non-ASCII characters for their stand-ins and return ASCII bytes."""
+        if any(stand_in in text for stand_in in self._stand_ins.values()):
+            raise self._unsupported(text)
+        if len(self._stand_ins) <= _MAX_REPLACES:
+            swapped = text
+            for char, stand_in in self._stand_ins.items():
+                swapped = swapped.replace(char, stand_in)
+        else:
+            swapped = text.translate(self._stand_in_table)
+        try:
+            return swapped.encode('ascii')
+        except UnicodeEncodeError:
+            raise self._unsupported(text) from None
+
+    def _encode_clean(self, text):
+        """Encode already-cleaned text."""
+        if self._stand_ins is None:
+            encoded = text.translate(self._translate_table)
+            # Mapped characters grow to a full code, unsupported ones stay one character
+            if len(encoded) != self.width * len(text):
+                raise self._unsupported(text)
+            return encoded
+
+        try:
+            data = text.encode('ascii')
+            tables = self._plain_tables
+        except UnicodeEncodeError:
+            data = self._substitute(text)
+            tables = self._stand_in_tables
+        encoded = self._interleave(data, tables)
+        if encoded is None:
+            raise self._unsupported(text)
+        return encoded.decode('ascii')
+
+    def _fold(self, data):
+        """Fold ASCII digit bytes into one value per code: a byte for width 2, a native word for width 3."""
+        count = len(data) // self.width
+        if self.width == 2:
+            tens = int.from_bytes(data[0::2].translate(_WEIGHT_LOW[10]), 'big')
+            units = int.from_bytes(data[1::2].translate(_WEIGHT_LOW[1]), 'big')
+            # Each byte sum stays below 100, so the big-integer add never carries
+            return (tens + units).to_bytes(count, 'big')
+
+        total = 0
+        for position, weight in enumerate((100, 10, 1)):
+            digits = data[position::3]
+            words = bytearray(2 * count)
+            words[_LOW_BYTE::2] = digits.translate(_WEIGHT_LOW[weight])
+            if weight == 100:
+                words[1 - _LOW_BYTE::2] = digits.translate(_WEIGHT_HIGH)
+            # Word sums stay below 1000, so carries never cross into the next word
+            total += int.from_bytes(words, sys.byteorder)
+        return total.to_bytes(2 * count, sys.byteorder)
+
+    def _decode_digits(self, data):
+        """Decode ASCII digit bytes whose length is a multiple of the code width."""
+        folded = self._fold(data)
+        if self.width == 2:
+            try:
+                return codecs.charmap_decode(folded, 'strict', self._decoding_table)[0]
+            except UnicodeDecodeError as e:
+                bad = e.start
+        else:
+            table = self._group_table
+            words = memoryview(folded).cast('H')
+            try:
+                return ''.join([table[word] for word in words])
+            except TypeError:
+                bad = next(i for i, word in enumerate(words) if table[word] is None)
+        part = data[bad * self.width:(bad + 1) * self.width].decode('ascii')
+        raise ValueError(f"Code '{part}' not found in Leecode mapping.")
+
+    def encode(self, text):
+        """Encode a string using this mapping."""
+        if not text:
+            return ""
+        return _cached(self, 'encode', text, self._encode_text)
+
+    def _encode_text(self, text):
+        """Clean, validate and encode non-empty text."""
+        return self._encode_clean(clean_input(text))
+
+    def decode(self, code):
+        """Decode a Leecode string (length must be a multiple of the code width)."""
+        if not code:
+            return ""
+        return _cached(self, 'decode', code, self._decode_code)
+
+    def _decode_code(self, code):
+        """Strip, validate and decode a non-empty Leecode string."""
+        # Already-clean input skips the copy made by stripping non-digits
+        if not (code.isascii() and code.isdigit()):
+            code = _strip_non_digits(code)
+
+        if len(code) % self.width != 0:
+            raise self._length_error()
+        return self._decode_digits(code.encode('ascii'))
+
+    def encode_bytes(self, text):
+        """Clean and encode text to ASCII digit bytes, bypassing the result cache."""
+        if not text:
+            return b''
+        return self._encode_text(text).encode('ascii')
+
+    def decode_digits(self, digits):
+        """Decode a bytes-like run of ASCII digits only, bypassing the result cache."""
+        digits = bytes(digits)
+        if len(digits) % self.width != 0:
+            raise self._length_error()
+        return self._decode_digits(digits)
+
+    def encode_result(self, text):
+        """Encode text and report its input, cleaned and output lengths."""
+        encoded = self.encode(text)
+        return CodecResult(encoded, len(text), len(encoded) // self.width, len(encoded))
+
+    def decode_result(self, code):
+        """Decode a Leecode string and report its input, cleaned and output lengths."""
+        decoded = self.decode(code)
+        return CodecResult(decoded, len(code), self.width * len(decoded), len(decoded))
+
+    def encode_into(self, src, dst):
+        """Encode UTF-8 text from any buffer into dst; returns the number of bytes written."""
+        source = _byte_view(src)
+        target = _byte_view(dst)
+        written = 0
+        after_space = False
+        scratch = bytearray()
+        for chunk in _utf8_chunks(source):
+            # Collapse space runs, including runs that straddle two chunks
+            chunk, after_space = _clean_chunk(chunk, after_space, b' ')
+            if not chunk:
+                continue
+
+            if chunk.isascii():
+                data = chunk
+                tables = self._plain_tables
+            elif self._stand_ins is None or len(self._stand_ins) > _MAX_REPLACES:
+                written = _write(target, written, self._encode_clean(chunk.decode('utf-8')).encode('ascii'))
+                continue
+            else:
+                if any(stand_in in chunk for stand_in in self._stand_in_utf8.values()):
+                    raise self._unsupported(chunk.decode('utf-8'))
+                data = chunk
+                for sequence, stand_in in self._stand_in_utf8.items():
+                    data = data.replace(sequence, stand_in)
+                if not data.isascii():
+                    raise self._unsupported(chunk.decode('utf-8'))
+                tables = self._stand_in_tables
+
+            # Interleave in a reused scratch buffer; strided writes into a
+            # memoryview are far slower than one contiguous copy
+            size = self.width * len(data)
+            if len(scratch) < size:
+                scratch = bytearray(size)
+            if self._interleave(data, tables, scratch) is None:
+                raise self._unsupported(chunk.decode('utf-8'))
+            written = _write(target, written, memoryview(scratch)[:size])
+        return written
+
+    def decode_into(self, src, dst):
+        """Decode Leecode digits from any buffer into dst as UTF-8; returns the number of bytes written."""
+        source = _byte_view(src)
+        target = _byte_view(dst)
+        width = self.width
+        written = 0
+        pending = b''
+        for start in range(0, len(source), _CHUNK_SIZE):
+            chunk = source[start:start + _CHUNK_SIZE].tobytes()
+            if not chunk.isdigit():
+                chunk = chunk.translate(None, _NON_DIGIT_BYTES)
+            # Carry a partial trailing code over to the next chunk
+            chunk = pending + chunk
+            cut = len(chunk) - len(chunk) % width
+            pending = chunk[cut:]
+            try:
+                decoded = self._decode_digits(chunk[:cut])
+            except ValueError:
+                # Like decode(), a bad digit count is reported before any bad code
+                rest = source[start + _CHUNK_SIZE:]
+                if (len(pending) + _count_digits(rest)) % width != 0:
+                    raise self._length_error() from None
+                raise
+            written = _write(target, written, decoded.encode('utf-8'))
+
+        if pending:
+            raise self._length_error()
+        return written
+
+    def encode_many(self, items):
+        """Encode many strings in one pass; failures come back as ItemError entries."""
+        items = list(items)
+        if not items:
+            return []
+
+        joined = _BATCH_SEP.join(items)
+        if joined.count(_BATCH_SEP) != len(items) - 1:
+            # An item contains the separator itself, so it cannot be split back
+            return [_attempt(i, self.encode, item) for i, item in enumerate(items)]
+
+        # Cleaning the joined buffer never merges space runs across items,
+        # because the separator sits between them
+        parts = clean_input(joined).split(_BATCH_SEP)
+        try:
+            encoded = self._encode_clean(''.join(parts))
+        except ValueError:
+            return [_attempt(i, self._encode_clean, part) for i, part in enumerate(parts)]
+        return _split(encoded, [self.width * len(part) for part in parts])
+
+    def decode_many(self, items):
+        """Decode many Leecode strings in one pass; failures come back as ItemError entries."""
+        items = list(items)
+        if not items:
+            return []
+
+        joined = _BATCH_SEP.join(items)
+        if joined.count(_BATCH_SEP) != len(items) - 1:
+            return [_attempt(i, self.decode, item) for i, item in enumerate(items)]
+
+        width = self.width
+        parts = _strip_non_digits(joined, _BATCH_NON_DIGIT_BYTES).split(_BATCH_SEP)
+        sizes = list(map(len, parts))
+        if not any([size % width for size in sizes]):
+            try:
+                decoded = self._decode_digits(''.join(parts).encode('ascii'))
+            except ValueError:
+                pass
+            else:
+                return _split(decoded, [size // width for size in sizes])
+
+        # Some items are malformed: decode them separately to isolate the failures
+        results = []
+        for i, part in enumerate(parts):
+            if len(part) % width != 0:
+                results.append(ItemError(i, str(self._length_error())))
+            else:
+                results.append(_attempt(i, self._decode_code, part))
+        return results
+
+# Compiled codecs by registered name, and by mapping contents
+_codecs = {}
+_compiled = {}
+_codecs_lock = threading.Lock()
+
+def get_codec(codec=None):
+    """Return a compiled Codec given a registered name, a mapping, a Codec, or None for the default."""
+    if codec is None:
+        return DEFAULT_CODEC
+    if isinstance(codec, Codec):
+        return codec
+    if isinstance(codec, str):
+        try:
+            return _codecs[codec]
+        except KeyError:
+            raise ValueError(f"Unknown Leecode codec '{codec}'.") from None
+
+    key = frozenset(dict(codec).items())
+    compiled = _compiled.get(key)
+    if compiled is None:
+        compiled = Codec(codec)
+        with _codecs_lock:
+            compiled = _compiled.setdefault(key, compiled)
+    return compiled
+
+def register_codec(name, mapping):
+    """Compile mapping (or reuse its compiled codec) and register it under name."""
+    codec = get_codec(mapping)
+    with _codecs_lock:
+        _codecs[name] = codec
+    return codec
+
+def available_codecs():
+    """Return the registered codec names."""
+    return sorted(_codecs)
+
+DEFAULT_CODEC = register_codec('leecode', number_to_char)
+
+def encode(text):
+    """Encode a string using Leecode format."""
+    return DEFAULT_CODEC.encode(text)
+
+def decode(code):
+    """Decode a Leecode string (must be even-length)."""
+    return DEFAULT_CODEC.decode(code)
+
+def encode_result(text):
+    """Encode text and report its input, cleaned and output lengths."""
+    return DEFAULT_CODEC.encode_result(text)
+
+def decode_result(code):
+    """Decode a Leecode string and report its input, cleaned and output lengths."""
+    return DEFAULT_CODEC.decode_result(code)
+
+def encode_into(src, dst):
+    """Encode UTF-8 text from any buffer into dst; returns the number of bytes written."""
+    return DEFAULT_CODEC.encode_into(src, dst)
+
+def decode_into(src, dst):
+    """Decode Leecode digits from any buffer into dst as UTF-8; returns the number of bytes written."""
+    return DEFAULT_CODEC.decode_into(src, dst)
+
+def encode_many(items):
+    """Encode many strings in one pass; failures come back as ItemError entries."""
+    return DEFAULT_CODEC.encode_many(items)
+
+def decode_many(items):
+    """Decode many Leecode strings in one pass; failures come back as ItemError entries."""
+    return DEFAULT_CODEC.decode_many(items)
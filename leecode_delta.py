@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Leecode Delta Sync
+rsync-style deltas between two versions of an encoded file, so shipping an
+update costs about the size of the edit instead of the size of the archive.
+
+    signature   block checksums of the old file (weak rolling + strong)
+    delta       the new file as copies of old blocks plus literal digits
+    patch       the old file plus a delta rebuilds the new file
+
+Blocks and the rolling search step by whole codes, so matches always fall
+on code boundaries. Every step streams: the signature holds 16 bytes per
+old block, delta generation keeps one block plus a bounded literal, and
+patching needs only a seekable old file.
+
+Layout (little-endian):
+    signature   magic 'LCSG', version, code width, block size in symbols,
+                blocks, last block length; per block: weak sum, strong hash
+    delta       magic 'LCDL', version, code width, block size in symbols;
+                ops: 'C' first block, block count | 'L' length, digits |
+                'E' target length, CRC32 of the target
+"""
+
+import hashlib
+import struct
+import zlib
+from collections import namedtuple
+
+from leecode_core import get_codec
+from leecode_io import CHUNK_SIZE, open_binary
+
+DELTA_VERSION = 1
+
+# Symbols (decoded characters) per signature block unless told otherwise
+BLOCK_SYMBOLS = 1024
+
+# Literal digits buffered before they are written out as one op
+_LITERAL_MAX = 1 << 16
+
+_SIGNATURE_MAGIC = b'LCSG'
+_DELTA_MAGIC = b'LCDL'
+_SIGNATURE_HEADER = struct.Struct('<4sHHIQI')  # magic, version, width, block symbols, blocks, last length
+_SIGNATURE_ENTRY = struct.Struct('<I12s')  # weak sum, strong hash
+_DELTA_HEADER = struct.Struct('<4sHHI')  # magic, version, width, block symbols
+_COPY = struct.Struct('<QI')  # first block, block count
+_LITERAL = struct.Struct('<I')  # length
+_END = struct.Struct('<QI')  # target length, crc32
+
+# Parsed signature: block size in bytes, code width, block count, length of
+# the last block, and weak sum → [(block index, strong hash)]
+Signature = namedtuple('Signature', ['block_size', 'width', 'blocks', 'last_size', 'table'])
+
+# Outcome of building a delta: bytes covered by copies, literal bytes sent, ops written
+DeltaReport = namedtuple('DeltaReport', ['copied', 'literal', 'ops'])
+
+def _strong(data):
+    """Return the 12-byte strong hash of a block."""
+    return hashlib.blake2b(data, digest_size=12).digest()
+
+def _weak(data, start, size):
+    """Return the (a, b) parts of the rsync rolling sum of data[start:start + size]."""
+    window = data[start:start + size]
+    a = sum(window) & 0xFFFF
+    b = sum(map(int.__mul__, range(size, 0, -1), window)) & 0xFFFF
+    return a, b
+
+def _combine(sums):
+    """Pack (a, b) rolling-sum parts into the 32-bit weak sum stored in signatures."""
+    return sums[1] << 16 | sums[0]
+
+def _read_exact(stream, size, what):
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError(f"Leecode {what} is truncated.")
+    return data
+
+def _check_block_symbols(block_symbols):
+    if block_symbols <= 0:
+        raise ValueError("Block size must be a positive number of symbols.")
+
+def write_signature(src, dst, codec=None, block_symbols=BLOCK_SYMBOLS):
+    """Write the block signature of the encoded stream src to dst; returns the block count.
+
+    dst must be seekable so the block count can be filled in afterwards.
+    """
+    _check_block_symbols(block_symbols)
+    width = get_codec(codec).width
+    block_size = width * block_symbols
+    start = dst.tell()
+    dst.write(_SIGNATURE_HEADER.pack(_SIGNATURE_MAGIC, DELTA_VERSION, width, block_symbols, 0, 0))
+    blocks = last = 0
+    while True:
+        block = src.read(block_size)
+        if not block:
+            break
+        # Short reads from pipes are topped up so every block but the last is full
+        while len(block) < block_size:
+            more = src.read(block_size - len(block))
+            if not more:
+                break
+            block += more
+        dst.write(_SIGNATURE_ENTRY.pack(_combine(_weak(block, 0, len(block))), _strong(block)))
+        blocks += 1
+        last = len(block)
+    end = dst.tell()
+    dst.seek(start)
+    dst.write(_SIGNATURE_HEADER.pack(_SIGNATURE_MAGIC, DELTA_VERSION, width, block_symbols, blocks, last))
+    dst.seek(end)
+    return blocks
+
+def read_signature(stream, codec=None):
+    """Read a signature written by write_signature() into a Signature."""
+    magic, version, width, block_symbols, blocks, last = _SIGNATURE_HEADER.unpack(
+        _read_exact(stream, _SIGNATURE_HEADER.size, "signature"))
+    if magic != _SIGNATURE_MAGIC:
+        raise ValueError("Not a Leecode signature file.")
+    if version != DELTA_VERSION:
+        raise ValueError(f"Unsupported Leecode signature version {version}.")
+    expected = get_codec(codec).width
+    if width != expected:
+        raise ValueError(f"Signature uses {width}-digit codes, but the codec uses {expected}.")
+    table = {}
+    for index in range(blocks):
+        weak, strong = _SIGNATURE_ENTRY.unpack(_read_exact(stream, _SIGNATURE_ENTRY.size, "signature"))
+        table.setdefault(weak, []).append((index, strong))
+    return Signature(width * block_symbols, width, blocks, last, table)
+
+def _match(signature, data, start, size, weak):
+    """Return the index of an old block of size bytes equal to data[start:start + size], or None."""
+    candidates = signature.table.get(weak)
+    if not candidates:
+        return None
+    strong = None
+    for index, digest in candidates:
+        full = index < signature.blocks - 1 or signature.last_size == signature.block_size
+        if size != (signature.block_size if full else signature.last_size):
+            continue
+        if strong is None:
+            strong = _strong(data[start:start + size])
+        if digest == strong:
+            return index
+    return None
+
+class _DeltaWriter:
+    """Serialize delta ops, merging runs of consecutive block copies."""
+
+    def __init__(self, stream, signature):
+        self._stream = stream
+        self._run = None
+        self.copied = self.literal = self.ops = 0
+        stream.write(_DELTA_HEADER.pack(_DELTA_MAGIC, DELTA_VERSION, signature.width,
+                                        signature.block_size // signature.width))
+
+    def _flush_run(self):
+        if self._run is not None:
+            self._stream.write(b'C' + _COPY.pack(*self._run))
+            self.ops += 1
+            self._run = None
+
+    def copy(self, index, size):
+        self.copied += size
+        if self._run is not None and self._run[0] + self._run[1] == index:
+            self._run = (self._run[0], self._run[1] + 1)
+            return
+        self._flush_run()
+        self._run = (index, 1)
+
+    def literal_bytes(self, data):
+        if not data:
+            return
+        self._flush_run()
+        self._stream.write(b'L' + _LITERAL.pack(len(data)))
+        self._stream.write(data)
+        self.literal += len(data)
+        self.ops += 1
+
+    def end(self, length, crc):
+        self._flush_run()
+        self._stream.write(b'E' + _END.pack(length, crc))
+        self.ops += 1
+
+def write_delta(signature, src, dst, chunk_size=CHUNK_SIZE):
+    """Write the delta turning the signed old file into the encoded stream src; returns a DeltaReport.
+
+    The window slides one code at a time with the rolling sum; the strong
+    hash is only computed when the weak sum hits, so unchanged regions cost
+    one hash per block and edited ones a short rolling scan.
+    """
+    size = signature.block_size
+    width = signature.width
+    out = _DeltaWriter(dst, signature)
+    buffer = bytearray()
+    position = literal = 0
+    length = crc = 0
+    eof = False
+    sums = None
+    while True:
+        if not eof and len(buffer) - position < size + width:
+            # Drop what has been sent, then top the window up
+            del buffer[:literal]
+            position -= literal
+            literal = 0
+            data = src.read(chunk_size)
+            if data:
+                buffer += data
+                length += len(data)
+                crc = zlib.crc32(data, crc)
+                continue
+            eof = True
+        remaining = len(buffer) - position
+        if remaining < size:
+            # Only the old file's short last block can match the tail
+            tail = None
+            if remaining:
+                tail = _match(signature, buffer, position, remaining, _combine(_weak(buffer, position, remaining)))
+            if tail is None:
+                out.literal_bytes(bytes(buffer[literal:]))
+            else:
+                out.literal_bytes(bytes(buffer[literal:position]))
+                out.copy(tail, remaining)
+            out.end(length, crc)
+            return DeltaReport(out.copied, out.literal, out.ops)
+        if sums is None:
+            sums = _weak(buffer, position, size)
+        index = _match(signature, buffer, position, size, _combine(sums))
+        if index is not None:
+            out.literal_bytes(bytes(buffer[literal:position]))
+            out.copy(index, size)
+            position += size
+            literal = position
+            sums = None
+            continue
+        if remaining < size + width:
+            # Nothing left to roll in; the rest of the window goes out as literals
+            position += width
+            sums = None
+            continue
+        a, b = sums
+        for _ in range(width):
+            old = buffer[position]
+            a = (a - old + buffer[position + size]) & 0xFFFF
+            b = (b - size * old + a) & 0xFFFF
+            position += 1
+        sums = (a, b)
+        if position - literal >= _LITERAL_MAX:
+            out.literal_bytes(bytes(buffer[literal:position]))
+            literal = position
+
+def apply_delta(old, delta, dst, codec=None, chunk_size=CHUNK_SIZE):
+    """Rebuild the new file from the seekable old file and a delta; returns bytes written.
+
+    The rebuilt file's length and CRC32 are checked against the delta.
+    """
+    magic, version, width, block_symbols = _DELTA_HEADER.unpack(_read_exact(delta, _DELTA_HEADER.size, "delta"))
+    if magic != _DELTA_MAGIC:
+        raise ValueError("Not a Leecode delta file.")
+    if version != DELTA_VERSION:
+        raise ValueError(f"Unsupported Leecode delta version {version}.")
+    expected = get_codec(codec).width
+    if width != expected:
+        raise ValueError(f"Delta uses {width}-digit codes, but the codec uses {expected}.")
+    block_size = width * block_symbols
+    written = crc = 0
+
+    def emit(data):
+        nonlocal written, crc
+        dst.write(data)
+        written += len(data)
+        crc = zlib.crc32(data, crc)
+
+    while True:
+        op = _read_exact(delta, 1, "delta")
+        if op == b'C':
+            first, count = _COPY.unpack(_read_exact(delta, _COPY.size, "delta"))
+            old.seek(first * block_size)
+            left = count * block_size
+            while left:
+                data = old.read(min(left, chunk_size))
+                if not data:
+                    break
+                emit(data)
+                left -= len(data)
+        elif op == b'L':
+            (left,) = _LITERAL.unpack(_read_exact(delta, _LITERAL.size, "delta"))
+            while left:
+                data = _read_exact(delta, min(left, chunk_size), "delta")
+                emit(data)
+                left -= len(data)
+        elif op == b'E':
+            length, target_crc = _END.unpack(_read_exact(delta, _END.size, "delta"))
+            if (length, target_crc) != (written, crc):
+                raise ValueError("Patched file does not match the delta (wrong old file?).")
+            return written
+        else:
+            raise ValueError("Leecode delta is corrupt.")
+
+def signature_file(old_path, sig_path, codec=None, block_symbols=BLOCK_SYMBOLS):
+    """Write the signature of an encoded file; returns the block count."""
+    with open(old_path, 'rb') as src, open(sig_path, 'wb') as dst:
+        return write_signature(src, dst, codec, block_symbols)
+
+def delta_file(sig_path, new_path, delta_path, codec=None, compression=None, chunk_size=CHUNK_SIZE):
+    """Write the delta from a signature to a new encoded file (compressed by extension or flag)."""
+    with open(sig_path, 'rb') as f:
+        signature = read_signature(f, codec)
+    with open(new_path, 'rb') as src, open_binary(delta_path, 'wb', compression) as dst:
+        return write_delta(signature, src, dst, chunk_size)
+
+def patch_file(old_path, delta_path, out_path, codec=None, compression=None, chunk_size=CHUNK_SIZE):
+    """Rebuild a new encoded file from the old one and a (possibly compressed) delta; returns bytes written."""
+    with open(old_path, 'rb') as old, open_binary(delta_path, 'rb', compression) as delta:
+        with open(out_path, 'wb') as dst:
+            return apply_delta(old, delta, dst, codec, chunk_size)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Leecode Dispatcher
+One encode/decode front door that picks an engine from the input size, the
+interpreter, the installed accelerators and a memory budget.
+
+Engines:
+    core     Codec.encode/decode: translate tables, lowest latency, result cache
+    buffer   encode_into/decode_into in bounded chunks, for inputs whose
+             one-shot temporaries would exceed the memory budget
+    threads  leecode_parallel, when the GIL is disabled
+    numpy    leecode_numpy, when NumPy is installed and calibration shows a win
+    wide     leecode_wide, pure-Python wide tables, when calibration shows a win
+
+Thresholds come from a profile written by calibrate() ('leecode calibrate');
+without one, large inputs stay on the core engine.
+"""
+
+import os
+import threading
+import time
+
+from leecode_core import CodecResult, get_codec
+
+PROFILE_VERSION = 1
+
+# Peak temporary memory of the core engine, in bytes per input character
+_PEAK_FACTOR = {'encode': 7, 'decode': 4}
+
+# Input sizes timed by calibrate()
+CALIBRATION_SIZES = (1 << 10, 1 << 14, 1 << 18, 1 << 21)
+
+_profile = None
+_profile_lock = threading.Lock()
+
+def profile_path():
+    """Return the profile location: $LEECODE_PROFILE, else the user config directory."""
+    path = os.environ.get('LEECODE_PROFILE')
+    if path:
+        return path
+    config = os.environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser('~'), '.config')
+    return os.path.join(config, 'leecode', 'profile.json')
+
+def _default_budget():
+    """A quarter of physical memory, or 1 GiB where that cannot be read."""
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // 4
+    except (AttributeError, ValueError, OSError):
+        return 1 << 30
+
+def default_profile():
+    """Return the profile used before any calibration: core engine unless memory runs short."""
+    return {'version': PROFILE_VERSION, 'threads': None, 'numpy': None, 'wide': None,
+            'memory_budget': _default_budget()}
+
+def load_profile(path=None):
+    """Return the calibrated profile (defaults for anything missing), cached after the first read."""
+    global _profile
+    if path is None and _profile is not None:
+        return _profile
+    profile = default_profile()
+    try:
+        with open(path or profile_path(), encoding='utf-8') as f:
+            # json is only imported once there is a profile to read
+            import json
+            saved = json.load(f)
+        if isinstance(saved, dict) and saved.get('version') == PROFILE_VERSION:
+            profile.update((key, saved[key]) for key in profile if key in saved)
+    except (OSError, ValueError):
+        pass
+    if path is None:
+        with _profile_lock:
+            _profile = profile
+    return profile
+
+def _threads_useful():
+    """Whether the thread engine can run codec work concurrently here."""
+    from leecode_parallel import default_workers, gil_enabled
+    return not gil_enabled() and default_workers() > 1
+
+def _numpy_engine():
+    """Return the NumPy engine module, or None when NumPy is not installed."""
+    try:
+        import leecode_numpy
+    except ImportError:
+        return None
+    return leecode_numpy
+
+def choose_engine(size, mode='encode', profile=None):
+    """Return the engine name for an input of size characters."""
+    profile = profile or load_profile()
+    if size * _PEAK_FACTOR[mode] > profile['memory_budget']:
+        return 'buffer'
+    threshold = profile['threads']
+    if threshold is not None and size >= threshold and _threads_useful():
+        return 'threads'
+    threshold = profile['numpy']
+    if threshold is not None and size >= threshold and _numpy_engine() is not None:
+        return 'numpy'
+    threshold = profile['wide']
+    if threshold is not None and size >= threshold:
+        return 'wide'
+    return 'core'
+
+def _buffer_encode(codec, text):
+    """Encode through the chunked buffer API; temporaries stay bounded by the chunk size."""
+    source = text.encode('utf-8')
+    target = bytearray(codec.width * len(text))
+    written = codec.encode_into(source, target)
+    del source
+    return str(memoryview(target)[:written], 'ascii')
+
+def _buffer_decode(codec, code):
+    """Decode through the chunked buffer API."""
+    source = code.encode('utf-8')
+    widest = max(len(char.encode('utf-8')) for char in codec.char_to_number)
+    target = bytearray(len(source) // codec.width * widest)
+    written = codec.decode_into(source, target)
+    del source
+    return str(memoryview(target)[:written], 'utf-8')
+
+def _run(engine, mode, codec, value):
+    """Run one engine."""
+    if engine == 'core':
+        return codec.encode(value) if mode == 'encode' else codec.decode(value)
+    if engine == 'buffer':
+        return _buffer_encode(codec, value) if mode == 'encode' else _buffer_decode(codec, value)
+    if engine == 'threads':
+        import leecode_parallel
+        func = leecode_parallel.encode if mode == 'encode' else leecode_parallel.decode
+        return func(value, codec, parallel=True)
+    if engine == 'wide':
+        import leecode_wide as module
+    else:
+        module = _numpy_engine()
+    return module.encode(value, codec) if mode == 'encode' else module.decode(value, codec)
+
+def encode(text, codec=None):
+    """Encode a string with the engine best suited to its size."""
+    codec = get_codec(codec)
+    return _run(choose_engine(len(text), 'encode'), 'encode', codec, text)
+
+def decode(code, codec=None):
+    """Decode a Leecode string with the engine best suited to its size."""
+    codec = get_codec(codec)
+    return _run(choose_engine(len(code), 'decode'), 'decode', codec, code)
+
+def encode_result(text, codec=None):
+    """Encode text and report its input, cleaned and output lengths."""
+    width = get_codec(codec).width
+    encoded = encode(text, codec)
+    return CodecResult(encoded, len(text), len(encoded) // width, len(encoded))
+
+def decode_result(code, codec=None):
+    """Decode a Leecode string and report its input, cleaned and output lengths."""
+    width = get_codec(codec).width
+    decoded = decode(code, codec)
+    return CodecResult(decoded, len(code), width * len(decoded), len(decoded))
+
+def encode_many(items, codec=None):
+    """Encode many strings; large batches are sharded across threads when the GIL is disabled."""
+    items = list(items)
+    if choose_engine(sum(map(len, items))) == 'threads':
+        import leecode_parallel
+        return leecode_parallel.encode_many(items, codec, parallel=True)
+    return get_codec(codec).encode_many(items)
+
+def decode_many(items, codec=None):
+    """Decode many Leecode strings; large batches are sharded across threads when the GIL is disabled."""
+    items = list(items)
+    if choose_engine(sum(map(len, items)), 'decode') == 'threads':
+        import leecode_parallel
+        return leecode_parallel.decode_many(items, codec, parallel=True)
+    return get_codec(codec).decode_many(items)
+
+def _best_time(func, value, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def calibrate(path=None, sizes=CALIBRATION_SIZES, repeat=3, save=True):
+    """Time every available engine on this machine and save the crossover sizes.
+
+    An engine's threshold is the smallest measured size from which it beats
+    the core engine at every larger size too, or None if it never does.
+    """
+    import json
+    import random
+
+    codec = get_codec()
+    rng = random.Random(0)
+    alphabet = ''.join(codec.char_to_number)
+    engines = ['wide'] + (['numpy'] if _numpy_engine() is not None else [])
+    if _threads_useful():
+        engines.append('threads')
+
+    wins = {engine: [] for engine in engines}
+    for size in sizes:
+        text = ''.join(rng.choice(alphabet) for _ in range(size))
+        code = codec.encode(text)
+        timings = {}
+        for engine in ['core'] + engines:
+            timings[engine] = sum(
+                _best_time(lambda value: _run(engine, mode, codec, value), value, repeat)
+                for mode, value in (('encode', text), ('decode', code)))
+        for engine in engines:
+            wins[engine].append(timings[engine] < timings['core'])
+
+    profile = default_profile()
+    for engine, won in wins.items():
+        for i, size in enumerate(sizes):
+            if all(won[i:]):
+                profile[engine] = size
+                break
+    if save:
+        path = path or profile_path()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, indent=2)
+    global _profile
+    with _profile_lock:
+        _profile = profile
+    return profile
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Leecode Framed Container
+A Leecode file made of independent blocks, so blocks can be decoded in
+parallel, read by random access, and a corrupt block only loses itself.
+
+Layout (little-endian):
+    file header   magic 'LCFR', version, code width, block size in symbols
+    blocks        magic 'LCBK', symbols, digit bytes, CRC32 of the digits; digits
+    table         magic 'LCTB', block count; per block: header offset, first symbol
+    footer        magic 'LCFT', block count, CRC32 of the table, table offset, symbols
+
+Writers and streaming readers hold one block at a time; random access
+reads the table through the fixed-size footer at the end of the file.
+"""
+
+import os
+import struct
+import zlib
+from collections import namedtuple
+from functools import partial
+
+from leecode_core import _NON_DIGIT_BYTES, _clean_chunk, get_codec
+from leecode_io import CHUNK_SIZE, compression_for, open_binary, open_text
+
+FRAME_VERSION = 1
+FRAME_SUFFIX = '.lcf'
+
+# Symbols (decoded characters) per block unless the writer is told otherwise
+BLOCK_SYMBOLS = 1 << 16
+
+_FILE_MAGIC = b'LCFR'
+_BLOCK_MAGIC = b'LCBK'
+_TABLE_MAGIC = b'LCTB'
+_FOOTER_MAGIC = b'LCFT'
+_FILE_HEADER = struct.Struct('<4sHHI')  # magic, version, width, block symbols
+_BLOCK_HEADER = struct.Struct('<4sIII')  # magic, symbols, length, crc32
+_TABLE_HEADER = struct.Struct('<4sI')  # magic, blocks
+_TABLE_ENTRY = struct.Struct('<QQ')  # block header offset, first symbol
+_FOOTER = struct.Struct('<4sIIQQ')  # magic, blocks, table crc32, table offset, symbols
+
+# Blocks handed to worker processes per round, per worker
+_BLOCKS_PER_WORKER = 4
+
+# One block from the table: where its header starts, the symbols before it, its symbols and digit bytes
+BlockInfo = namedtuple('BlockInfo', ['offset', 'first_symbol', 'symbols', 'length'])
+
+# Outcome of decoding a framed file: blocks and symbols read, indices of corrupt blocks
+FrameReport = namedtuple('FrameReport', ['blocks', 'symbols', 'corrupt'])
+
+class FrameWriter:
+    """Write text or legacy digits to a binary stream as a framed Leecode container.
+
+    The stream only needs write(), so pipes and compressed streams work.
+    """
+
+    def __init__(self, stream, codec=None, block_symbols=BLOCK_SYMBOLS):
+        if block_symbols <= 0:
+            raise ValueError("Block size must be a positive number of symbols.")
+        self.codec = get_codec(codec)
+        self.block_symbols = block_symbols
+        self._stream = stream
+        self._pending = bytearray()
+        self._after_space = False
+        self._entries = []
+        self._position = 0
+        self._symbols = 0
+        self._closed = False
+        self._emit(_FILE_HEADER.pack(_FILE_MAGIC, FRAME_VERSION, self.codec.width, block_symbols))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        # On an error the container is left without a table rather than made to look complete
+        if exc_type is None:
+            self.close()
+
+    def _emit(self, data):
+        self._stream.write(data)
+        self._position += len(data)
+
+    def _flush_blocks(self, final):
+        """Write every full block of pending digits, and the remainder if final."""
+        size = self.block_symbols * self.codec.width
+        start = 0
+        while len(self._pending) - start >= size or (final and start < len(self._pending)):
+            digits = bytes(self._pending[start:start + size])
+            symbols = len(digits) // self.codec.width
+            self._entries.append((self._position, self._symbols))
+            self._emit(_BLOCK_HEADER.pack(_BLOCK_MAGIC, symbols, len(digits), zlib.crc32(digits)))
+            self._emit(digits)
+            self._symbols += symbols
+            start += len(digits)
+        del self._pending[:start]
+
+    def write(self, text):
+        """Encode text, collapsing space runs across calls like encode() does."""
+        text, self._after_space = _clean_chunk(text, self._after_space)
+        if not text:
+            return
+        self._pending += self.codec.encode_bytes(text)
+        self._flush_blocks(False)
+
+    def write_digits(self, data):
+        """Add legacy encoded data; non-digit separators are skipped like decode() does."""
+        data = bytes(data)
+        if not data.isdigit():
+            data = data.translate(None, _NON_DIGIT_BYTES)
+        self._pending += data
+        self._flush_blocks(False)
+
+    def close(self):
+        """Write the last block, the block table and the footer."""
+        if self._closed:
+            return
+        if len(self._pending) % self.codec.width != 0:
+            raise self.codec._length_error()
+        self._flush_blocks(True)
+        self._closed = True
+        table = _TABLE_HEADER.pack(_TABLE_MAGIC, len(self._entries))
+        table += b''.join(_TABLE_ENTRY.pack(*entry) for entry in self._entries)
+        table_offset = self._position
+        self._emit(table)
+        self._emit(_FOOTER.pack(_FOOTER_MAGIC, len(self._entries), zlib.crc32(table), table_offset, self._symbols))
+
+    @property
+    def blocks(self):
+        """Number of blocks written so far."""
+        return len(self._entries)
+
+def _check_header(data, width, index):
+    """Unpack and check a block header; returns (symbols, length, crc)."""
+    if len(data) < _BLOCK_HEADER.size or data[:4] != _BLOCK_MAGIC:
+        raise ValueError(f"Block {index} has a corrupt header.")
+    _, symbols, length, crc = _BLOCK_HEADER.unpack_from(data)
+    if length != symbols * width:
+        raise ValueError(f"Block {index} has a corrupt header.")
+    return symbols, length, crc
+
+def _check_digits(digits, length, crc, index):
+    """Return a block's digits after checking their length and CRC32."""
+    if len(digits) < length:
+        raise ValueError(f"Block {index} is truncated.")
+    if zlib.crc32(digits) != crc:
+        raise ValueError(f"Block {index} failed its CRC check.")
+    return digits
+
+def _read_block(stream, block, width, index):
+    """Seek to a block from the table and return its verified digits."""
+    stream.seek(block.offset)
+    data = stream.read(_BLOCK_HEADER.size + block.length)
+    symbols, length, crc = _check_header(data, width, index)
+    if symbols != block.symbols:
+        raise ValueError(f"Block {index} has a corrupt header.")
+    return _check_digits(data[_BLOCK_HEADER.size:], length, crc, index)
+
+class FrameReader:
+    """Read a framed Leecode container from a binary stream.
+
+    Iterating streams the blocks in order and works on pipes; len(),
+    block access and read() seek through the block table.
+    """
+
+    def __init__(self, stream, codec=None):
+        self.codec = get_codec(codec)
+        self._stream = stream
+        header = stream.read(_FILE_HEADER.size)
+        if len(header) < _FILE_HEADER.size:
+            raise ValueError("Not a framed Leecode file.")
+        magic, version, width, self.block_symbols = _FILE_HEADER.unpack(header)
+        if magic != _FILE_MAGIC:
+            raise ValueError("Not a framed Leecode file.")
+        if version != FRAME_VERSION:
+            raise ValueError(f"Unsupported framed Leecode version {version}.")
+        if width != self.codec.width:
+            raise ValueError(f"Framed file uses {width}-digit codes, but the codec uses {self.codec.width}.")
+        self._blocks = None
+        self._seeked = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._stream.close()
+
+    @property
+    def blocks(self):
+        """The BlockInfo of every block, read from the table at the end of the file."""
+        if self._blocks is None:
+            self._seeked = True
+            self._blocks = self._read_table()
+        return self._blocks
+
+    def _read_table(self):
+        stream = self._stream
+        stream.seek(-_FOOTER.size, os.SEEK_END)
+        magic, count, crc, table_offset, symbols = _FOOTER.unpack(stream.read(_FOOTER.size))
+        if magic != _FOOTER_MAGIC:
+            raise ValueError("Framed Leecode file has no block table (truncated?).")
+        stream.seek(table_offset)
+        table = stream.read(_TABLE_HEADER.size + count * _TABLE_ENTRY.size)
+        if zlib.crc32(table) != crc:
+            raise ValueError("Framed Leecode block table is corrupt.")
+        entries = list(_TABLE_ENTRY.iter_unpack(table[_TABLE_HEADER.size:]))
+        # Block sizes follow from the first symbols, so no block header is read here
+        ends = [first for _, first in entries[1:]] + [symbols]
+        width = self.codec.width
+        return [BlockInfo(offset, first, end - first, width * (end - first))
+                for (offset, first), end in zip(entries, ends)]
+
+    def __len__(self):
+        return len(self.blocks)
+
+    @property
+    def symbols(self):
+        """Total decoded characters in the file."""
+        blocks = self.blocks
+        return blocks[-1].first_symbol + blocks[-1].symbols if blocks else 0
+
+    def read_digits(self, index):
+        """Return the verified digits of one block."""
+        return _read_block(self._stream, self.blocks[index], self.codec.width, index)
+
+    def decode_block(self, index):
+        """Return the decoded text of one block."""
+        return self.codec.decode_digits(self.read_digits(index))
+
+    def read(self, start=0, count=None):
+        """Return count characters (all remaining if None) from character offset start."""
+        end = self.symbols if count is None else min(start + count, self.symbols)
+        blocks = self.blocks
+        parts = []
+        index = _find_block(blocks, start)
+        while index < len(blocks) and blocks[index].first_symbol < end:
+            block = blocks[index]
+            text = self.decode_block(index)
+            parts.append(text[max(start - block.first_symbol, 0):end - block.first_symbol])
+            index += 1
+        return ''.join(parts)
+
+    def iter_blocks(self):
+        """Yield (index, symbols, digits or None if they fail their CRC) per block, without seeking.
+
+        A corrupt header ends the stream with an error, since the block
+        lengths after it are unknown.
+        """
+        if self._seeked:
+            self._stream.seek(_FILE_HEADER.size)
+        index = 0
+        while True:
+            data = self._stream.read(_BLOCK_HEADER.size)
+            if data[:4] == _TABLE_MAGIC:
+                return
+            if not data:
+                raise ValueError("Framed Leecode file is truncated.")
+            symbols, length, crc = _check_header(data, self.codec.width, index)
+            digits = self._stream.read(length)
+            try:
+                digits = _check_digits(digits, length, crc, index)
+            except ValueError:
+                if len(digits) < length:
+                    raise
+                digits = None
+            yield index, symbols, digits
+            index += 1
+
+    def __iter__(self):
+        """Yield the decoded text of each block in order."""
+        for index, _, digits in self.iter_blocks():
+            if digits is None:
+                raise ValueError(f"Block {index} failed its CRC check.")
+            yield self.codec.decode_digits(digits)
+
+def _find_block(blocks, symbol):
+    """Return the index of the block holding character offset symbol."""
+    low, high = 0, len(blocks)
+    while low < high:
+        middle = (low + high) // 2
+        if blocks[middle].first_symbol + blocks[middle].symbols <= symbol:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+def encode_framed(src_path, dst_path, codec=None, block_symbols=BLOCK_SYMBOLS, legacy=False,
+                  compression=None, input_compression=None):
+    """Write a framed file from UTF-8 text, or from a legacy Leecode file when legacy is true.
+
+    Returns the number of blocks written.
+    """
+    with open_binary(dst_path, 'wb', compression) as dst:
+        writer = FrameWriter(dst, codec, block_symbols)
+        if legacy:
+            with open_binary(src_path, 'rb', input_compression) as src:
+                while chunk := src.read(CHUNK_SIZE):
+                    writer.write_digits(chunk)
+        else:
+            with open_text(src_path, 'r', input_compression) as src:
+                while chunk := src.read(CHUNK_SIZE):
+                    writer.write(chunk)
+        writer.close()
+        return writer.blocks
+
+def _decode_one(path, block, index, codec, errors):
+    """Decode one block of a framed file; returns (text, corrupt)."""
+    codec = get_codec(codec)
+    try:
+        with open(path, 'rb') as f:
+            return codec.decode_digits(_read_block(f, block, codec.width, index)), False
+    except ValueError:
+        if errors == 'strict':
+            raise
+        return '\ufffd' * block.symbols, True
+
+def _verified_blocks(reader, seekable):
+    """Yield (index, symbols, digits or the ValueError they failed with) per block.
+
+    Seekable files are read through the block table, so a corrupt header
+    only costs its own block; streams follow the headers and end at one.
+    """
+    if not seekable:
+        for index, symbols, digits in reader.iter_blocks():
+            if digits is None:
+                digits = ValueError(f"Block {index} failed its CRC check.")
+            yield index, symbols, digits
+        return
+    for index, block in enumerate(reader.blocks):
+        try:
+            digits = reader.read_digits(index)
+        except ValueError as e:
+            digits = e
+        yield index, block.symbols, digits
+
+def decode_framed(src_path, dst_path, codec=None, workers=0, errors='strict', legacy=False,
+                  compression=None, input_compression=None):
+    """Decode a framed file to UTF-8 text, or to a legacy Leecode file when legacy is true.
+
+    Uncompressed files are decoded block by block through the block table,
+    across worker processes when workers > 1. errors='replace' writes one
+    U+FFFD per character of a corrupt block (legacy output skips such
+    blocks) and carries on; the FrameReport lists them.
+    """
+    if errors not in ('strict', 'replace'):
+        raise ValueError(f"errors must be 'strict' or 'replace', not '{errors}'.")
+    codec = get_codec(codec)
+    mapping = dict(codec.number_to_char)
+    corrupt = []
+    symbols = blocks = 0
+    with open_binary(src_path, 'rb', input_compression) as src:
+        reader = FrameReader(src, codec)
+        seekable = src_path != '-' and compression_for(src_path, input_compression) is None
+        with open_binary(dst_path, 'wb', compression) as dst:
+            if legacy:
+                for index, count, digits in _verified_blocks(reader, seekable):
+                    blocks += 1
+                    symbols += count
+                    if isinstance(digits, ValueError):
+                        if errors == 'strict':
+                            raise digits
+                        corrupt.append(index)
+                        continue
+                    dst.write(digits)
+                return FrameReport(blocks, symbols, corrupt)
+
+            if workers > 1 and seekable:
+                infos = reader.blocks
+                worker = partial(_decode_one, src_path, codec=mapping, errors=errors)
+                step = workers * _BLOCKS_PER_WORKER
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    for start in range(0, len(infos), step):
+                        batch = range(start, min(start + step, len(infos)))
+                        for index, (text, bad) in zip(batch, pool.map(worker, [infos[i] for i in batch], batch)):
+                            if bad:
+                                corrupt.append(index)
+                            dst.write(text.encode('utf-8'))
+                return FrameReport(len(infos), reader.symbols, corrupt)
+
+            for index, count, digits in _verified_blocks(reader, seekable):
+                blocks += 1
+                symbols += count
+                try:
+                    if isinstance(digits, ValueError):
+                        raise digits
+                    text = codec.decode_digits(digits)
+                except ValueError:
+                    if errors == 'strict':
+                        raise
+                    corrupt.append(index)
+                    text = '\ufffd' * count
+                dst.write(text.encode('utf-8'))
+    return FrameReport(blocks, symbols, corrupt)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Leecode Differential Fuzzer
+Runs every encode/decode engine against a reference implementation of the
+original per-character encode()/decode() and shrinks any disagreement to a
+minimal reproduction.
+
+Inputs mix random text with adversarial cases: long space runs, runs
+aligned to chunk boundaries, stray non-digits, unknown codes such as '98'
+and '99', incomplete codes, the em-dash, the control bytes the core uses
+as stand-ins, and (optionally) very large inputs.
+"""
+
+import io
+import random
+import re
+from collections import namedtuple
+from functools import partial
+
+from leecode_core import ItemError, get_codec
+
+# Chunk sizes exercised by the streaming engines; small ones put every
+# boundary next to a space run, a multi-byte character or a code
+CHUNK_SIZES = (1, 2, 3, 7, 64)
+
+# name: engine label; mode: 'encode' or 'decode'; run(value, codec) -> str;
+# streaming: decodes code by code, so a bad code before the end is reported
+# ahead of an incomplete final code
+Backend = namedtuple('Backend', ['name', 'mode', 'run', 'streaming'])
+
+# One disagreement with the reference, shrunk to a minimal input
+Failure = namedtuple('Failure', ['backend', 'mode', 'input', 'expected', 'actual'])
+
+def reference_encode(text, codec=None):
+    """The original encode(): collapse spaces, then map character by character."""
+    codec = get_codec(codec)
+    if not text:
+        return ""
+    text = re.sub(r' +', ' ', text)
+    encoded = []
+    for char in text:
+        if char not in codec.char_to_number:
+            raise ValueError(f"Character '{char}' (Unicode: {ord(char)}) not supported in Leecode mapping.")
+        encoded.append(codec.char_to_number[char])
+    return ''.join(encoded)
+
+def reference_decode(code, codec=None, streaming=False):
+    """The original decode(): strip non-digits, check the length, then map code by code.
+
+    With streaming, unknown codes are reported before an incomplete final
+    code, which is all a decoder that never sees the end of its input ahead
+    of time can do.
+    """
+    codec = get_codec(codec)
+    if not code:
+        return ""
+    code = re.sub(r'[^0-9]', '', code)
+    width = codec.width
+    complete = len(code) - len(code) % width
+    decoded = []
+    for i in range(0, complete, width):
+        part = code[i:i + width]
+        if part not in codec.number_to_char:
+            if streaming or complete == len(code):
+                raise ValueError(f"Code '{part}' not found in Leecode mapping.")
+            break
+        decoded.append(codec.number_to_char[part])
+    if complete != len(code):
+        raise codec._length_error()
+    return ''.join(decoded)
+
+def outcome(func, *args, **kwargs):
+    """Return ('ok', result) or ('error', message); codec-module errors report their reason."""
+    try:
+        result = func(*args, **kwargs)
+    except UnicodeError as e:
+        return ('error', e.reason)
+    except ValueError as e:
+        return ('error', str(e))
+    return ('ok', result)
+
+def _many(codec, method, value):
+    """Run a batch method on [value] between two harmless neighbours."""
+    results = getattr(codec, method)(["", value, ""])
+    if isinstance(results[1], ItemError):
+        raise ValueError(results[1].message)
+    return results[1]
+
+def _into(codec, method, value):
+    source = value.encode('utf-8')
+    target = bytearray(4 * len(source) + 8)
+    written = getattr(codec, method)(source, target)
+    return target[:written].decode('ascii' if method == 'encode_into' else 'utf-8')
+
+def _stream(codec, mode, chunk_size, value):
+    from leecode_io import transcode_stream
+    dst = io.BytesIO()
+    transcode_stream(io.BytesIO(value.encode('utf-8')), dst, mode, codec, chunk_size)
+    return dst.getvalue().decode('utf-8')
+
+def _pipeline(codec, mode, chunk_size, value):
+    from leecode_io import pipeline_stream
+    dst = io.BytesIO()
+    pipeline_stream(io.BytesIO(value.encode('utf-8')), dst, mode, codec, chunk_size, buffers=2)
+    return dst.getvalue().decode('utf-8')
+
+def _framed(codec, mode, block_symbols, value):
+    from leecode_frame import FrameReader, FrameWriter
+    stream = io.BytesIO()
+    writer = FrameWriter(stream, codec, block_symbols)
+    if mode == 'encode':
+        writer.write(value)
+    else:
+        writer.write_digits(value.encode('utf-8'))
+    writer.close()
+    if mode == 'encode':
+        reader = FrameReader(io.BytesIO(stream.getvalue()), codec)
+        return b''.join(digits for _, _, digits in reader.iter_blocks()).decode('ascii')
+    return ''.join(FrameReader(io.BytesIO(stream.getvalue()), codec))
+
+def _parallel(mode, value, codec):
+    import leecode_parallel
+    func = leecode_parallel.encode if mode == 'encode' else leecode_parallel.decode
+    # Tiny shards so even short inputs cross shard boundaries
+    saved = leecode_parallel._MIN_SHARD
+    leecode_parallel._MIN_SHARD = 3
+    try:
+        return func(value, codec, workers=4, parallel=True)
+    finally:
+        leecode_parallel._MIN_SHARD = saved
+
+def _lazy_text(value, codec):
+    from leecode_text import LeecodeText
+    return str(LeecodeText(value, codec, block_size=3))
+
+def _iter(name, value, codec):
+    import leecode_codecs
+    return ''.join(getattr(leecode_codecs, name)(value, codec, chunk_size=3))
+
+def _module(name, mode):
+    def run(value, codec):
+        import importlib
+        module = importlib.import_module(name)
+        return getattr(module, mode)(value, codec)
+    return run
+
+def backends(codec=None):
+    """Return every engine as a Backend, skipping those whose dependencies are missing."""
+    codec = get_codec(codec)
+    found = [
+        Backend('core', 'encode', lambda value, codec: codec.encode(value), False),
+        Backend('core', 'decode', lambda value, codec: codec.decode(value), False),
+        Backend('encode_bytes', 'encode', lambda value, codec: codec.encode_bytes(value).decode('ascii'), False),
+        Backend('encode_many', 'encode', lambda value, codec: _many(codec, 'encode_many', value), False),
+        Backend('decode_many', 'decode', lambda value, codec: _many(codec, 'decode_many', value), False),
+        Backend('encode_into', 'encode', lambda value, codec: _into(codec, 'encode_into', value), False),
+        Backend('decode_into', 'decode', lambda value, codec: _into(codec, 'decode_into', value), False),
+        Backend('parallel', 'encode', partial(_parallel, 'encode'), False),
+        Backend('parallel', 'decode', partial(_parallel, 'decode'), False),
+        Backend('wide', 'encode', _module('leecode_wide', 'encode'), False),
+        Backend('wide', 'decode', _module('leecode_wide', 'decode'), False),
+        Backend('text', 'decode', _lazy_text, False),
+        Backend('iter/3', 'encode', partial(_iter, 'iter_encode'), False),
+        Backend('iter/3', 'decode', partial(_iter, 'iter_decode'), False),
+    ]
+    from leecode_dispatch import _run
+    for mode in ('encode', 'decode'):
+        found.append(Backend('buffer', mode, lambda value, codec, mode=mode: _run('buffer', mode, codec, value), False))
+        for size in CHUNK_SIZES:
+            found.append(Backend(f'stream/{size}', mode,
+                                 lambda value, codec, mode=mode, size=size: _stream(codec, mode, size, value), True))
+        found.append(Backend('pipeline/3', mode, lambda value, codec, mode=mode: _pipeline(codec, mode, 3, value), True))
+        found.append(Backend('frame/2', mode, lambda value, codec, mode=mode: _framed(codec, mode, 2, value), False))
+    try:
+        import leecode_numpy  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        found.append(Backend('numpy', 'encode', _module('leecode_numpy', 'encode'), False))
+        found.append(Backend('numpy', 'decode', _module('leecode_numpy', 'decode'), False))
+    return found
+
+def _expected(backend, value, codec):
+    if backend.mode == 'encode':
+        return outcome(reference_encode, value, codec)
+    return outcome(reference_decode, value, codec, backend.streaming)
+
+def check(value, backend, codec=None):
+    """Return (expected, actual) outcomes if backend disagrees with the reference on value, else None."""
+    codec = get_codec(codec)
+    expected = _expected(backend, value, codec)
+    actual = outcome(backend.run, value, codec)
+    return None if actual == expected else (expected, actual)
+
+def shrink(value, fails):
+    """Shrink a failing input to a minimal one: drop slices, then simplify single characters.
+
+    fails(candidate) must be true for the input itself. Passes repeat until
+    nothing more can be removed or simplified.
+    """
+    while True:
+        before = value
+        size = max(len(value) // 2, 1)
+        while size >= 1:
+            start = 0
+            while start < len(value):
+                candidate = value[:start] + value[start + size:]
+                if candidate != value and fails(candidate):
+                    value = candidate
+                else:
+                    # Small slices are tried at every offset, so pairs that only
+                    # fail together (like a code and its neighbour) still go
+                    start += size if size > 8 else 1
+            size //= 2
+        for i, char in enumerate(value):
+            for simpler in 'a0 ':
+                if simpler < char or (simpler != char and not char.isascii()):
+                    candidate = value[:i] + simpler + value[i + 1:]
+                    if fails(candidate):
+                        value = candidate
+                        break
+        if value == before:
+            return value
+
+def _text_case(rng, codec, size):
+    """Random text biased towards what trips engines up."""
+    alphabet = ''.join(codec.char_to_number)
+    specials = [' ' * rng.randint(2, 70), '—', '€', '\U0001F600', '\x00', '\x01', '\x1f', '\x7f', 'é']
+    parts = []
+    while sum(map(len, parts)) < size:
+        roll = rng.random()
+        if roll < 0.6:
+            parts.append(''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 12))))
+        elif roll < 0.9:
+            parts.append(' ' * rng.randint(1, 9))
+        elif roll < 0.97:
+            parts.append('—')
+        else:
+            parts.append(rng.choice(specials))
+    text = ''.join(parts)[:size]
+    if rng.random() < 0.3:
+        # A space run straddling a chunk boundary
+        chunk = rng.choice(CHUNK_SIZES)
+        at = chunk * rng.randint(0, max(size // chunk, 1)) - rng.randint(0, 3)
+        text = text[:max(at, 0)] + ' ' * rng.randint(2, 2 * chunk + 2) + text[max(at, 0):]
+    return text
+
+def _code_case(rng, codec, size):
+    """Random encoded text with separators, stray characters and broken codes mixed in."""
+    width = codec.width
+    codes = list(codec.number_to_char)
+    unknown = [f"{i:0{width}d}" for i in range(10 ** width) if f"{i:0{width}d}" not in codec.number_to_char]
+    separators = [' ', '\n', '\t', '-', 'x', 'é', '٣', '²', '  ']
+    parts = []
+    while sum(map(len, parts)) < size:
+        roll = rng.random()
+        if roll < 0.85:
+            parts.append(rng.choice(codes))
+        elif roll < 0.95:
+            parts.append(rng.choice(separators))
+        elif roll < 0.98 and unknown:
+            parts.append(rng.choice(unknown))
+        else:
+            parts.append(str(rng.randint(0, 9)))
+    return ''.join(parts)
+
+def _supported(text, codec):
+    return ''.join(char for char in text if char in codec.char_to_number)
+
+def cases(rng, codec, count, max_size=200, huge=False):
+    """Yield (mode, input) pairs."""
+    codec = get_codec(codec)
+    yield 'encode', ""
+    yield 'decode', ""
+    for _ in range(count):
+        size = rng.choice([rng.randint(1, 8), rng.randint(1, max_size)])
+        yield 'encode', _text_case(rng, codec, size)
+        yield 'decode', _code_case(rng, codec, size)
+        yield 'decode', codec.encode(_supported(_text_case(rng, codec, size), codec))
+    if huge:
+        text = _supported(_text_case(rng, codec, 1 << 20), codec)
+        yield 'encode', text
+        yield 'decode', codec.encode(text)
+        yield 'decode', codec.encode(text) + codec.encode(text)[:1]
+
+def fuzz(iterations=200, seed=0, codec=None, max_size=200, huge=False, engines=None):
+    """Run every engine on generated inputs; returns one shrunk Failure per failing engine."""
+    codec = get_codec(codec)
+    rng = random.Random(seed)
+    engines = backends(codec) if engines is None else engines
+    failures = {}
+    for mode, value in cases(rng, codec, iterations, max_size, huge):
+        for backend in engines:
+            key = (backend.name, backend.mode)
+            if backend.mode != mode or key in failures:
+                continue
+            if check(value, backend, codec) is None:
+                continue
+            small = shrink(value, lambda candidate: check(candidate, backend, codec) is not None)
+            expected, actual = check(small, backend, codec)
+            failures[key] = Failure(backend.name, mode, small, expected, actual)
+    return list(failures.values())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Leecode Grep
+Finds text in Leecode files by searching the encoded digit stream directly.
+
+Every character has a fixed-width code, so a pattern is encoded once and
+matched against the digits; only hits that start on a code boundary count.
+"""
+
+import mmap
+import os
+from collections import deque, namedtuple
+from functools import partial
+
+from leecode_core import _NON_DIGIT_BYTES, get_codec
+from leecode_io import compression_for, open_binary
+
+# Raw bytes read per search step
+_CHUNK_SIZE = 1 << 20
+
+# One match: decoded character offset, with up to context characters either side
+Match = namedtuple('Match', ['path', 'offset', 'before', 'after'])
+
+def encode_pattern(pattern, codec=None):
+    """Encode a search pattern code by code (spaces are kept as written)."""
+    codec = get_codec(codec)
+    if not pattern:
+        raise ValueError("Search pattern must not be empty.")
+    try:
+        return ''.join([codec.char_to_number[char] for char in pattern]).encode('ascii')
+    except KeyError as e:
+        char = e.args[0]
+        raise ValueError(f"Character '{char}' (Unicode: {ord(char)}) not supported in Leecode mapping.") from None
+
+def _decode_context(codec, digits):
+    """Decode context digits leniently: whole codes only, unknown codes as U+FFFD.
+
+    Context is only a hint around a match, so damage next to it must not
+    abort the search.
+    """
+    digits = digits[:len(digits) - len(digits) % codec.width]
+    try:
+        return codec.decode_digits(digits)
+    except ValueError:
+        text = digits.decode('ascii')
+        return ''.join(codec.number_to_char.get(text[i:i + codec.width], '\ufffd')
+                       for i in range(0, len(text), codec.width))
+
+def _raw_chunks(source):
+    """Yield bytes chunks from a file object or a buffer."""
+    if hasattr(source, 'read'):
+        while chunk := source.read(_CHUNK_SIZE):
+            yield chunk
+        return
+    view = memoryview(source)
+    for start in range(0, len(view), _CHUNK_SIZE):
+        yield view[start:start + _CHUNK_SIZE].tobytes()
+
+def search(source, pattern, codec=None, context=0, path=None):
+    """Yield a Match for every occurrence of pattern in an encoded file object or buffer.
+
+    Non-digit separators are skipped like decode() does; only the context
+    characters around each match are ever decoded, and unknown codes there
+    come out as U+FFFD.
+    """
+    codec = get_codec(codec)
+    needle = encode_pattern(pattern, codec)
+    width = codec.width
+    reach = width * context
+    # History kept between chunks: enough for a match that was cut off plus
+    # its context on both sides
+    keep = len(needle) + 2 * reach
+
+    window = b''
+    base = 0  # digit offset of window[0]
+    checked = 0  # digit offset of the first match start not yet tried
+    pending = deque()  # match offsets still waiting for their after-context
+
+    def emit(offset, final):
+        start = offset - base
+        end = start + len(needle)
+        after = window[end:end + reach]
+        if not final and len(after) < reach:
+            return None
+        before = window[max(start - reach, 0):start]
+        return Match(path, offset // width, _decode_context(codec, before), _decode_context(codec, after))
+
+    chunks = _raw_chunks(source)
+    while True:
+        chunk = next(chunks, None)
+        final = chunk is None
+        if not final:
+            if not chunk.isdigit():
+                chunk = chunk.translate(None, _NON_DIGIT_BYTES)
+            window += chunk
+
+        position = window.find(needle, max(checked - base, 0))
+        while position != -1:
+            offset = base + position
+            if offset % width == 0:
+                if reach:
+                    pending.append(offset)
+                else:
+                    yield Match(path, offset // width, "", "")
+            position = window.find(needle, position + 1)
+        checked = base + max(len(window) - len(needle) + 1, 0)
+
+        while pending:
+            match = emit(pending[0], final)
+            if match is None:
+                break
+            pending.popleft()
+            yield match
+        if final:
+            return
+
+        # Keep a code-aligned tail so window offsets stay aligned with codes
+        cut = max(len(window) - keep, 0)
+        if pending:
+            cut = min(cut, max(pending[0] - base - reach, 0))
+        cut -= cut % width
+        window = window[cut:]
+        base += cut
+
+def grep_file(path, pattern, codec=None, context=0):
+    """Return all matches in one encoded file; gzip/bz2/xz archives are read as streams."""
+    if compression_for(path) is not None:
+        with open_binary(path, 'rb') as stream:
+            return list(search(stream, pattern, codec, context, path))
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return list(search(mapped, pattern, codec, context, path))
+
+def grep(paths, pattern, codec=None, context=0, workers=0):
+    """Yield matches from many files in order, searching files in parallel across processes."""
+    paths = list(paths)
+    # Fail on a bad pattern before any worker starts
+    encode_pattern(pattern, codec)
+    # Workers get the alphabet itself; spawned workers do not know registered names
+    mapping = dict(get_codec(codec).number_to_char)
+    worker = partial(_grep_one, pattern=pattern, codec=mapping, context=context)
+    if workers <= 1 or len(paths) <= 1:
+        for matches in map(worker, paths):
+            yield from matches
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for matches in pool.map(worker, paths):
+            yield from matches
+
+def _grep_one(path, pattern, codec, context):
+    """Process-pool entry point for grep_file."""
+    return grep_file(path, pattern, codec, context)
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Leecode N-gram Index
+An on-disk inverted index from character n-grams to blocks of encoded
+files, built straight from the digit codes and memory-mapped for queries.
+
+Each n-gram is keyed by the integer value of its digits. Postings list the
+blocks (block_size characters) whose text contains the n-gram; queries
+intersect them and verify the surviving blocks against the files.
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+
+from leecode_core import _NON_DIGIT_BYTES, get_codec
+from leecode_grep import Match, encode_pattern, grep_file
+from leecode_io import open_binary
+
+INDEX_VERSION = 1
+META_NAME = 'index.json'
+
+# Segment files: header, then native-order arrays of gram keys ('Q'),
+# posting offsets ('Q', one more than keys), postings ('I', block ids
+# relative to the segment, padded to 8 bytes) and raw block offsets ('Q')
+_MAGIC = b'LCNG'
+_HEADER = struct.Struct('=4sIQQQQ')  # magic, version, keys, postings, first block, blocks
+
+# Raw bytes read per step while indexing and verifying
+_CHUNK_SIZE = 1 << 20
+
+# Postings buffered in memory before they are flushed as a segment
+_SEGMENT_POSTINGS = 1 << 24
+
+_DIGIT_RUNS = re.compile(rb'[0-9]+')
+
+IndexUpdate = namedtuple('IndexUpdate', ['indexed', 'unchanged', 'removed'])
+
+def _raw_position(chunk, count):
+    """Return the offset in chunk of its digit number count."""
+    for run in _DIGIT_RUNS.finditer(chunk):
+        size = run.end() - run.start()
+        if count < size:
+            return run.start() + count
+        count -= size
+    return len(chunk)
+
+def _blocks(stream, block_digits, overlap):
+    """Yield (raw offset, digits) per block of a stream; digits run overlap digits into the next block."""
+    starts = []
+    buffer = b''
+    position = 0  # index in buffer of the next block to emit
+    seen = 0  # digits read so far
+    raw = 0  # raw bytes read so far
+    next_start = 0  # digit offset of the next block start to locate
+    while True:
+        chunk = stream.read(_CHUNK_SIZE)
+        if chunk:
+            pure = chunk.isdigit()
+            digits = chunk if pure else chunk.translate(None, _NON_DIGIT_BYTES)
+            end = seen + len(digits)
+            while next_start < end:
+                count = next_start - seen
+                starts.append(raw + (count if pure else _raw_position(chunk, count)))
+                next_start += block_digits
+            buffer = buffer[position:] + digits
+            position = 0
+            seen = end
+            raw += len(chunk)
+        for start in starts[:]:
+            if chunk and len(buffer) - position < block_digits + overlap:
+                break
+            yield start, buffer[position:position + block_digits + overlap]
+            position += block_digits
+            starts.pop(0)
+        if not chunk:
+            return
+
+class _Segment:
+    """One memory-mapped segment file."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, keys, postings, self.first_block, blocks = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or version != INDEX_VERSION:
+            self._map.close()
+            raise ValueError(f"Not a Leecode index segment: {path}")
+        view = memoryview(self._map)
+        start = _HEADER.size
+        self.keys = view[start:start + 8 * keys].cast('Q')
+        start += 8 * keys
+        self.offsets = view[start:start + 8 * (keys + 1)].cast('Q')
+        start += 8 * (keys + 1)
+        self.postings = view[start:start + 4 * postings].cast('I')
+        start += 4 * postings + 4 * (postings % 2)
+        self.block_offsets = view[start:start + 8 * blocks].cast('Q')
+        self._views = [view, self.keys, self.offsets, self.postings, self.block_offsets]
+
+    def lookup(self, low, high):
+        """Return the block ids (absolute) of grams with keys in [low, high)."""
+        first = bisect_left(self.keys, low)
+        last = bisect_left(self.keys, high, first)
+        base = self.first_block
+        blocks = set()
+        for i in range(first, last):
+            blocks.update(self.postings[self.offsets[i]:self.offsets[i + 1]])
+        return {base + block for block in blocks}
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._map.close()
+
+def _write_segment(path, first_block, grams, block_offsets):
+    """Write grams ({key: array('I') of relative block ids}) as a segment file."""
+    keys = array('Q', sorted(grams))
+    offsets = array('Q', [0])
+    postings = array('I')
+    for key in keys:
+        postings.extend(grams[key])
+        offsets.append(len(postings))
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, INDEX_VERSION, len(keys), len(postings), first_block, len(block_offsets)))
+        keys.tofile(f)
+        offsets.tofile(f)
+        postings.tofile(f)
+        f.write(b'\0' * (4 * (len(postings) % 2)))
+        block_offsets.tofile(f)
+    os.replace(tmp, path)
+
+class NgramIndex:
+    """On-disk n-gram index over encoded files, updated incrementally.
+
+    update() indexes new and changed files into a fresh segment; search()
+    intersects the postings of a pattern's n-grams across segments and
+    verifies candidate blocks against the files. Files that changed since
+    they were indexed are searched in full instead, so results stay exact.
+    """
+
+    def __init__(self, directory, n=3, codec=None, block_size=4096):
+        self.directory = os.fspath(directory)
+        meta_path = os.path.join(self.directory, META_NAME)
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding='utf-8') as f:
+                self._meta = json.load(f)
+            if self._meta.get('version') != INDEX_VERSION:
+                raise ValueError(f"Unsupported Leecode index version in {meta_path}.")
+        else:
+            mapping = dict(get_codec(codec).number_to_char)
+            self._meta = {'version': INDEX_VERSION, 'n': n, 'block_size': block_size, 'codec': mapping,
+                          'next_block': 0, 'next_segment': 0, 'segments': [], 'files': {}}
+        self.n = self._meta['n']
+        self.block_size = self._meta['block_size']
+        self.codec = get_codec(self._meta['codec'])
+        if self.n < 1 or self.n * self.codec.width > 19:
+            raise ValueError("N-gram size must be at least 1 and fit in 19 digits.")
+        self._segments = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmap all segments."""
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+
+    @property
+    def files(self):
+        """Paths of the indexed files."""
+        return list(self._meta['files'])
+
+    def _segment(self, name):
+        segment = self._segments.get(name)
+        if segment is None:
+            segment = self._segments[name] = _Segment(os.path.join(self.directory, name))
+        return segment
+
+    def _save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, META_NAME)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self._meta, f, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+
+    def update(self, paths):
+        """Index new or changed files and drop files that no longer exist."""
+        files = self._meta['files']
+        indexed = unchanged = removed = 0
+        grams = {}
+        block_offsets = array('Q')
+        first_block = self._meta['next_block']
+        count = 0
+
+        def flush():
+            nonlocal grams, block_offsets, first_block, count
+            if block_offsets:
+                name = f"segment-{self._meta['next_segment']:06d}.bin"
+                self._meta['next_segment'] += 1
+                _write_segment(os.path.join(self.directory, name), first_block,
+                               {int(key): posting for key, posting in grams.items()}, block_offsets)
+                self._meta['segments'].append(name)
+                for entry in files.values():
+                    if entry.get('segment') is None:
+                        entry['segment'] = name
+            grams = {}
+            block_offsets = array('Q')
+            first_block = self._meta['next_block']
+            count = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        width = self.codec.width
+        gram_digits = self.n * width
+        block_digits = self.block_size * width
+        for path in map(os.path.abspath, paths):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                if files.pop(path, None) is not None:
+                    removed += 1
+                continue
+            entry = files.get(path)
+            if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+                unchanged += 1
+                continue
+
+            # Each file's blocks must live in one segment
+            if count >= _SEGMENT_POSTINGS:
+                flush()
+            start = self._meta['next_block']
+            with open_binary(path, 'rb') as stream:
+                for raw, digits in _blocks(stream, block_digits, gram_digits - width):
+                    block = self._meta['next_block'] - first_block
+                    last = min(len(digits) - gram_digits, block_digits - width)
+                    keys = {digits[i:i + gram_digits] for i in range(0, last + 1, width)}
+                    if len(digits) < block_digits + gram_digits - width:
+                        # Last block: zero-pad the grams cut off by the end of the file,
+                        # so patterns shorter than n still find them by prefix
+                        first = max(last + width, 0)
+                        end = min(len(digits), block_digits)
+                        keys.update(digits[i:].ljust(gram_digits, b'0')
+                                    for i in range(first - first % width, end - width + 1, width))
+                    for key in keys:
+                        posting = grams.get(key)
+                        if posting is None:
+                            posting = grams[key] = array('I')
+                        posting.append(block)
+                        count += 1
+                    block_offsets.append(raw)
+                    self._meta['next_block'] += 1
+            files[path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'first_block': start,
+                           'blocks': self._meta['next_block'] - start, 'segment': None}
+            indexed += 1
+        flush()
+
+        # Segments no file points at any more hold only dead blocks
+        live = {entry['segment'] for entry in files.values()}
+        for name in [name for name in self._meta['segments'] if name not in live]:
+            self._meta['segments'].remove(name)
+            segment = self._segments.pop(name, None)
+            if segment is not None:
+                segment.close()
+            os.remove(os.path.join(self.directory, name))
+        self._save()
+        return IndexUpdate(indexed, unchanged, removed)
+
+    def remove(self, paths):
+        """Drop files from the index."""
+        files = self._meta['files']
+        removed = sum(files.pop(os.path.abspath(path), None) is not None for path in paths)
+        self._save()
+        return removed
+
+    def _candidates(self, needle):
+        """Return {path: sorted block numbers within the file} that may contain needle."""
+        width = self.codec.width
+        gram_digits = self.n * width
+        block_digits = self.block_size * width
+        if len(needle) >= gram_digits:
+            # An occurrence starting in block b has every gram starting in b or b + 1;
+            # grams past the first block_size characters add nothing
+            last = min(len(needle) - gram_digits, block_digits - width)
+            ranges = [(int(needle[i:i + gram_digits]),) * 2 for i in range(0, last + 1, width)]
+            ranges = [(low, low + 1) for low, _ in dict.fromkeys(ranges)]
+        else:
+            # Short patterns match every gram that starts with them
+            scale = 10 ** (gram_digits - len(needle))
+            low = int(needle) * scale
+            ranges = [(low, low + scale)]
+
+        names = {entry['segment'] for entry in self._meta['files'].values() if entry['segment']}
+        candidates = None
+        for low, high in ranges:
+            blocks = set()
+            for name in names:
+                blocks |= self._segment(name).lookup(low, high)
+            blocks |= {block - 1 for block in blocks}
+            candidates = blocks if candidates is None else candidates & blocks
+            if not candidates:
+                return {}
+
+        found = {}
+        for path, entry in self._meta['files'].items():
+            first = entry['first_block']
+            blocks = sorted(block - first for block in candidates if first <= block < first + entry['blocks'])
+            if blocks:
+                found[path] = blocks
+        return found
+
+    def _verify(self, path, entry, blocks, needle):
+        """Return the character offsets of needle that start in the given blocks of one file."""
+        segment = self._segment(entry['segment'])
+        width = self.codec.width
+        block_digits = self.block_size * width
+        offsets = []
+        with open_binary(path, 'rb') as stream:
+            for block in blocks:
+                stream.seek(segment.block_offsets[entry['first_block'] + block - segment.first_block])
+                wanted = block_digits + len(needle) - width
+                digits = b''
+                while len(digits) < wanted:
+                    chunk = stream.read(min(max(wanted - len(digits), 4096), _CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    digits += chunk if chunk.isdigit() else chunk.translate(None, _NON_DIGIT_BYTES)
+                digits = digits[:wanted]
+                position = digits.find(needle)
+                while position != -1 and position < block_digits:
+                    if position % width == 0:
+                        offsets.append(block * self.block_size + position // width)
+                    position = digits.find(needle, position + 1)
+        return offsets
+
+    def search(self, pattern):
+        """Return a Match for every occurrence of pattern in the indexed files."""
+        needle = encode_pattern(pattern, self.codec)
+        candidates = self._candidates(needle)
+        matches = []
+        for path, entry in self._meta['files'].items():
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if entry['size'] != st.st_size or entry['mtime_ns'] != st.st_mtime_ns:
+                matches.extend(grep_file(path, pattern, self.codec))
+            elif path in candidates:
+                matches.extend(Match(path, offset, "", "")
+                               for offset in self._verify(path, entry, candidates[path], needle))
+        return matches
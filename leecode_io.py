@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Leecode File I/O
+Streams files through the codec in bounded chunks, reading and writing
+gzip/bz2/xz archives directly. Reads, conversion and writes run as an
+overlapping three-stage pipeline with per-stage stall reporting. Encoding
+can verify its own round trip in the same pass.
+"""
+
+import codecs
+import importlib
+import io
+import queue
+import sys
+import threading
+import time
+import zlib
+from collections import namedtuple
+from os.path import commonprefix
+
+from leecode_codecs import codec_info
+from leecode_core import clean_input
+
+# Bytes read from the source per step
+CHUNK_SIZE = 1 << 20
+
+# Seconds a pipeline stage spent working and waiting on its neighbours
+StageTimes = namedtuple('StageTimes', ['busy', 'stalled'])
+
+# Bytes moved, wall time and per-stage times of one pipelined transcode
+PipelineReport = namedtuple('PipelineReport', ['bytes_read', 'bytes_written', 'elapsed', 'read', 'codec', 'write'])
+
+# Outcome of an encode verified in the same pass: symbols counts normalized
+# input characters; mismatch is the character offset into them where the round trip first differs, or None;
+# the CRC-32s cover the UTF-8 of the normalized input and of the decoded output
+VerifyReport = namedtuple('VerifyReport', ['bytes_read', 'bytes_written', 'symbols', 'mismatch',
+                                           'source_crc', 'decoded_crc'])
+
+# Compression formats by name, with the stdlib module implementing each
+COMPRESSION_MODULES = {'gzip': 'gzip', 'bz2': 'bz2', 'xz': 'lzma'}
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.gzip': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.lzma': 'xz'}
+
+# File suffix of encoded files in mirrored trees and statistics
+SUFFIX = '.lc'
+
+def compression_for(path, compression=None):
+    """Return the compression for path: explicit, else from its extension, else None."""
+    if compression is not None:
+        if compression == 'none':
+            return None
+        if compression not in COMPRESSION_MODULES:
+            raise ValueError(f"Unknown compression '{compression}'; use gzip, bz2, xz or none.")
+        return compression
+    lowered = str(path).lower()
+    for extension, name in COMPRESSION_EXTENSIONS.items():
+        if lowered.endswith(extension):
+            return name
+    return None
+
+def open_binary(path, mode, compression=None):
+    """Open path ('-' for stdin/stdout) as a binary stream, (de)compressing as chosen."""
+    kind = compression_for(path, compression)
+    if path == '-':
+        target = sys.stdin.buffer if 'r' in mode else sys.stdout.buffer
+    else:
+        target = path
+    if kind is None:
+        if path == '-':
+            return open(target.fileno(), mode, closefd=False)
+        return open(target, mode)
+    # Compression modules are only imported when an archive is actually used
+    module = importlib.import_module(COMPRESSION_MODULES[kind])
+    return module.open(target, mode)
+
+def open_text(path, mode, compression=None):
+    """Open path as UTF-8 text with untranslated newlines, (de)compressing as chosen."""
+    return io.TextIOWrapper(open_binary(path, mode + 'b', compression), encoding='utf-8', newline='')
+
+class ThreadedWriter:
+    """Writes to a stream from a background thread, fed through a bounded queue.
+
+    Compressors and file writes release the GIL, so writing one chunk
+    overlaps with converting the next one. busy and stalled are the seconds
+    the thread spent writing and waiting for data; waited is the time
+    write() callers spent blocked on a full queue.
+    """
+
+    def __init__(self, stream, depth=4):
+        self.stream = stream
+        self.busy = self.stalled = self.waited = 0.0
+        self._queue = queue.Queue(depth)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name='leecode-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            start = time.perf_counter()
+            data = self._queue.get()
+            ready = time.perf_counter()
+            self.stalled += ready - start
+            if data is None:
+                return
+            if self._error is None:
+                try:
+                    self.stream.write(data)
+                except BaseException as e:
+                    self._error = e
+            self.busy += time.perf_counter() - ready
+
+    def write(self, data):
+        if self._error is not None:
+            raise self._error
+        start = time.perf_counter()
+        self._queue.put(bytes(data))
+        self.waited += time.perf_counter() - start
+        return len(data)
+
+    def close(self):
+        """Flush queued chunks and stop the thread; the stream itself stays open."""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+class PrefetchReader:
+    """Reads chunks from a stream on a background thread into a pool of reusable buffers.
+
+    read() returns a memoryview into a pool buffer that stays valid until
+    the next read(); the buffer then goes back to the reader thread, so
+    memory stays at depth chunks however large the file is. busy and
+    stalled are the seconds the thread spent reading and waiting for a
+    free buffer; waited is the time read() callers spent waiting for data.
+    """
+
+    def __init__(self, stream, chunk_size=CHUNK_SIZE, depth=4):
+        self.busy = self.stalled = self.waited = 0.0
+        self._free = queue.Queue()
+        for _ in range(depth):
+            self._free.put(bytearray(chunk_size))
+        # Bounded by the pool: at most depth buffers can be filled at once
+        self._filled = queue.Queue()
+        self._current = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(stream, chunk_size),
+                                        name='leecode-reader', daemon=True)
+        self._thread.start()
+
+    def _run(self, stream, chunk_size):
+        readinto = getattr(stream, 'readinto', None)
+        try:
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                buffer = self._free.get()
+                ready = time.perf_counter()
+                self.stalled += ready - start
+                if buffer is None:
+                    return
+                if readinto is not None:
+                    data = memoryview(buffer)[:readinto(buffer)]
+                else:
+                    data = stream.read(chunk_size)
+                self.busy += time.perf_counter() - ready
+                self._filled.put((buffer, data))
+                if not data:
+                    return
+        except BaseException as e:
+            self._filled.put((None, e))
+
+    def read(self, size=-1):
+        """Return the next prefetched chunk (the size hint is fixed at construction)."""
+        if self._current is not None:
+            self._free.put(self._current)
+            self._current = None
+        start = time.perf_counter()
+        buffer, data = self._filled.get()
+        self.waited += time.perf_counter() - start
+        if isinstance(data, BaseException):
+            self._filled.put((None, data))
+            raise data
+        if not data:
+            # Keep reporting end of stream on later calls
+            self._filled.put((None, data))
+            return b''
+        self._current = buffer
+        return data
+
+    def close(self):
+        self._stop.set()
+        # Unblock the reader thread if it is waiting for a free buffer
+        self._free.put(None)
+        self._thread.join()
+
+def _stepper(mode, codec):
+    """Return a function turning (chunk, final) into output bytes for mode."""
+    info = codec_info(codec)
+    if mode == 'encode':
+        text_decoder = codecs.getincrementaldecoder('utf-8')()
+        encoder = info.incrementalencoder()
+        return lambda data, final: encoder.encode(text_decoder.decode(data, final), final)
+    if mode == 'decode':
+        decoder = info.incrementaldecoder()
+        return lambda data, final: decoder.decode(data, final).encode('utf-8')
+    raise ValueError(f"Mode must be 'encode' or 'decode', not '{mode}'.")
+
+def transcode_stream(src, dst, mode, codec=None, chunk_size=CHUNK_SIZE):
+    """Stream binary src to dst through the codec; returns (bytes read, bytes written)."""
+    step = _stepper(mode, codec)
+    read = written = 0
+    while True:
+        data = src.read(chunk_size)
+        final = not data
+        output = step(data, final)
+        if output:
+            dst.write(output)
+        read += len(data)
+        written += len(output)
+        if final:
+            return read, written
+
+def pipeline_stream(src, dst, mode, codec=None, chunk_size=CHUNK_SIZE, buffers=3, depth=2):
+    """Stream src to dst with reading, the codec and writing on three overlapping stages.
+
+    A reader thread fills a pool of buffers reused chunk after chunk, the
+    codec converts the current one on this thread, and a writer thread
+    flushes the previous output; bounded queues give backpressure both ways.
+    Returns a PipelineReport with the busy and stalled time of each stage.
+    """
+    step = _stepper(mode, codec)
+    read = written = 0
+    converting = 0.0
+    start = time.perf_counter()
+    reader = PrefetchReader(src, chunk_size, buffers)
+    try:
+        writer = ThreadedWriter(dst, depth)
+        try:
+            while True:
+                data = reader.read()
+                final = not data
+                begin = time.perf_counter()
+                output = step(data, final)
+                converting += time.perf_counter() - begin
+                if output:
+                    writer.write(output)
+                read += len(data)
+                written += len(output)
+                if final:
+                    break
+        finally:
+            writer.close()
+    finally:
+        reader.close()
+    return PipelineReport(read, written, time.perf_counter() - start,
+                          StageTimes(reader.busy, reader.stalled),
+                          StageTimes(converting, reader.waited + writer.waited),
+                          StageTimes(writer.busy, writer.stalled))
+
+def _expected_text(pending, text, final):
+    """Split raw source text into a clean_input()-normalized ready part and what to hold back.
+
+    Built with clean_input() itself rather than the encoder's chunk cleaning,
+    so a bug there shows up as a mismatch. Trailing spaces are held back as
+    one space until the next chunk shows whether their run continues.
+    """
+    pending += text
+    if final:
+        return clean_input(pending), ""
+    body = pending.rstrip(' ')
+    return clean_input(body), ' ' if len(body) < len(pending) else ""
+
+def verify_stream(src, dst, codec=None, chunk_size=CHUNK_SIZE):
+    """Encode binary src into dst (None to only check) and verify the round trip in the same pass.
+
+    Every encoded chunk is decoded again right away and compared with the
+    clean_input()-normalized source, so only a few codes are held back at a
+    time. Returns a VerifyReport; encode errors raise ValueError as usual.
+    """
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    info = codec_info(codec)
+    encoder = info.incrementalencoder()
+    decoder = info.incrementaldecoder()
+    read = written = symbols = matched = 0
+    source_crc = decoded_crc = 0
+    mismatch = None
+    expected = actual = held = ""
+    while True:
+        data = src.read(chunk_size)
+        final = not data
+        raw = text_decoder.decode(data, final)
+        output = encoder.encode(raw, final)
+        if output and dst is not None:
+            dst.write(output)
+        decoded = decoder.decode(output, final)
+        text, held = _expected_text(held, raw, final)
+        read += len(data)
+        written += len(output)
+        symbols += len(text)
+        source_crc = zlib.crc32(text.encode('utf-8'), source_crc)
+        decoded_crc = zlib.crc32(decoded.encode('utf-8'), decoded_crc)
+        if mismatch is None:
+            # Compare what both sides have produced so far; the rest waits for the next chunk
+            expected += text
+            actual += decoded
+            same = min(len(expected), len(actual))
+            if expected[:same] != actual[:same]:
+                same = len(commonprefix([expected[:same], actual[:same]]))
+            if same < min(len(expected), len(actual)) or (final and len(expected) != len(actual)):
+                mismatch = matched + same
+            matched += same
+            expected = expected[same:]
+            actual = actual[same:]
+        if final:
+            return VerifyReport(read, written, symbols, mismatch, source_crc, decoded_crc)
+
+def verify_file(src_path, dst_path=None, codec=None, compression=None, input_compression=None,
+                chunk_size=CHUNK_SIZE):
+    """Encode a file (or only check it when dst_path is None) and verify the round trip; returns a VerifyReport."""
+    with open_binary(src_path, 'rb', input_compression) as src:
+        if dst_path is None:
+            return verify_stream(src, None, codec, chunk_size)
+        with open_binary(dst_path, 'wb', compression) as dst:
+            return verify_stream(src, dst, codec, chunk_size)
+
+def format_report(report):
+    """Describe a PipelineReport in one line per stage, naming the bottleneck."""
+    stages = {'read': report.read, 'codec': report.codec, 'write': report.write}
+    slowest = max(stages, key=lambda name: stages[name].busy)
+    rate = report.bytes_read / report.elapsed / 1e6 if report.elapsed else 0.0
+    lines = [f"{report.bytes_read} bytes in, {report.bytes_written} bytes out in "
+             f"{report.elapsed:.3f}s ({rate:.1f} MB/s)"]
+    for name, times in stages.items():
+        lines.append(f"  {name:<5} busy {times.busy:.3f}s  stalled {times.stalled:.3f}s")
+    lines.append(f"  bottleneck: {slowest}")
+    return '\n'.join(lines)
+
+def transcode_file(src_path, dst_path, mode, codec=None, compression=None,
+                   input_compression=None, chunk_size=CHUNK_SIZE, threaded=True):
+    """Encode or decode a file, reading and writing compressed archives by extension or flag.
+
+    When threaded is true, reading, the codec and writing (with any
+    (de)compression) run as overlapping pipeline stages.
+    """
+    if threaded:
+        report = pipeline_file(src_path, dst_path, mode, codec, compression, input_compression, chunk_size)
+        return report.bytes_read, report.bytes_written
+    with open_binary(src_path, 'rb', input_compression) as src:
+        with open_binary(dst_path, 'wb', compression) as dst:
+            return transcode_stream(src, dst, mode, codec, chunk_size)
+
+def pipeline_file(src_path, dst_path, mode, codec=None, compression=None,
+                  input_compression=None, chunk_size=CHUNK_SIZE, buffers=3):
+    """Encode or decode a file through the three-stage pipeline; returns its PipelineReport."""
+    with open_binary(src_path, 'rb', input_compression) as src:
+        with open_binary(dst_path, 'wb', compression) as dst:
+            return pipeline_stream(src, dst, mode, codec, chunk_size, buffers)
+
+def encode_file(src_path, dst_path, **options):
+    """Encode a UTF-8 text file into a Leecode file; returns (bytes read, bytes written)."""
+    return transcode_file(src_path, dst_path, 'encode', **options)
+
+def decode_file(src_path, dst_path, **options):
+    """Decode a Leecode file into a UTF-8 text file; returns (bytes read, bytes written)."""
+    return transcode_file(src_path, dst_path, 'decode', **options)
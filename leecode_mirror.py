@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Leecode Directory Mirror
+Mirrors a source tree into an encoded tree (or back), re-processing only
+files whose content changed since the last run.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import namedtuple
+from functools import partial
+
+from leecode_core import Codec, get_codec
+from leecode_io import SUFFIX, transcode_file
+
+MANIFEST_NAME = '.leecode-manifest.json'
+MANIFEST_VERSION = 1
+
+# Small files are grouped into tasks of about this many bytes
+BATCH_BYTES = 4 << 20
+
+MirrorResult = namedtuple('MirrorResult', ['processed', 'skipped', 'removed', 'errors'])
+
+def _hash_file(path):
+    """Return the SHA-256 hex digest of a file's content."""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+def _target_name(rel, mode, suffix):
+    """Return the mirrored relative path for a source relative path."""
+    if mode == 'encode':
+        return rel + suffix
+    return rel[:-len(suffix)] if suffix and rel.endswith(suffix) else rel
+
+def _scan(root):
+    """Return {relative path: os.stat_result} for regular files under root."""
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in filenames:
+            if name == MANIFEST_NAME:
+                continue
+            path = os.path.join(dirpath, name)
+            files[os.path.relpath(path, root).replace(os.sep, '/')] = os.stat(path)
+    return files
+
+def _load_manifest(path, mode, codec_key):
+    """Return the recorded file entries, or {} when missing or written for another codec."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if (manifest.get('version') != MANIFEST_VERSION or manifest.get('mode') != mode
+            or manifest.get('codec') != codec_key):
+        return {}
+    return manifest.get('files', {})
+
+def _save_manifest(path, mode, codec_key, files):
+    """Write the manifest atomically."""
+    manifest = {'version': MANIFEST_VERSION, 'mode': mode, 'codec': codec_key, 'files': files}
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp, path)
+
+def _process_batch(src_root, dst_root, mode, codec, suffix, batch):
+    """Transcode one batch of files; returns [(rel, entry or None, error or None)]."""
+    results = []
+    for rel, size, mtime_ns, digest in batch:
+        src = os.path.join(src_root, rel)
+        dst = os.path.join(dst_root, _target_name(rel, mode, suffix))
+        tmp = dst + '.part'
+        try:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            digest = digest or _hash_file(src)
+            transcode_file(src, tmp, mode, codec=codec, compression='none',
+                           input_compression='none', threaded=False)
+            os.replace(tmp, dst)
+        except (OSError, ValueError) as e:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            results.append((rel, None, str(e)))
+            continue
+        results.append((rel, {'size': size, 'mtime_ns': mtime_ns, 'sha256': digest}, None))
+    return results
+
+def _batches(pending, batch_bytes):
+    """Group (rel, size, ...) work items into batches of about batch_bytes."""
+    batch = []
+    total = 0
+    for item in pending:
+        batch.append(item)
+        total += item[1]
+        if total >= batch_bytes:
+            yield batch
+            batch = []
+            total = 0
+    if batch:
+        yield batch
+
+def mirror(src_root, dst_root, mode='encode', codec=None, suffix=SUFFIX, workers=0,
+           batch_bytes=BATCH_BYTES, prune=True):
+    """Bring dst_root up to date with src_root, skipping files that did not change.
+
+    Files whose size and mtime match the manifest are skipped without being
+    read; files that were only touched are skipped after a hash check.
+    In decode mode only files ending in suffix are taken. Failed files are
+    reported in errors and retried on the next run.
+    """
+    if mode not in ('encode', 'decode'):
+        raise ValueError(f"Mode must be 'encode' or 'decode', not '{mode}'.")
+    if codec is None or isinstance(codec, str):
+        codec_key = codec
+    else:
+        if isinstance(codec, Codec):
+            codec = codec.number_to_char
+        codec_key = hashlib.sha256(json.dumps(sorted(codec.items())).encode('utf-8')).hexdigest()
+    # Worker processes receive the alphabet itself; spawned workers only know
+    # the built-in codec, not names registered in this process
+    codec = dict(get_codec(codec).number_to_char)
+
+    os.makedirs(dst_root, exist_ok=True)
+    manifest_path = os.path.join(dst_root, MANIFEST_NAME)
+    recorded = _load_manifest(manifest_path, mode, codec_key)
+    current = _scan(src_root)
+    if mode == 'decode' and suffix:
+        # Only encoded files are decoded; anything else in the tree is left alone
+        current = {rel: st for rel, st in current.items() if rel.endswith(suffix)}
+
+    files = {}
+    pending = []
+    skipped = 0
+    for rel, st in current.items():
+        entry = recorded.get(rel)
+        target = os.path.join(dst_root, _target_name(rel, mode, suffix))
+        if entry and entry['size'] == st.st_size and os.path.exists(target):
+            if entry['mtime_ns'] == st.st_mtime_ns:
+                files[rel] = entry
+                skipped += 1
+                continue
+            digest = _hash_file(os.path.join(src_root, rel))
+            if digest == entry['sha256']:
+                files[rel] = dict(entry, mtime_ns=st.st_mtime_ns)
+                skipped += 1
+                continue
+            pending.append((rel, st.st_size, st.st_mtime_ns, digest))
+        else:
+            pending.append((rel, st.st_size, st.st_mtime_ns, None))
+
+    removed = 0
+    if prune:
+        for rel in recorded.keys() - current.keys():
+            target = os.path.join(dst_root, _target_name(rel, mode, suffix))
+            if os.path.exists(target):
+                os.remove(target)
+            removed += 1
+
+    # Largest files first so one big file does not finish last on a single worker
+    pending.sort(key=lambda item: -item[1])
+    batches = list(_batches(pending, batch_bytes))
+    worker = partial(_process_batch, src_root, dst_root, mode, codec, suffix)
+    if workers <= 1 or len(batches) <= 1:
+        outcomes = list(map(worker, batches))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(worker, batches))
+
+    processed = 0
+    errors = []
+    for rel, entry, error in (result for outcome in outcomes for result in outcome):
+        if error is None:
+            files[rel] = entry
+            processed += 1
+        else:
+            errors.append((rel, error))
+            # Keep tracking the target a previous run wrote, so it is still pruned later
+            if rel in recorded:
+                files[rel] = recorded[rel]
+
+    _save_manifest(manifest_path, mode, codec_key, files)
+    return MirrorResult(processed, skipped, removed, errors)
+
+def watch(src_root, dst_root, interval=2.0, rounds=None, on_update=None, **options):
+    """Poll src_root and re-mirror changes every interval seconds.
+
+    Runs forever unless rounds is given; on_update(result) is called after
+    every pass that processed, removed or failed any file.
+    """
+    done = 0
+    while rounds is None or done < rounds:
+        result = mirror(src_root, dst_root, **options)
+        if on_update and (result.processed or result.removed or result.errors):
+            on_update(result)
+        done += 1
+        if rounds is None or done < rounds:
+            time.sleep(interval)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Leecode NumPy Engine
+Vectorized encode/decode for large inputs when NumPy is installed.
+
+Errors are detected with array checks and then reported by the core codec,
+so messages always match encode()/decode() exactly.
+"""
+
+import threading
+
+import numpy as np
+
+from leecode_core import clean_input, get_codec
+
+_SENTINEL = 0xFFFFFFFF
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+def _tables_for(codec):
+    """Return (code point → row table, digit rows, code value → code point table) for a codec.
+
+    Row len(mapping) of the digit rows is the sentinel for unsupported characters.
+    """
+    tables = _tables.get(codec)
+    if tables is None:
+        chars = list(codec.char_to_number)
+        rows = np.full(max(map(ord, chars)) + 2, len(chars), dtype=np.intp)
+        rows[[ord(char) for char in chars]] = np.arange(len(chars))
+        digits = np.frombuffer(''.join(codec.char_to_number.values()).encode('ascii') + b'0' * codec.width,
+                               dtype=np.uint8).reshape(len(chars) + 1, codec.width)
+        decoding = np.full(10 ** codec.width, _SENTINEL, dtype=np.uint32)
+        for code, char in codec.number_to_char.items():
+            decoding[int(code)] = ord(char)
+        tables = (rows, digits, decoding)
+        with _tables_lock:
+            tables = _tables.setdefault(codec, tables)
+    return tables
+
+def encode(text, codec=None):
+    """Encode a string; same result and errors as Codec.encode."""
+    codec = get_codec(codec)
+    if not text:
+        return ""
+    text = clean_input(text)
+    rows, digits, _ = _tables_for(codec)
+    chars = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+    # Code points past the table land on its last entry, the sentinel row
+    index = rows[np.minimum(chars, len(rows) - 1)]
+    if (index == len(digits) - 1).any():
+        # Let the codec raise its error for the first unsupported character
+        return codec.encode(text)
+    return digits[index].tobytes().decode('ascii')
+
+def decode(code, codec=None):
+    """Decode a Leecode string; same result and errors as Codec.decode."""
+    codec = get_codec(codec)
+    if not code:
+        return ""
+    data = np.frombuffer(code.encode('utf-8'), dtype=np.uint8)
+    digits = data[(data >= 48) & (data <= 57)]
+    width = codec.width
+    if len(digits) % width != 0:
+        return codec.decode(code)
+    groups = (digits.reshape(-1, width) - 48).astype(np.uint32)
+    values = groups @ np.array([10 ** (width - 1 - i) for i in range(width)], dtype=np.uint32)
+    chars = _tables_for(codec)[2][values]
+    if (chars == _SENTINEL).any():
+        return codec.decode(code)
+    return chars.astype('<u4').tobytes().decode('utf-32-le')
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Leecode Thread Backend
+Shards the batch and large-buffer codec paths across a shared thread pool.
+
+Threads only pay off when the GIL is disabled (free-threaded 3.13t builds).
+The codec's byte work (bytes.translate, big-integer folding, charmap
+decoding) holds the GIL, so on regular builds every call runs inline as
+one shard unless parallel=True forces sharding.
+"""
+
+import os
+import sys
+import threading
+
+from leecode_core import (
+    _NON_DIGIT_BYTES, ItemError, _byte_view, _strip_non_digits, _write, clean_input, get_codec,
+)
+
+# Smallest shard worth a task of its own, in characters/bytes and in batch items
+_MIN_SHARD = 256 * 1024
+_MIN_ITEMS = 512
+
+# Shards per worker, so an uneven shard does not leave the others idle
+_SHARDS_PER_WORKER = 2
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def gil_enabled():
+    """Return whether this interpreter runs with the GIL (always true before 3.13)."""
+    is_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_enabled is None else is_enabled()
+
+def default_workers():
+    """Return the number of threads the backend uses by default."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def shard_size(total, workers=None, parallel=None, minimum=None):
+    """Return the shard size for total units of work; total itself means run inline."""
+    workers = workers or default_workers()
+    minimum = _MIN_SHARD if minimum is None else minimum
+    if parallel is None:
+        parallel = not gil_enabled()
+    if not parallel or workers <= 1:
+        return max(total, 1)
+    shards = workers * _SHARDS_PER_WORKER
+    return max(minimum, -(-total // shards))
+
+def _executor():
+    """Return the shared thread pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # concurrent.futures pulls in logging; import it only when a pool is needed
+            from concurrent.futures import ThreadPoolExecutor
+            _pool = ThreadPoolExecutor(max_workers=default_workers(), thread_name_prefix='leecode')
+        return _pool
+
+def _run(func, shards):
+    """Map func over shards in order, inline when there is only one."""
+    if len(shards) <= 1:
+        return [func(shard) for shard in shards]
+    # Results come back in shard order, so the first error raised is the earliest in the input
+    return list(_executor().map(func, shards))
+
+def _text_shards(text, size):
+    """Split text into shards of about size characters, never inside a space run."""
+    shards = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        while 0 < end < len(text) and text[end] == ' ' and text[end - 1] == ' ':
+            end += 1
+        shards.append(text[start:end])
+        start = end
+    return shards
+
+def _utf8_shards(view, size):
+    """Split a byte view into shards of about size bytes, never inside a character or space run."""
+    shards = []
+    start = 0
+    while start < len(view):
+        end = min(start + size, len(view))
+        while end < len(view) and (view[end] & 0xC0 == 0x80 or view[end] == view[end - 1] == 0x20):
+            end += 1
+        shards.append(view[start:end])
+        start = end
+    return shards
+
+def encode(text, codec=None, workers=None, parallel=None):
+    """Encode a large string across threads; same result and errors as Codec.encode."""
+    codec = get_codec(codec)
+    if not text:
+        return ""
+    text = clean_input(text)
+    size = shard_size(len(text), workers, parallel)
+    return b''.join(_run(codec.encode_bytes, _text_shards(text, size))).decode('ascii')
+
+def _decode_sharded(codec, digits, workers, parallel):
+    """Decode ASCII digit bytes in shards aligned to the code width."""
+    width = codec.width
+    if len(digits) % width != 0:
+        # Let the codec raise its length error
+        return codec.decode_digits(digits)
+    size = shard_size(len(digits), workers, parallel)
+    size = max(width, size - size % width)
+    view = memoryview(digits)
+    return ''.join(_run(codec.decode_digits, [view[i:i + size] for i in range(0, len(digits), size)]))
+
+def decode(code, codec=None, workers=None, parallel=None):
+    """Decode a large Leecode string across threads; same result and errors as Codec.decode."""
+    codec = get_codec(codec)
+    if not code:
+        return ""
+    if not (code.isascii() and code.isdigit()):
+        code = _strip_non_digits(code)
+    return _decode_sharded(codec, code.encode('ascii'), workers, parallel)
+
+def encode_into(src, dst, codec=None, workers=None, parallel=None):
+    """Encode UTF-8 text from any buffer into dst across threads; returns bytes written."""
+    codec = get_codec(codec)
+    source = _byte_view(src)
+    target = _byte_view(dst)
+    shards = _utf8_shards(source, shard_size(len(source), workers, parallel))
+    if len(shards) <= 1:
+        return codec.encode_into(source, target)
+
+    def encode_shard(shard):
+        out = bytearray(codec.width * len(shard))
+        return memoryview(out)[:codec.encode_into(shard, out)]
+
+    written = 0
+    for data in _run(encode_shard, shards):
+        written = _write(target, written, data)
+    return written
+
+def decode_into(src, dst, codec=None, workers=None, parallel=None):
+    """Decode Leecode digits from any buffer into dst across threads; returns bytes written."""
+    codec = get_codec(codec)
+    source = _byte_view(src)
+    target = _byte_view(dst)
+    if shard_size(len(source), workers, parallel) >= len(source):
+        return codec.decode_into(source, target)
+    digits = source.tobytes()
+    if not digits.isdigit():
+        digits = digits.translate(None, _NON_DIGIT_BYTES)
+    return _write(target, 0, _decode_sharded(codec, digits, workers, parallel).encode('utf-8'))
+
+def _many(method, items, workers, parallel):
+    """Run a batch method over item shards, renumbering ItemError indices."""
+    size = shard_size(len(items), workers, parallel, minimum=_MIN_ITEMS)
+    starts = range(0, len(items), size)
+    results = []
+    for start, shard in zip(starts, _run(method, [items[i:i + size] for i in starts])):
+        results.extend(ItemError(start + r.index, r.message) if isinstance(r, ItemError) else r
+                       for r in shard)
+    return results
+
+def encode_many(items, codec=None, workers=None, parallel=None):
+    """Encode many strings across threads; same results as Codec.encode_many."""
+    return _many(get_codec(codec).encode_many, list(items), workers, parallel)
+
+def decode_many(items, codec=None, workers=None, parallel=None):
+    """Decode many Leecode strings across threads; same results as Codec.decode_many."""
+    return _many(get_codec(codec).decode_many, list(items), workers, parallel)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Leecode Corpus Statistics
+Per-symbol frequency histograms over plain or encoded files, counted chunk
+by chunk and merged across parallel shards.
+"""
+
+import csv
+import json
+import os
+import re
+from collections import Counter, namedtuple
+from functools import partial
+
+from leecode_core import _NON_DIGIT_BYTES, get_codec
+from leecode_io import COMPRESSION_EXTENSIONS, SUFFIX, compression_for, open_binary
+
+# Raw bytes read per counting step
+_CHUNK_SIZE = 1 << 20
+
+# Files larger than this are split into shards of about this size
+_SHARD_SIZE = 64 << 20
+
+_ASCII_RUNS = re.compile(r'[\x00-\x7f]+')
+_SPACE_RUN_BYTES = re.compile(rb' {2,}')
+
+# bytes: input bytes read; symbols: characters or codes counted;
+# unsupported: characters outside the mapping (plain) or unknown and
+# incomplete codes (encoded); space_runs/spaces_removed: what clean_input
+# collapses; counts: {code: count} over the whole mapping
+SymbolStats = namedtuple('SymbolStats', ['bytes', 'symbols', 'unsupported', 'space_runs', 'spaces_removed', 'counts'])
+
+_numpy = None
+
+def _load_numpy():
+    """Return numpy if it is installed, importing it on first use."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+def _bincount(data, itemsize, values):
+    """Return {value: occurrences} for the given values among the 1- or 2-byte items of data."""
+    np = _load_numpy()
+    if np is not None:
+        items = np.frombuffer(data, dtype=np.uint8 if itemsize == 1 else np.uint16)
+        counts = np.bincount(items, minlength=max(values) + 1)
+        return {value: int(counts[value]) for value in values}
+    if itemsize == 1:
+        # One C-level count per value beats any per-byte loop in Python
+        return {value: data.count(value) for value in values}
+    found = Counter(memoryview(data).cast('H'))
+    return {value: found[value] for value in values}
+
+def _empty(codec):
+    return SymbolStats(0, 0, 0, 0, 0, dict.fromkeys(codec.number_to_char, 0))
+
+def merge_stats(stats):
+    """Add up SymbolStats from several shards or files."""
+    stats = list(stats)
+    counts = Counter()
+    for item in stats:
+        counts.update(item.counts)
+    first = stats[0].counts if stats else {}
+    return SymbolStats(*(sum(item[i] for item in stats) for i in range(5)),
+                       {code: counts[code] for code in first})
+
+def _reads(stream, limit):
+    """Yield chunks from stream, stopping after limit bytes (None for no limit)."""
+    while limit is None or limit > 0:
+        chunk = stream.read(_CHUNK_SIZE if limit is None else min(_CHUNK_SIZE, limit))
+        if not chunk:
+            return
+        if limit is not None:
+            limit -= len(chunk)
+        yield chunk
+
+def _encoded_stats(stream, codec, limit):
+    """Count codes in an encoded stream; returns (stats, non-digit bytes seen)."""
+    width = codec.width
+    values = range(10 ** width)
+    totals = Counter()
+    size = separators = 0
+    pending = b''
+    for chunk in _reads(stream, limit):
+        size += len(chunk)
+        digits = chunk if chunk.isdigit() else chunk.translate(None, _NON_DIGIT_BYTES)
+        separators += len(chunk) - len(digits)
+        digits = pending + digits
+        cut = len(digits) - len(digits) % width
+        pending = digits[cut:]
+        if cut:
+            totals.update(_bincount(codec._fold(digits[:cut]), 1 if width == 2 else 2, values))
+    counts = {code: totals[int(code)] for code in codec.number_to_char}
+    symbols = sum(totals.values()) + bool(pending)
+    stats = SymbolStats(size, symbols, symbols - sum(counts.values()), 0, 0, counts)
+    return stats, separators
+
+def _plain_stats(stream, codec, limit):
+    """Count the symbols of cleaned UTF-8 text, and the space runs cleaning collapses."""
+    ascii_chars = {char: ord(char) for char in codec.char_to_number if char.isascii()}
+    values = sorted(ascii_chars.values())
+    totals = Counter()
+    size = symbols = runs = removed = 0
+    carry = b''
+    chunks = _reads(stream, limit)
+    while True:
+        chunk = next(chunks, None)
+        if chunk is None:
+            data, carry = carry, b''
+        else:
+            size += len(chunk)
+            data = carry + chunk
+            # Hold back trailing spaces and a possibly cut-off character for the next chunk
+            end = len(data.rstrip(b' '))
+            if end == 0 and len(data) > 2:
+                # All spaces: keep two so the run is still counted once, and
+                # account for the rest now so the carry stays small
+                removed += len(data) - 2
+                data = b'  '
+            start = end
+            while start > 0 and data[start - 1] & 0xC0 == 0x80:
+                start -= 1
+            if start > 0 and data[start - 1] >= 0xC0:
+                end = start - 1
+            data, carry = data[:end], data[end:]
+        if data:
+            cleaned, collapsed = _SPACE_RUN_BYTES.subn(b' ', data)
+            runs += collapsed
+            removed += len(data) - len(cleaned)
+            totals.update(_bincount(cleaned, 1, values))
+            if cleaned.isascii():
+                symbols += len(cleaned)
+            else:
+                text = cleaned.decode('utf-8', 'replace')
+                symbols += len(text)
+                totals.update(_ASCII_RUNS.sub('', text))
+        if chunk is None:
+            break
+    counts = {code: totals[ascii_chars.get(char, char)] for code, char in codec.number_to_char.items()}
+    return SymbolStats(size, symbols, symbols - sum(counts.values()), runs, removed, counts)
+
+def _is_encoded(path):
+    """Guess whether a file holds Leecode digits from its suffix, ignoring compression."""
+    name = os.fspath(path).lower()
+    for extension in COMPRESSION_EXTENSIONS:
+        name = name.removesuffix(extension)
+    return name.endswith(SUFFIX)
+
+def _boundary(f, position, encoded, width):
+    """Move a shard boundary to where counting can restart exactly."""
+    if position == 0:
+        return 0
+    if encoded:
+        return position - position % width
+    # Plain text: never inside a UTF-8 sequence or a space run
+    f.seek(position - 1)
+    previous = f.read(1)
+    while True:
+        data = f.read(4096)
+        for i, byte in enumerate(data):
+            if not (byte & 0xC0 == 0x80 or byte == previous[0] == 0x20):
+                return position + i
+            previous = bytes([byte])
+        if not data:
+            return position + len(data)
+        position += len(data)
+
+def _shard_stats(path, start, end, encoded, codec):
+    """Count one shard [start, end) of a file (end None: to the end); returns (stats, separators)."""
+    codec = get_codec(codec)
+    with open_binary(path, 'rb') as f:
+        if end is not None:
+            width = codec.width
+            start = _boundary(f, start, encoded, width)
+            if end < os.fstat(f.fileno()).st_size:
+                end = _boundary(f, end, encoded, width)
+            f.seek(start)
+        limit = None if end is None else end - start
+        if encoded:
+            return _encoded_stats(f, codec, limit)
+        return _plain_stats(f, codec, limit), 0
+
+def _shards(path, encoded, shard_size):
+    """Split a file into (path, start, end, encoded) shards."""
+    if compression_for(path) is not None:
+        return [(path, 0, None, encoded)]
+    size = os.path.getsize(path)
+    if size <= shard_size:
+        return [(path, 0, None, encoded)]
+    return [(path, start, min(start + shard_size, size), encoded) for start in range(0, size, shard_size)]
+
+def collect_stats(paths, encoded=None, codec=None, workers=0, shard_size=_SHARD_SIZE):
+    """Count symbol frequencies over files, splitting large files into shards across processes.
+
+    encoded=None guesses per file from the .lc suffix. Encoded shards assume
+    digit-only files; a split file that turns out to contain separators is
+    counted again as one shard.
+    """
+    mapping = dict(get_codec(codec).number_to_char)
+    shards = [shard for path in paths
+              for shard in _shards(path, _is_encoded(path) if encoded is None else encoded, shard_size)]
+    worker = partial(_run_shard, codec=mapping)
+    if workers <= 1 or len(shards) <= 1:
+        results = list(map(worker, shards))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(worker, shards))
+
+    merged = []
+    retry = set()
+    for (path, start, end, encoded), (stats, separators) in zip(shards, results):
+        if end is not None and separators:
+            retry.add(path)
+        else:
+            merged.append((path, stats))
+    merged = [stats for path, stats in merged if path not in retry]
+    merged.extend(_run_shard((path, 0, None, True), mapping)[0] for path in sorted(retry))
+    return merge_stats(merged) if merged else _empty(get_codec(codec))
+
+def _run_shard(shard, codec):
+    """Process-pool entry point for _shard_stats."""
+    return _shard_stats(*shard, codec)
+
+def stats_report(stats, codec=None):
+    """Return stats as a JSON-ready dict with one row per code."""
+    codec = get_codec(codec)
+    total = sum(stats.counts.values()) or 1
+    return {
+        'bytes': stats.bytes,
+        'symbols': stats.symbols,
+        'unsupported': stats.unsupported,
+        'space_runs': stats.space_runs,
+        'spaces_removed': stats.spaces_removed,
+        'codes': [{'code': code, 'char': codec.number_to_char[code], 'count': count,
+                   'share': round(count / total, 6)} for code, count in stats.counts.items()],
+    }
+
+def write_json(stats, stream, codec=None):
+    """Write stats as JSON."""
+    json.dump(stats_report(stats, codec), stream, ensure_ascii=False, indent=2)
+    stream.write('\n')
+
+def write_csv(stats, stream, codec=None):
+    """Write the per-code rows of stats as CSV."""
+    # Quote text fields so the tab, newline and carriage-return symbols survive
+    writer = csv.writer(stream, lineterminator='\n', quoting=csv.QUOTE_NONNUMERIC)
+    writer.writerow(['code', 'char', 'count', 'share'])
+    for row in stats_report(stats, codec)['codes']:
+        writer.writerow([row['code'], row['char'], row['count'], row['share']])
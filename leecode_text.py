@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Leecode Lazy Text
+A read-only, str-like view over an encoded blob that decodes only the codes it touches.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+
+from leecode_core import _NON_DIGIT_BYTES, _byte_view, _strip_non_digits, get_codec
+
+# Raw buffer bytes per entry of the digit-offset index
+_RAW_BLOCK = 1 << 16
+
+# Decoded characters per block for sequential scans (iteration, find)
+_SCAN_BLOCK = 1 << 16
+
+def _strip(piece):
+    """Return the ASCII digits of a str or bytes piece as bytes."""
+    if isinstance(piece, str):
+        if not (piece.isascii() and piece.isdigit()):
+            piece = _strip_non_digits(piece)
+        return piece.encode('ascii')
+    piece = bytes(piece)
+    return piece if piece.isdigit() else piece.translate(None, _NON_DIGIT_BYTES)
+
+class LeecodeText:
+    """Lazy decoded view over an encoded str, bytes-like object or mmap.
+
+    Non-digit separators are skipped like decode() does. The digit count is
+    checked when the view is created; unknown codes raise ValueError only
+    when a character that contains them is read. Random access keeps up to
+    max_blocks decoded blocks of block_size characters in an LRU.
+
+    A view over a bytes-like object holds an export of it until close(),
+    which the with statement calls.
+    """
+
+    __slots__ = ('_buffer', '_codec', '_offsets', '_length', '_block_size', '_max_blocks', '_blocks')
+
+    def __init__(self, buffer, codec=None, block_size=1024, max_blocks=64):
+        self._codec = get_codec(codec)
+        self._buffer = buffer if isinstance(buffer, str) else _byte_view(buffer)
+        self._block_size = block_size
+        self._max_blocks = max_blocks
+        self._blocks = OrderedDict()
+
+        # Cumulative digit counts at every raw block start; dropped when the
+        # buffer is all digits, so positions map straight to offsets
+        size = len(self._buffer)
+        offsets = array('Q', [0])
+        for start in range(0, size, _RAW_BLOCK):
+            offsets.append(offsets[-1] + len(_strip(self._buffer[start:start + _RAW_BLOCK])))
+        total = offsets[-1]
+        self._offsets = None if total == size else offsets
+
+        width = self._codec.width
+        if total % width:
+            # Decoding the incomplete trailing code raises the codec's length error
+            self._codec.decode_digits(self._digits(total - total % width, total))
+        self._length = total // width
+
+    def close(self):
+        """Release the view of the underlying buffer, so an mmap behind it can be closed."""
+        if isinstance(self._buffer, memoryview):
+            self._buffer.release()
+        self._blocks.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _digits(self, start, stop):
+        """Return the ASCII digits with digit indices [start, stop) as bytes."""
+        if self._offsets is None:
+            return _strip(self._buffer[start:stop])
+        offsets = self._offsets
+        block = bisect_right(offsets, start) - 1
+        parts = []
+        position = offsets[block]
+        while position < stop and block < len(offsets) - 1:
+            raw = block * _RAW_BLOCK
+            digits = _strip(self._buffer[raw:raw + _RAW_BLOCK])
+            parts.append(digits[max(start - position, 0):stop - position])
+            position = offsets[block + 1]
+            block += 1
+        return b''.join(parts)
+
+    def _decode(self, start, stop):
+        """Decode the characters [start, stop) without touching the block cache."""
+        width = self._codec.width
+        return self._codec.decode_digits(self._digits(width * start, width * stop))
+
+    def _block(self, number):
+        """Return decoded block number, through the LRU."""
+        blocks = self._blocks
+        text = blocks.get(number)
+        if text is not None:
+            blocks.move_to_end(number)
+            return text
+        start = number * self._block_size
+        text = self._decode(start, min(start + self._block_size, self._length))
+        blocks[number] = text
+        if len(blocks) > self._max_blocks:
+            blocks.popitem(last=False)
+        return text
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step == 1:
+                return self._decode(start, stop) if start < stop else ""
+            if step > 0:
+                return self._decode(start, stop)[::step] if start < stop else ""
+            return self._decode(stop + 1, start + 1)[::-1][::-step] if stop < start else ""
+
+        index = key + self._length if key < 0 else key
+        if not 0 <= index < self._length:
+            raise IndexError("LeecodeText index out of range")
+        number, offset = divmod(index, self._block_size)
+        return self._block(number)[offset]
+
+    def __iter__(self):
+        for start in range(0, self._length, _SCAN_BLOCK):
+            yield from self._decode(start, min(start + _SCAN_BLOCK, self._length))
+
+    def __contains__(self, sub):
+        return self.find(sub) != -1
+
+    def __str__(self):
+        return self._decode(0, self._length)
+
+    def __repr__(self):
+        return f"LeecodeText(len={self._length}, codec={self._codec!r})"
+
+    def startswith(self, prefix, start=0, end=None):
+        """Return whether the text (optionally text[start:end]) starts with prefix."""
+        if isinstance(prefix, tuple):
+            return any(self.startswith(p, start, end) for p in prefix)
+        start, end, _ = slice(start, end).indices(self._length)
+        if end - start < len(prefix):
+            return False
+        return self._decode(start, start + len(prefix)) == prefix
+
+    def find(self, sub, start=0, end=None):
+        """Return the lowest index of sub in text[start:end], or -1, decoding block by block."""
+        start, end, _ = slice(start, end).indices(self._length)
+        if not sub:
+            return start if start <= end else -1
+        # Keep the last len(sub) - 1 characters so matches across blocks are found
+        overlap = len(sub) - 1
+        tail = ""
+        for block in range(start, end, _SCAN_BLOCK):
+            window = tail + self._decode(block, min(block + _SCAN_BLOCK, end))
+            found = window.find(sub)
+            if found != -1:
+                return block - len(tail) + found
+            tail = window[max(len(window) - overlap, 0):] if overlap else ""
+        return -1
+
+    def index(self, sub, start=0, end=None):
+        """Like find(), but raise ValueError when sub is not found."""
+        found = self.find(sub, start, end)
+        if found == -1:
+            raise ValueError("substring not found")
+        return found
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Leecode Field Transcoder
+Streams JSONL or CSV exports and encodes/decodes only the selected fields.
+"""
+
+import argparse
+import csv
+import json
+import sys
+from collections import deque
+from functools import partial
+
+from leecode_core import ItemError, decode_many, encode_many
+from leecode_io import COMPRESSION_EXTENSIONS, COMPRESSION_MODULES, open_text
+
+BATCH_FUNCTIONS = {'encode': encode_many, 'decode': decode_many}
+
+def _check_mode(mode):
+    """Return the batch function for mode, rejecting unknown modes."""
+    if mode not in BATCH_FUNCTIONS:
+        raise ValueError(f"Mode must be 'encode' or 'decode', not '{mode}'.")
+    return BATCH_FUNCTIONS[mode]
+
+def _check_errors(errors):
+    """Validate the errors policy."""
+    if errors not in ('strict', 'keep'):
+        raise ValueError(f"Errors must be 'strict' or 'keep', not '{errors}'.")
+
+def _batches(iterable, size):
+    """Yield (first_index, items) chunks of at most size items."""
+    batch = []
+    start = 0
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield start, batch
+            start += len(batch)
+            batch = []
+    if batch:
+        yield start, batch
+
+def _ordered_map(func, batches, workers):
+    """Map func over batches in order, keeping at most 2 * workers batches in flight."""
+    if workers <= 1:
+        yield from map(func, batches)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(func, batch))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _apply(slots, values, mode, errors, describe):
+    """Transcode values in one batch call and write the results back into slots."""
+    results = _check_mode(mode)(values)
+    for (container, key, position), result in zip(slots, results):
+        if isinstance(result, ItemError):
+            if errors == 'strict':
+                raise ValueError(f"{describe(position)}: {result.message}")
+            continue
+        container[key] = result
+
+_JSON_SPACE = ' \t\n\r'
+_json_decoder = json.JSONDecoder()
+
+def _skip_space(line, i):
+    while i < len(line) and line[i] in _JSON_SPACE:
+        i += 1
+    return i
+
+def _scan_object(line, i, paths, prefix, spans):
+    """Record the spans of selected string values in the JSON object at line[i]; returns its end.
+
+    spans gets (path, start, end, value) for every selected string value,
+    duplicates included; everything else is only stepped over.
+    """
+    if line[i] != '{':
+        raise ValueError("Expecting object")
+    i = _skip_space(line, i + 1)
+    if line[i] == '}':
+        return i + 1
+    while True:
+        if line[i] != '"':
+            raise ValueError("Expecting property name")
+        key, i = json.decoder.scanstring(line, i + 1)
+        i = _skip_space(line, i)
+        if line[i] != ':':
+            raise ValueError("Expecting ':' delimiter")
+        i = _skip_space(line, i + 1)
+        path = prefix + (key,)
+        if line[i] == '"' and path in paths:
+            value, end = json.decoder.scanstring(line, i + 1)
+            spans.append((path, i, end, value))
+            i = end
+        elif line[i] == '{' and any(len(p) > len(path) and p[:len(path)] == path for p in paths):
+            i = _scan_object(line, i, paths, path, spans)
+        else:
+            _, i = _json_decoder.raw_decode(line, i)
+        i = _skip_space(line, i)
+        if line[i] == '}':
+            return i + 1
+        if line[i] != ',':
+            raise ValueError("Expecting ',' delimiter")
+        i = _skip_space(line, i + 1)
+
+def _selected_spans(line, paths):
+    """Return the (path, start, end, value) spans of the selected string values in one JSONL line.
+
+    Lines that are not a JSON object have no spans; malformed lines raise
+    json's own ValueError.
+    """
+    spans = []
+    try:
+        i = _scan_object(line, _skip_space(line, 0), paths, (), spans)
+        if _skip_space(line, i) == len(line):
+            return spans
+    except (ValueError, IndexError):
+        pass
+    # Let json report what is wrong; valid non-object lines simply pass through
+    json.loads(line)
+    return []
+
+def _transcode_json_lines(paths, mode, errors, batch):
+    """Transcode the selected fields of one batch of JSONL lines.
+
+    Only the selected string values are replaced in the original text, so
+    every other byte of a line (numbers, spacing, escapes, duplicate keys)
+    passes through untouched, and lines with nothing changed stay identical.
+    """
+    start, lines = batch
+    # Lines that cannot contain any of the selected keys pass through untouched;
+    # a key may be written with \uXXXX escapes, so lines with a backslash are always parsed
+    markers = [json.dumps(path[-1], ensure_ascii=False) for path in paths]
+    selected = set(paths)
+    output = list(lines)
+    edits = {}
+    slots = []
+    values = []
+    for i, line in enumerate(lines):
+        if not line.strip() or ('\\' not in line and not any(marker in line for marker in markers)):
+            continue
+        try:
+            spans = _selected_spans(line, selected)
+        except ValueError as e:
+            if errors == 'strict':
+                raise ValueError(f"Line {start + i + 1}: {e}") from None
+            continue
+        for path, begin, end, value in spans:
+            slots.append((edits.setdefault(i, {}), (begin, end), (i, path)))
+            values.append(value)
+
+    def describe(position):
+        line_index, path = position
+        return f"Line {start + line_index + 1}, field '{'.'.join(path)}'"
+
+    _apply(slots, values, mode, errors, describe)
+    for i, replaced in edits.items():
+        if not replaced:
+            continue
+        line = lines[i]
+        parts = []
+        position = 0
+        for (begin, end), value in sorted(replaced.items()):
+            parts.append(line[position:begin])
+            parts.append(json.dumps(value, ensure_ascii=False))
+            position = end
+        parts.append(line[position:])
+        output[i] = ''.join(parts)
+    return output
+
+def transcode_jsonl(src, dst, fields, mode='encode', batch_size=10000, workers=0, errors='strict'):
+    """Stream JSONL from src to dst, transcoding only the given dotted field paths."""
+    _check_mode(mode)
+    _check_errors(errors)
+    paths = list(dict.fromkeys(tuple(field.split('.')) for field in fields))
+    worker = partial(_transcode_json_lines, paths, mode, errors)
+    count = 0
+    for lines in _ordered_map(worker, _batches(src, batch_size), workers):
+        dst.writelines(lines)
+        count += len(lines)
+    return count
+
+def _transcode_csv_rows(indices, mode, errors, batch):
+    """Transcode the selected columns of one batch of CSV rows."""
+    start, rows = batch
+    slots = []
+    values = []
+    for i, row in enumerate(rows):
+        for column in indices:
+            if column < len(row):
+                slots.append((row, column, (i, column)))
+                values.append(row[column])
+
+    def describe(position):
+        row_index, column = position
+        # Row numbers count the header as row 1
+        return f"Row {start + row_index + 2}, column {column + 1}"
+
+    _apply(slots, values, mode, errors, describe)
+    return rows
+
+def transcode_csv(src, dst, columns, mode='encode', batch_size=10000, workers=0, errors='strict', delimiter=','):
+    """Stream CSV from src to dst, transcoding only the named columns."""
+    _check_mode(mode)
+    _check_errors(errors)
+    reader = csv.reader(src, delimiter=delimiter)
+    writer = csv.writer(dst, delimiter=delimiter, lineterminator='\n')
+    header = next(reader, None)
+    if header is None:
+        return 0
+
+    indices = []
+    for column in dict.fromkeys(columns):
+        if column not in header:
+            raise ValueError(f"Column '{column}' not found in CSV header.")
+        indices.append(header.index(column))
+    writer.writerow(header)
+
+    worker = partial(_transcode_csv_rows, indices, mode, errors)
+    count = 0
+    for rows in _ordered_map(worker, _batches(reader, batch_size), workers):
+        writer.writerows(rows)
+        count += len(rows)
+    return count
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Encode or decode selected fields of JSONL/CSV exports.")
+    parser.add_argument('mode', choices=sorted(BATCH_FUNCTIONS))
+    parser.add_argument('input', help="input file, or - for stdin")
+    parser.add_argument('output', help="output file, or - for stdout")
+    parser.add_argument('-f', '--fields', required=True,
+                        help="comma-separated field paths (JSONL, dotted) or column names (CSV)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'],
+                        help="record format (default: guessed from the input extension)")
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=0, help="worker processes (0 = in-process)")
+    parser.add_argument('--errors', choices=['strict', 'keep'], default='strict',
+                        help="keep leaves values that fail to transcode unchanged")
+    parser.add_argument('--delimiter', help="CSV delimiter (default: tab for .tsv input, else ',')")
+    parser.add_argument('--compress', choices=sorted(COMPRESSION_MODULES) + ['none'],
+                        help="output compression (default: from the output extension)")
+    args = parser.parse_args(argv)
+
+    name = args.input.lower()
+    for extension in COMPRESSION_EXTENSIONS:
+        name = name.removesuffix(extension)
+    fmt = args.format or ('csv' if name.endswith(('.csv', '.tsv')) else 'jsonl')
+    delimiter = args.delimiter or ('\t' if name.endswith('.tsv') else ',')
+    fields = [field.strip() for field in args.fields.split(',') if field.strip()]
+    try:
+        with open_text(args.input, 'r') as src, open_text(args.output, 'w', args.compress) as dst:
+            if fmt == 'csv':
+                count = transcode_csv(src, dst, fields, args.mode, args.batch_size, args.workers,
+                                      args.errors, delimiter)
+            else:
+                count = transcode_jsonl(src, dst, fields, args.mode, args.batch_size, args.workers, args.errors)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Transcoded {count} records", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Leecode Wide-Table Engine
+Pure-Python encode/decode that works two characters per step through
+precomputed wide tables, for builds without NumPy.
+
+Decoding folds each group of 4 digits into one value and maps it through a
+10,000-entry table of 2-character outputs; encoding maps each pair of
+characters through a pair-keyed table of 4-digit outputs. Errors are
+detected by the sentinel (None) and then reported by the core codec, so
+messages and positions always match encode()/decode() exactly. Only
+2-digit codecs have wide tables; others go straight to the core codec.
+"""
+
+import sys
+import threading
+
+from leecode_core import _LOW_BYTE, _strip_non_digits, clean_input, get_codec
+
+_GROUP_WEIGHTS = (1000, 100, 10, 1)
+
+# Per-digit weight tables for folding 4-digit groups into native 16-bit words
+_LOW = {weight: bytes((b - 48) * weight & 0xFF if 48 <= b <= 57 else 0 for b in range(256))
+        for weight in _GROUP_WEIGHTS}
+_HIGH = {weight: bytes((b - 48) * weight >> 8 if 48 <= b <= 57 else 0 for b in range(256))
+         for weight in (1000, 100)}
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+def _tables_for(codec):
+    """Return (4-digit value → pair, ASCII byte pair → code pair, character pair → code pair) for a codec."""
+    tables = _tables.get(codec)
+    if tables is None:
+        groups = [None] * 10000
+        ascii_pairs = [None] * 65536
+        pairs = {}
+        shift = (0, 8) if _LOW_BYTE == 0 else (8, 0)
+        for first, first_code in codec.char_to_number.items():
+            for second, second_code in codec.char_to_number.items():
+                code = first_code + second_code
+                groups[int(code)] = first + second
+                pairs[first + second] = code
+                if first.isascii() and second.isascii():
+                    ascii_pairs[ord(first) << shift[0] | ord(second) << shift[1]] = code
+        tables = (groups, ascii_pairs, pairs)
+        with _tables_lock:
+            tables = _tables.setdefault(codec, tables)
+    return tables
+
+def _fold_groups(data):
+    """Fold ASCII digit bytes (a multiple of 4 long) into one native 16-bit word per 4-digit group."""
+    count = len(data) // 4
+    total = 0
+    for position, weight in enumerate(_GROUP_WEIGHTS):
+        digits = data[position::4]
+        words = bytearray(2 * count)
+        words[_LOW_BYTE::2] = digits.translate(_LOW[weight])
+        if weight in _HIGH:
+            words[1 - _LOW_BYTE::2] = digits.translate(_HIGH[weight])
+        # Word sums stay below 10,000, so carries never cross into the next word
+        total += int.from_bytes(words, sys.byteorder)
+    return total.to_bytes(2 * count, sys.byteorder)
+
+def encode(text, codec=None):
+    """Encode a string; same result and errors as Codec.encode."""
+    codec = get_codec(codec)
+    if not text or codec.width != 2:
+        return codec.encode(text)
+    text = clean_input(text)
+    _, ascii_pairs, pairs = _tables_for(codec)
+    even = len(text) - len(text) % 2
+    try:
+        if text.isascii():
+            data = text[:even].encode('ascii')
+            encoded = ''.join(map(ascii_pairs.__getitem__, memoryview(data).cast('H')))
+        else:
+            encoded = ''.join([pairs[text[i:i + 2]] for i in range(0, even, 2)])
+        if even < len(text):
+            encoded += codec.char_to_number[text[-1]]
+    except (TypeError, KeyError):
+        # Let the codec raise its error for the first unsupported character
+        return codec.encode(text)
+    return encoded
+
+def decode(code, codec=None):
+    """Decode a Leecode string; same result and errors as Codec.decode."""
+    codec = get_codec(codec)
+    if not code or codec.width != 2:
+        return codec.decode(code)
+    if not (code.isascii() and code.isdigit()):
+        code = _strip_non_digits(code)
+    if len(code) % 2 != 0:
+        return codec.decode(code)
+    groups = _tables_for(codec)[0]
+    data = code.encode('ascii')
+    even = len(data) - len(data) % 4
+    try:
+        decoded = ''.join(map(groups.__getitem__, memoryview(_fold_groups(data[:even])).cast('H')))
+        if even < len(data):
+            decoded += codec.number_to_char[code[even:]]
+    except (TypeError, KeyError):
+        # Let the codec raise its error for the first unknown code
+        return codec.decode(code)
+    return decoded
@@ -15,7 +15,9 @@ from kivy.uix.scrollview import ScrollView
 from kivy.uix.popup import Popup
 from kivy.clock import Clock
 from kivy.utils import platform
-import re
+
+from leecode_core import char_to_number, enable_cache
+from leecode_dispatch import decode_result, encode
 
 # Import clipboard functionality
 try:
@@ -28,35 +30,11 @@ try:
         ClipData = autoclass('android.content.ClipData')
         ClipboardManager = autoclass('android.content.ClipboardManager')
         Context = autoclass('android.content.Context')
-    else:
-        # Fallback for desktop testing
-        import pyperclip
 except ImportError:
     pass
 
-# Mapping dictionary from number strings to characters
-number_to_char = {
-    '00': 'A', '01': 'B', '02': 'C', '03': 'D', '04': 'E', '05': 'F',
-    '06': 'G', '07': 'H', '08': 'I', '09': 'J', '10': 'K', '11': 'L',
-    '12': 'M', '13': 'N', '14': 'O', '15': 'P', '16': 'Q', '17': 'R',
-    '18': 'S', '19': 'T', '20': 'U', '21': 'V', '22': 'W', '23': 'X',
-    '24': 'Y', '25': 'Z', '26': 'a', '27': 'b', '28': 'c', '29': 'd',
-    '30': 'e', '31': 'f', '32': 'g', '33': 'h', '34': 'i', '35': 'j',
-    '36': 'k', '37': 'l', '38': 'm', '39': 'n', '40': 'o', '41': 'p',
-    '42': 'q', '43': 'r', '44': 's', '45': 't', '46': 'u', '47': 'v',
-    '48': 'w', '49': 'x', '50': 'y', '51': 'z', '52': '0', '53': '1',
-    '54': '2', '55': '3', '56': '4', '57': '5', '58': '6', '59': '7',
-    '60': '8', '61': '9', '62': '.', '63': ',', '64': '?', '65': '!',
-    '66': ';', '67': ':', '68': "'", '69': '"', '70': '-', '71': '—',
-    '72': '(', '73': ')', '74': '[', '75': ']', '76': '{', '77': '}',
-    '78': '/', '79': '\\', '80': '|', '81': '@', '82': '#', '83': '$',
-    '84': '%', '85': '^', '86': '&', '87': '*', '88': '_', '89': '~',
-    '90': '`', '91': '<', '92': '>', '93': '=', '94': ' ', '95': '\t',
-    '96': '\n', '97': '\r'
-}
-
-# Reverse the dictionary for encoding
-char_to_number = {v: k for k, v in number_to_char.items()}
+# Shared codec; repeated inputs are served from its result cache
+enable_cache()
 
 class LeecodeApp(App):
     def build(self):
@@ -266,11 +244,6 @@ class LeecodeApp(App):
         
         return text
     
-    def clean_input(self, text):
-        """Clean input: collapse multiple spaces."""
-        text = re.sub(r' +', ' ', text)
-        return text
-    
     def encode_text(self, instance):
         """Encode the input text."""
         try:
@@ -279,14 +252,7 @@ class LeecodeApp(App):
                 self.show_popup("Warning", "Please enter some text to encode.")
                 return
             
-            cleaned_text = self.clean_input(input_text)
-            encoded = ''
-            
-            for char in cleaned_text:
-                if char in char_to_number:
-                    encoded += char_to_number[char]
-                else:
-                    raise ValueError(f"Character '{char}' not supported in Leecode mapping.")
+            encoded = encode(input_text)
             
             self.encode_output.text = encoded
             self.encode_status.text = f"✓ Encoded: {len(input_text)} chars → {len(encoded)} digits"
@@ -305,22 +271,12 @@ class LeecodeApp(App):
                 self.show_popup("Warning", "Please enter a Leecode to decode.")
                 return
             
-            # Remove any whitespace or non-digit characters
-            clean_code = re.sub(r'[^0-9]', '', input_code)
-            
-            if len(clean_code) % 2 != 0:
-                raise ValueError("Encoded string length must be even (pairs of digits).")
-            
-            decoded = ''
-            for i in range(0, len(clean_code), 2):
-                part = clean_code[i:i+2]
-                if part in number_to_char:
-                    decoded += number_to_char[part]
-                else:
-                    raise ValueError(f"Code '{part}' not found in Leecode mapping.")
+            # Non-digit characters are stripped while decoding
+            result = decode_result(input_code)
+            decoded = result.output
             
             self.decode_output.text = decoded
-            self.decode_status.text = f"✓ Decoded: {len(clean_code)} digits → {len(decoded)} chars"
+            self.decode_status.text = f"✓ Decoded: {result.cleaned_length} digits → {len(decoded)} chars"
             self.decode_status.color = (0, 1, 0, 1)  # Green
             
         except Exception as e:
@@ -334,8 +290,9 @@ class LeecodeApp(App):
             if platform == 'android':
                 self.copy_to_android_clipboard(text)
             else:
-                # Fallback for desktop testing
+                # Fallback for desktop testing; pyperclip is only loaded on first copy
                 try:
+                    import pyperclip
                     pyperclip.copy(text)
                 except:
                     pass
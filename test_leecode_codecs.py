@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the codecs registration of Leecode.
+"""
+
+import codecs
+import io
+
+import pytest
+
+import leecode_codecs  # noqa: F401 - registers the codec
+from leecode_core import clean_input, decode, encode, register_codec
+
+TEXT = "Hello   World — it's  a test!\n" * 50
+
+def test_one_shot_functions():
+    assert codecs.encode(TEXT, 'leecode') == encode(TEXT).encode('ascii')
+    assert TEXT.encode('leecode').decode('leecode') == clean_input(TEXT)
+    assert codecs.decode(b"07 14\n", 'leecode') == "HO"
+
+def test_open_file_round_trip(tmp_path):
+    path = tmp_path / 'data.lee'
+    with open(path, 'w', encoding='leecode') as f:
+        # Space runs split across writes still collapse to one space
+        for piece in ["Hello ", "  ", " World", "!"]:
+            f.write(piece)
+    assert path.read_bytes() == encode("Hello World!").encode('ascii')
+    with open(path, encoding='leecode') as f:
+        assert f.read() == "Hello World!"
+
+def test_text_wrapper_small_chunks():
+    raw = io.BytesIO(encode(TEXT).encode('ascii'))
+    wrapper = io.TextIOWrapper(raw, encoding='leecode')
+    wrapper._CHUNK_SIZE = 7
+    assert wrapper.read() == clean_input(TEXT)
+
+def test_incremental_decoder_holds_partial_code():
+    decoder = codecs.getincrementaldecoder('leecode')()
+    assert decoder.decode(b"071") == "H"
+    assert decoder.decode(b"4 3") == "O"
+    assert decoder.getstate() == (b"3", 0)
+    with pytest.raises(UnicodeDecodeError, match="even"):
+        decoder.decode(b"", final=True)
+
+def test_stream_reader_and_writer():
+    buffer = io.BytesIO()
+    writer = codecs.getwriter('leecode')(buffer)
+    writer.write("a  ")
+    writer.write(" b")
+    assert buffer.getvalue() == encode("a b").encode('ascii')
+    reader = codecs.getreader('leecode')(io.BytesIO(b"26942"))
+    with pytest.raises(UnicodeDecodeError):
+        reader.read()
+
+def test_errors():
+    with pytest.raises(UnicodeEncodeError) as info:
+        "abc é".encode('leecode')
+    assert info.value.start == 4
+    with pytest.raises(UnicodeDecodeError, match="Code '98'"):
+        b"9800".decode('leecode')
+
+def test_registered_alphabets():
+    register_codec('Tenant Two', {'00': 'y', '01': 'x'})
+    assert "xy".encode('leecode-tenant-two') == b"0100"
+    assert b"0001".decode('leecode_tenant_two') == "yx"
+    with pytest.raises(LookupError):
+        codecs.lookup('leecode-missing')
+    assert decode(encode("xy")) == "xy"
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 5, 1 << 16])
+def test_iter_encode_decode(chunk_size):
+    pieces = list(leecode_codecs.iter_encode(TEXT, chunk_size=chunk_size))
+    assert ''.join(pieces) == encode(TEXT)
+    assert ''.join(leecode_codecs.iter_decode(" ".join(pieces), chunk_size=chunk_size)) == clean_input(TEXT)
+    assert list(leecode_codecs.iter_encode("")) == list(leecode_codecs.iter_decode("")) == []
+
+def test_iter_errors_match_one_shot():
+    pieces = leecode_codecs.iter_encode("ab" * 10 + "€", chunk_size=4)
+    assert next(pieces) == encode("abab")
+    with pytest.raises(ValueError, match=r"^Character '€' \(Unicode: 8364\) not supported"):
+        list(pieces)
+    with pytest.raises(ValueError, match="^Code '98' not found"):
+        list(leecode_codecs.iter_decode("0798", chunk_size=3))
+    with pytest.raises(ValueError, match="^Encoded string length must be even"):
+        list(leecode_codecs.iter_decode("07140", chunk_size=2))
+    # Like decode(), an odd digit count wins over an unknown code
+    with pytest.raises(ValueError, match="^Encoded string length must be even"):
+        list(leecode_codecs.iter_decode("0798" + "07" * 10 + "1", chunk_size=3))
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared Leecode core codec.
+Every fast path is checked against the reference encode/decode.
+"""
+
+import mmap
+import random
+import re
+
+import pytest
+
+import leecode_core
+import test_leecode as reference
+from leecode_core import (
+    DEFAULT_CODEC, Codec, CodecResult, ItemError, ResultCache, cache_stats,
+    char_to_number, clean_input, decode, decode_into, decode_many,
+    decode_result, disable_cache, enable_cache, encode, encode_into,
+    encode_many, encode_result, get_codec, register_codec,
+)
+from leecode_fuzz import outcome
+
+SAMPLES = [
+    "Hello World!",
+    "Python 3.11",
+    "Multiple   spaces   here",
+    "  leading and trailing  ",
+    "Em — dash",
+    "\n\t\r",
+    "",
+]
+
+def test_clean_input_matches_regex():
+    rng = random.Random(43)
+    texts = ["", " ", "   ", "a", " a ", "a  b", "  a   b    ", "a" + " " * 1001 + "b", "x  "]
+    texts += [''.join(rng.choice('  ab') for _ in range(rng.randrange(20))) for _ in range(2000)]
+    for text in texts:
+        expected = re.sub(' +', ' ', text)
+        assert clean_input(text) == expected
+        assert leecode_core._collapse_spaces(text.encode('ascii'), b' ') == expected.encode('ascii')
+
+def test_codec_matches_reference():
+    rng = random.Random(29)
+    alphabet = ''.join(char_to_number) + '   é\x01'
+    texts = SAMPLES + [''.join(rng.choice(alphabet) for _ in range(rng.randrange(40))) for _ in range(300)]
+    codes = [result for _, result in (outcome(reference.encode, t) for t in texts)] + ['9899', '07 14-30', '123', 'x', '00' * 50 + '98']
+    for text in texts:
+        assert outcome(encode, text) == outcome(reference.encode, text)
+    for code in codes:
+        assert outcome(decode, code) == outcome(reference.decode, code)
+
+def test_results_report_lengths():
+    assert encode_result("a   b") == CodecResult(encode("a b"), 5, 3, 6)
+    assert decode_result("07 14") == CodecResult("HO", 5, 4, 2)
+    assert decode_result("") == CodecResult("", 0, 0, 0)
+
+def test_encode_many_matches_encode():
+    assert encode_many(SAMPLES) == [encode(s) for s in SAMPLES]
+
+def test_encode_many_keeps_space_runs_per_item():
+    # Trailing and leading spaces of neighbours must not collapse together
+    assert encode_many(["a ", " b"]) == [encode("a "), encode(" b")]
+
+def test_encode_many_reports_item_errors():
+    results = encode_many(["ok", "bad é", "fine"])
+    assert results[0] == encode("ok")
+    assert results[2] == encode("fine")
+    assert results[1] == ItemError(1, "Character 'é' (Unicode: 233) not supported in Leecode mapping.")
+
+def test_encode_many_separator_inside_item():
+    results = encode_many(["a\x00b", "c"])
+    assert isinstance(results[0], ItemError)
+    assert results[1] == encode("c")
+
+def test_decode_many_matches_decode():
+    codes = [encode(s) for s in SAMPLES] + ["07 14 30 37", "abc"]
+    assert decode_many(codes) == [decode(c) for c in codes]
+
+def test_decode_many_reports_item_errors():
+    results = decode_many(["0714", "123", "9899", "00"])
+    assert results[0] == decode("0714")
+    assert results[1] == ItemError(1, "Encoded string length must be even (pairs of digits).")
+    assert results[2] == ItemError(2, "Code '98' not found in Leecode mapping.")
+    assert results[3] == "A"
+
+def test_batch_round_trip_full_alphabet():
+    text = ''.join(char_to_number)
+    encoded = encode_many([text] * 3)
+    assert decode_many(encoded) == [clean_input(text)] * 3
+
+def test_reference_errors():
+    with pytest.raises(ValueError):
+        encode("é")
+    with pytest.raises(ValueError):
+        decode("123")
+
+def test_encode_many_rejects_stand_in_character():
+    # The em-dash travels through the byte tables as \x01, which is itself unsupported
+    assert encode_many(["—", "\x01"]) == [encode("—"), ItemError(1, "Character '\x01' (Unicode: 1) not supported in Leecode mapping.")]
+
+def test_result_cache_lru_and_limits():
+    cache = ResultCache(max_entries=2, max_bytes=10_000)
+    cache.put(('encode', 'a'), '26')
+    cache.put(('encode', 'b'), '27')
+    assert cache.get(('encode', 'a')) == '26'
+    cache.put(('encode', 'c'), '28')
+    # 'b' was least recently used
+    assert cache.get(('encode', 'b')) is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+    cache.resize(2, 1)
+    assert len(cache) == 0
+
+def test_shared_cache_is_opt_in():
+    disable_cache()
+    assert cache_stats() is None
+    try:
+        enable_cache(max_entries=8)
+        assert encode("Hi there") == encode("Hi there")
+        assert decode("0714") == "HO"
+        stats = cache_stats()
+        assert stats['hits'] == 1 and stats['misses'] == 2
+        # Errors are never cached
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                decode("9899")
+        assert cache_stats()['entries'] == 2
+    finally:
+        disable_cache()
+
+def encode_bytes(text):
+    dst = bytearray(4 * len(text.encode('utf-8')) + 8)
+    return bytes(dst[:encode_into(text.encode('utf-8'), dst)])
+
+def decode_bytes(code):
+    dst = bytearray(len(code) * 2 + 8)
+    return bytes(dst[:decode_into(code.encode('ascii'), memoryview(dst))])
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 4, 1 << 20])
+def test_buffer_api_matches_str_api(monkeypatch, chunk_size):
+    monkeypatch.setattr(leecode_core, '_CHUNK_SIZE', chunk_size)
+    for text in SAMPLES + ["a" + " " * 9 + "b—" * 3 + "   "]:
+        assert encode_bytes(text) == encode(text).encode('ascii')
+        assert decode_bytes(encode(text)) == clean_input(text).encode('utf-8')
+    assert decode_bytes("07 14\n30") == b"HOe"
+
+@pytest.mark.parametrize('chunk_size', [3, 1 << 20])
+def test_buffer_api_errors_match(monkeypatch, chunk_size):
+    monkeypatch.setattr(leecode_core, '_CHUNK_SIZE', chunk_size)
+    for text in ["ok é", "\x01", "——\x01"]:
+        assert outcome(encode_bytes, text) == outcome(encode, text)
+    for code in ["123", "0098", "98000", "00 99 0"]:
+        assert outcome(decode_bytes, code) == outcome(decode, code)
+
+def test_buffer_api_writes_into_mmap():
+    text = "Hi — there".encode('utf-8')
+    with mmap.mmap(-1, 64) as target:
+        written = encode_into(text, target)
+        assert target[:written] == encode("Hi — there").encode('ascii')
+    with pytest.raises(ValueError, match="too small"):
+        encode_into(b"abc", bytearray(5))
+
+# Extended 3-digit alphabet with enough accented letters to need the translate-based substitution
+WIDE = {f'{i:03d}': char for i, char in enumerate(list(char_to_number) + list('éèàüöäßñ'))}
+# More non-ASCII characters than there are free ASCII stand-ins
+CYRILLIC = {f'{i:03d}': chr(0x400 + i) for i in range(300)}
+CYRILLIC['300'] = ' '
+
+def test_codec_validation():
+    with pytest.raises(ValueError, match="same width"):
+        Codec({'00': 'a', '001': 'b'})
+    with pytest.raises(ValueError, match="only digits"):
+        Codec({'0x': 'a'})
+    with pytest.raises(ValueError, match="bijective"):
+        Codec({'00': 'a', '01': 'a'})
+    with pytest.raises(ValueError, match="Unknown"):
+        get_codec('no-such-codec')
+
+def test_registry_caches_compiled_codecs():
+    assert get_codec() is DEFAULT_CODEC
+    assert get_codec('leecode') is DEFAULT_CODEC
+    assert get_codec(dict(DEFAULT_CODEC.number_to_char)) is DEFAULT_CODEC
+    tenant = register_codec('tenant-swap', {'00': 'b', '01': 'a', '02': ' '})
+    assert get_codec('tenant-swap') is tenant
+    assert get_codec({'01': 'a', '00': 'b', '02': ' '}) is tenant
+    assert tenant.encode("ab  ba") == "0100020001"
+    assert tenant.decode_many(["0100", "03"]) == ["ab", ItemError(1, "Code '03' not found in Leecode mapping.")]
+
+@pytest.mark.parametrize('mapping', [WIDE, CYRILLIC])
+def test_three_digit_codecs(monkeypatch, mapping):
+    monkeypatch.setattr(leecode_core, '_CHUNK_SIZE', 5)
+    codec = get_codec(mapping)
+    assert codec.width == 3
+    text = ''.join(list(mapping.values())[::-1]) + "   " + ''.join(mapping.values())
+    encoded = codec.encode(text)
+    assert len(encoded) == 3 * len(clean_input(text))
+    assert codec.decode(encoded) == clean_input(text)
+    assert codec.encode_many([text, ""]) == [encoded, ""]
+
+    dst = bytearray(len(encoded) + 16)
+    written = codec.encode_into(text.encode('utf-8'), dst)
+    assert dst[:written].decode('ascii') == encoded
+    out = bytearray(4 * len(text))
+    written = codec.decode_into(dst[:len(encoded)], out)
+    assert out[:written].decode('utf-8') == clean_input(text)
+
+    assert outcome(codec.decode, "0001") == ('error', "Encoded string length must be a multiple of 3 (groups of 3 digits).")
+    assert outcome(codec.decode, "000999") == ('error', "Code '999' not found in Leecode mapping.")
+    assert outcome(codec.encode, "\x01") == ('error', "Character '\x01' (Unicode: 1) not supported in Leecode mapping.")
+
+def test_cache_is_keyed_per_codec():
+    tenant = get_codec({'00': 'b', '01': 'a'})
+    try:
+        enable_cache()
+        assert decode("0001") == "AB"
+        assert tenant.decode("0001") == "ba"
+    finally:
+        disable_cache()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for delta sync: signatures, deltas that scale with the edit, patching
+and the checks that catch a wrong old file or a corrupt delta.
+"""
+
+import gzip
+import io
+import random
+
+import pytest
+
+import leecode_cli
+from leecode_core import encode, get_codec
+from leecode_delta import (
+    apply_delta, delta_file, patch_file, read_signature, signature_file, write_delta, write_signature,
+)
+
+WORDS = "Hello World — the quick brown fox jumps over the lazy dog".split()
+RNG = random.Random(7)
+TEXT = ' '.join(RNG.choice(WORDS) for _ in range(20000))
+OLD = encode(TEXT).encode('ascii')
+
+def sync(old, new, block_symbols=64, chunk_size=1 << 20, codec=None):
+    """Return (rebuilt file, delta bytes, DeltaReport) for shipping new to a holder of old."""
+    sig = io.BytesIO()
+    write_signature(io.BytesIO(old), sig, codec, block_symbols)
+    sig.seek(0)
+    delta = io.BytesIO()
+    report = write_delta(read_signature(sig, codec), io.BytesIO(new), delta, chunk_size)
+    delta.seek(0)
+    out = io.BytesIO()
+    apply_delta(io.BytesIO(old), delta, out, codec)
+    return out.getvalue(), delta.getvalue(), report
+
+@pytest.mark.parametrize('edit', [
+    lambda text: text,
+    lambda text: text[:5000] + "INSERTED " + text[5000:],
+    lambda text: text[:5000] + text[5100:],
+    lambda text: "prefix " + text + " suffix",
+    lambda text: text[:30000],
+    lambda text: "",
+])
+@pytest.mark.parametrize('chunk_size', [1, 333, 1 << 20])
+def test_round_trip(edit, chunk_size):
+    new = encode(edit(TEXT)).encode('ascii')
+    rebuilt, _, report = sync(OLD, new, chunk_size=chunk_size)
+    assert rebuilt == new
+    assert report.copied + report.literal == len(new)
+
+def test_delta_scales_with_edit():
+    new = encode(TEXT[:10000] + "a small edit" + TEXT[10010:]).encode('ascii')
+    _, delta, report = sync(OLD, new)
+    # The edit touches at most a couple of 64-symbol blocks around it
+    assert report.literal <= 3 * 128
+    assert len(delta) < len(new) // 50
+
+def test_matches_stay_on_code_boundaries():
+    # A one-digit shift would re-align every block by bytes but not by codes
+    new = b'1' + OLD
+    rebuilt, _, report = sync(OLD, new)
+    assert rebuilt == new
+    assert report.copied == 0
+
+def test_three_digit_codec():
+    codec = get_codec({f"{100 + i:03d}": char for i, char in enumerate(get_codec().char_to_number)})
+    old = codec.encode(TEXT).encode('ascii')
+    new = codec.encode("x" + TEXT).encode('ascii')
+    rebuilt, _, report = sync(old, new, codec=codec)
+    assert rebuilt == new and report.literal == 3
+    sig = io.BytesIO()
+    write_signature(io.BytesIO(old), sig, codec)
+    sig.seek(0)
+    with pytest.raises(ValueError, match="3-digit codes"):
+        read_signature(sig)
+
+def test_wrong_old_file_is_detected():
+    new = encode(TEXT + " more").encode('ascii')
+    _, delta, _ = sync(OLD, new)
+    other = encode(TEXT.upper()).encode('ascii')
+    with pytest.raises(ValueError, match="wrong old file"):
+        apply_delta(io.BytesIO(other), io.BytesIO(delta), io.BytesIO())
+    with pytest.raises(ValueError, match="truncated"):
+        apply_delta(io.BytesIO(OLD), io.BytesIO(delta[:-3]), io.BytesIO())
+    with pytest.raises(ValueError, match="Not a Leecode delta"):
+        apply_delta(io.BytesIO(OLD), io.BytesIO(b'x' * 64), io.BytesIO())
+
+def test_files_and_cli(tmp_path, capsys):
+    old, new = tmp_path / 'old.lc', tmp_path / 'new.lc'
+    old.write_bytes(OLD)
+    new.write_bytes(encode(TEXT[:20000] + "edited" + TEXT[20000:]).encode('ascii'))
+    assert signature_file(str(old), str(tmp_path / 'api.sig')) > 0
+    delta_file(str(tmp_path / 'api.sig'), str(new), str(tmp_path / 'api.delta'))
+    patch_file(str(old), str(tmp_path / 'api.delta'), str(tmp_path / 'api.out'))
+    assert (tmp_path / 'api.out').read_bytes() == new.read_bytes()
+
+    assert leecode_cli.main(['signature', str(old), str(tmp_path / 'old.sig'), '--block-size', '128']) == 0
+    assert leecode_cli.main(['delta', str(tmp_path / 'old.sig'), str(new), str(tmp_path / 'new.delta.gz')]) == 0
+    assert leecode_cli.main(['patch', str(old), str(tmp_path / 'new.delta.gz'), str(tmp_path / 'out.lc')]) == 0
+    assert (tmp_path / 'out.lc').read_bytes() == new.read_bytes()
+    assert gzip.decompress((tmp_path / 'new.delta.gz').read_bytes()).startswith(b'LCDL')
+    assert "Rebuilt" in capsys.readouterr().err
+    assert leecode_cli.main(['patch', str(new), str(tmp_path / 'new.delta.gz'), str(tmp_path / 'bad.lc')]) == 1
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the engine dispatcher: every engine gives the core codec's results
+and errors, and the profile decides which one runs.
+"""
+
+import json
+import random
+
+import pytest
+
+import leecode_dispatch
+from leecode_core import char_to_number, get_codec
+from leecode_dispatch import (
+    calibrate, choose_engine, decode_result, default_profile, encode, encode_many, load_profile,
+)
+from leecode_fuzz import outcome
+
+@pytest.fixture(autouse=True)
+def profile(tmp_path, monkeypatch):
+    monkeypatch.setenv('LEECODE_PROFILE', str(tmp_path / 'profile.json'))
+    monkeypatch.setattr(leecode_dispatch, '_profile', None)
+    return tmp_path / 'profile.json'
+
+def use_profile(monkeypatch, **settings):
+    profile = dict(default_profile(), **settings)
+    monkeypatch.setattr(leecode_dispatch, '_profile', profile)
+    return profile
+
+def random_text(size):
+    rng = random.Random(size)
+    return ''.join(rng.choice(''.join(char_to_number) + '  ') for _ in range(size))
+
+def test_small_inputs_use_core():
+    assert choose_engine(10) == 'core'
+    assert choose_engine(10**6, 'decode') == 'core'
+
+def test_memory_budget_selects_buffer(monkeypatch):
+    profile = use_profile(monkeypatch, memory_budget=1000)
+    assert choose_engine(100, profile=profile) == 'core'
+    assert choose_engine(1000, profile=profile) == 'buffer'
+    assert choose_engine(1000, 'decode', profile=profile) == 'buffer'
+
+def test_numpy_threshold(monkeypatch):
+    pytest.importorskip('numpy')
+    profile = use_profile(monkeypatch, numpy=500)
+    assert choose_engine(499, profile=profile) == 'core'
+    assert choose_engine(500, profile=profile) == 'numpy'
+
+def test_numpy_missing_falls_back(monkeypatch):
+    monkeypatch.setattr(leecode_dispatch, '_numpy_engine', lambda: None)
+    assert choose_engine(10**6, profile=dict(default_profile(), numpy=1)) == 'core'
+
+@pytest.mark.parametrize('engine', ['core', 'buffer', 'numpy', 'wide'])
+@pytest.mark.parametrize('mapping', [None, {f"{100 + i:03d}": char for i, char in enumerate(char_to_number)}])
+def test_engines_match_codec(engine, mapping):
+    if engine == 'numpy':
+        pytest.importorskip('numpy')
+    codec = get_codec(mapping)
+    text = random_text(3000)
+    code = codec.encode(text)
+    assert leecode_dispatch._run(engine, 'encode', codec, text) == code
+    assert leecode_dispatch._run(engine, 'decode', codec, code) == codec.decode(code)
+    for bad in ["abc€", "x  \U0001F600"]:
+        assert outcome(leecode_dispatch._run, engine, 'encode', codec, bad) == outcome(codec.encode, bad)
+    for bad in ["1", "9" * codec.width * 3, "0" * codec.width + "9" * (codec.width + 1)]:
+        assert outcome(leecode_dispatch._run, engine, 'decode', codec, bad) == outcome(codec.decode, bad)
+
+def test_front_door(monkeypatch):
+    use_profile(monkeypatch, memory_budget=100)
+    text = random_text(500)
+    code = get_codec().encode(text)
+    assert encode(text) == code
+    result = decode_result(code)
+    assert result == get_codec().decode_result(code)
+    assert encode_many([text, "€"])[0] == code
+
+def test_load_profile_reads_saved_values(profile):
+    profile.write_text(json.dumps({'version': 1, 'numpy': 4096, 'memory_budget': 123}))
+    loaded = load_profile()
+    assert loaded['numpy'] == 4096
+    assert loaded['memory_budget'] == 123
+    assert loaded['threads'] is None
+    assert load_profile() is loaded
+
+def test_load_profile_ignores_other_versions(profile):
+    profile.write_text(json.dumps({'version': 99, 'numpy': 1}))
+    assert load_profile()['numpy'] is None
+
+@pytest.mark.parametrize('content', ['[1, 2]', '"profile"', '42', 'null', '{not json'])
+def test_load_profile_ignores_malformed_files(profile, content):
+    profile.write_text(content)
+    assert load_profile(str(profile)) == default_profile()
+
+def test_calibrate_saves_profile(profile):
+    result = calibrate(sizes=(64, 256), repeat=1)
+    saved = json.loads(profile.read_text())
+    assert saved == result
+    assert load_profile() == result
+    assert result['threads'] is None or result['threads'] in (64, 256)
+
+def test_cli_calibrate(tmp_path, capsys, monkeypatch):
+    from leecode_cli import main
+    monkeypatch.setattr(leecode_dispatch.calibrate, '__defaults__', (None, (64,), 1, True))
+    assert main(['calibrate', '--profile', str(tmp_path / 'cli.json')]) == 0
+    assert 'numpy: ' in capsys.readouterr().out
+    assert (tmp_path / 'cli.json').exists()
+
+def test_wide_threshold(monkeypatch):
+    profile = use_profile(monkeypatch, wide=1000)
+    assert choose_engine(999, profile=profile) == 'core'
+    assert choose_engine(1000, 'decode', profile=profile) == 'wide'
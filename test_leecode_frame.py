@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for the block-framed container: round trips, random access, parallel
+decode, corruption containment and legacy conversion.
+"""
+
+import io
+
+import pytest
+
+import leecode_cli
+from leecode_core import clean_input, encode, get_codec
+from leecode_frame import FrameReader, FrameWriter, decode_framed, encode_framed
+
+TEXT = "Hello   World — framed\r\n" * 300 + "end  "
+
+def framed(text=TEXT, block_symbols=50, chunk=37, codec=None):
+    """Write text to an in-memory container in chunks of chunk characters."""
+    stream = io.BytesIO()
+    with FrameWriter(stream, codec, block_symbols) as writer:
+        for start in range(0, len(text), chunk):
+            writer.write(text[start:start + chunk])
+    return stream.getvalue()
+
+@pytest.mark.parametrize('chunk', [1, 37, 1 << 20])
+def test_round_trip(chunk):
+    data = framed(chunk=chunk)
+    reader = FrameReader(io.BytesIO(data))
+    assert ''.join(reader) == clean_input(TEXT)
+    assert reader.symbols == len(clean_input(TEXT))
+    assert len(reader) == -(-reader.symbols // 50)
+    assert all(block.symbols == 50 for block in reader.blocks[:-1])
+
+def test_three_digit_codec():
+    codec = get_codec({f"{100 + i:03d}": char for i, char in enumerate(get_codec().char_to_number)})
+    data = framed("abc  def" * 40, block_symbols=16, codec=codec)
+    assert ''.join(FrameReader(io.BytesIO(data), codec)) == clean_input("abc  def" * 40)
+    with pytest.raises(ValueError, match="3-digit codes"):
+        FrameReader(io.BytesIO(data))
+
+def test_random_access():
+    reader = FrameReader(io.BytesIO(framed()))
+    cleaned = clean_input(TEXT)
+    for start, count in [(0, 10), (45, 10), (50, 50), (99, 203), (len(cleaned) - 3, 10), (len(cleaned), 5)]:
+        assert reader.read(start, count) == cleaned[start:start + count]
+    assert reader.read(1000) == cleaned[1000:]
+    assert reader.decode_block(2) == cleaned[100:150]
+
+def test_empty_container():
+    reader = FrameReader(io.BytesIO(framed("")))
+    assert len(reader) == 0
+    assert list(reader) == []
+    assert reader.read() == ""
+
+def corrupt(data, block, reader=None):
+    """Flip one digit inside the given block."""
+    reader = reader or FrameReader(io.BytesIO(data))
+    position = reader.blocks[block].offset + 16 + 3
+    data = bytearray(data)
+    data[position] = ord('0') if data[position] != ord('0') else ord('1')
+    return bytes(data)
+
+def test_corruption_stays_in_block():
+    data = corrupt(framed(), 3)
+    reader = FrameReader(io.BytesIO(data))
+    cleaned = clean_input(TEXT)
+    assert reader.decode_block(2) == cleaned[100:150]
+    assert reader.decode_block(4) == cleaned[200:250]
+    with pytest.raises(ValueError, match="Block 3 failed its CRC check."):
+        reader.decode_block(3)
+    with pytest.raises(ValueError, match="Block 3 failed its CRC check."):
+        list(FrameReader(io.BytesIO(data)))
+
+def test_writer_errors_match_codec():
+    with pytest.raises(ValueError, match=r"Character '€' \(Unicode: 8364\)"):
+        FrameWriter(io.BytesIO()).write("a€")
+    writer = FrameWriter(io.BytesIO())
+    writer.write_digits(b'123')
+    with pytest.raises(ValueError, match="Encoded string length must be even"):
+        writer.close()
+
+def test_not_framed():
+    with pytest.raises(ValueError, match="Not a framed Leecode file."):
+        FrameReader(io.BytesIO(b'0102'))
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_decode_framed(tmp_path, workers):
+    plain = tmp_path / 'plain.txt'
+    plain.write_bytes(TEXT.encode('utf-8'))
+    packed = tmp_path / 'packed.lcf'
+    assert encode_framed(plain, packed, block_symbols=64) == -(-len(clean_input(TEXT)) // 64)
+    out = tmp_path / 'out.txt'
+    report = decode_framed(packed, out, workers=workers)
+    assert out.read_bytes().decode('utf-8') == clean_input(TEXT)
+    assert report.corrupt == [] and report.symbols == len(clean_input(TEXT))
+
+    packed.write_bytes(corrupt(packed.read_bytes(), 1))
+    with pytest.raises(ValueError, match="Block 1 failed"):
+        decode_framed(packed, out, workers=workers)
+    report = decode_framed(packed, out, workers=workers, errors='replace')
+    assert report.corrupt == [1]
+    expected = clean_input(TEXT)
+    assert out.read_bytes().decode('utf-8') == expected[:64] + '�' * 64 + expected[128:]
+
+    # A corrupt block header only costs its own block on seekable input
+    data = bytearray(framed(block_symbols=64))
+    data[FrameReader(io.BytesIO(bytes(data))).blocks[1].offset] ^= 0xFF
+    packed.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="Block 1 has a corrupt header."):
+        decode_framed(packed, out, workers=workers)
+    assert decode_framed(packed, out, workers=workers, errors='replace').corrupt == [1]
+    assert out.read_bytes().decode('utf-8') == expected[:64] + '�' * 64 + expected[128:]
+
+def test_legacy_conversion(tmp_path):
+    legacy = tmp_path / 'legacy.lc'
+    legacy.write_bytes(encode(TEXT).encode('ascii'))
+    packed = tmp_path / 'packed.lcf.gz'
+    encode_framed(legacy, packed, block_symbols=100, legacy=True)
+    back = tmp_path / 'back.lc'
+    report = decode_framed(packed, back, legacy=True)
+    assert back.read_bytes() == legacy.read_bytes()
+    assert report.blocks == -(-report.symbols // 100)
+
+def test_cli(tmp_path, capsys):
+    plain = tmp_path / 'plain.txt'
+    plain.write_text("framed  text", encoding='utf-8')
+    packed = tmp_path / 'plain.lcf'
+    assert leecode_cli.main(['frame', str(plain), str(packed), '--block-size', '4']) == 0
+    out = tmp_path / 'out.txt'
+    assert leecode_cli.main(['unframe', str(packed), str(out), '--workers', '0']) == 0
+    assert out.read_text(encoding='utf-8') == "framed text"
+
+    packed.write_bytes(corrupt(packed.read_bytes(), 0))
+    assert leecode_cli.main(['unframe', str(packed), str(out), '--replace', '--workers', '0']) == 1
+    assert "block 0 is corrupt" in capsys.readouterr().err
+    assert out.read_text(encoding='utf-8') == '�' * 4 + "ed text"
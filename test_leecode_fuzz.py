@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the differential fuzzer: every engine agrees with the reference,
+and a broken engine is caught and shrunk to a minimal input.
+"""
+
+import pytest
+
+import leecode_cli
+from leecode_core import get_codec
+from leecode_fuzz import Backend, backends, check, fuzz, reference_decode, reference_encode, shrink
+
+THREE_DIGIT = {f"{100 + i:03d}": char for i, char in enumerate(get_codec().char_to_number)}
+
+@pytest.mark.parametrize('codec', [None, THREE_DIGIT], ids=['leecode', 'three-digit'])
+def test_all_engines_agree(codec):
+    assert fuzz(60, seed=1, codec=codec) == []
+
+def test_reference_matches_original_cases():
+    codec = get_codec()
+    assert reference_encode("a  b—") == codec.encode("a b—")
+    assert reference_decode(" -".join(codec.encode("a b"))) == "a b"
+    with pytest.raises(ValueError, match="Code '98' not found"):
+        reference_decode(codec.encode("a") + "98")
+    with pytest.raises(ValueError, match="length must be even"):
+        reference_decode(codec.encode("a") + "980")
+    with pytest.raises(ValueError, match="Code '98' not found"):
+        reference_decode(codec.encode("a") + "980", streaming=True)
+    with pytest.raises(ValueError, match=r"Unicode: 8364"):
+        reference_encode("a€")
+
+def test_backends_cover_both_modes():
+    names = {(backend.name, backend.mode) for backend in backends()}
+    for name in ('core', 'parallel', 'wide', 'buffer', 'stream/1', 'pipeline/3', 'frame/2', 'iter/3'):
+        assert (name, 'encode') in names and (name, 'decode') in names
+
+def test_broken_engine_is_shrunk():
+    codec = get_codec()
+
+    def broken(value, codec):
+        # Drops every em-dash
+        return codec.encode(value.replace('—', ''))
+
+    failures = fuzz(50, seed=2, engines=[Backend('broken', 'encode', broken, False)])
+    assert len(failures) == 1
+    failure = failures[0]
+    assert failure.input == '—'
+    assert failure.expected == ('ok', codec.encode('—'))
+    assert failure.actual == ('ok', '')
+
+def test_stream_order_needs_streaming_flag():
+    stream = next(backend for backend in backends() if backend.name == 'stream/1' and backend.mode == 'decode')
+    assert check("990", stream) is None
+    failures = fuzz(300, seed=0, engines=[stream._replace(streaming=False)])
+    assert [failure.input for failure in failures] == ['990']
+
+def test_shrink_keeps_failing():
+    assert shrink("xxabcxx", lambda value: 'b' in value) == 'b'
+    assert shrink("hello", lambda value: len(value) >= 2) == '  '
+
+def test_cli(capsys):
+    assert leecode_cli.main(['fuzz', '--iterations', '5', '--seed', '3']) == 0
+    assert "agree" in capsys.readouterr().err
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for searching encoded files without decoding them.
+"""
+
+import concurrent.futures
+import gzip
+import multiprocessing
+import re
+from functools import partial
+
+import pytest
+
+import leecode_cli
+import leecode_grep
+from leecode_core import char_to_number, encode, get_codec, register_codec
+from leecode_grep import Match, encode_pattern, grep, search
+
+TEXT = "Hello World — hello again, World! Hello"
+
+def expected(text, pattern, context=0):
+    return [(m.start(), text[max(m.start() - context, 0):m.start()],
+             text[m.start() + len(pattern):m.start() + len(pattern) + context])
+            for m in re.finditer(f'(?={re.escape(pattern)})', text)]
+
+def found(source, pattern, **kwargs):
+    return [(m.offset, m.before, m.after) for m in search(source, pattern, **kwargs)]
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 8, 1 << 20])
+@pytest.mark.parametrize('context', [0, 1, 4])
+def test_search_matches_decoded_search(monkeypatch, chunk_size, context):
+    monkeypatch.setattr(leecode_grep, '_CHUNK_SIZE', chunk_size)
+    code = encode(TEXT).encode('ascii')
+    for pattern in ["World", "Hello", "o", "—", "lo W", "zzz", TEXT]:
+        assert found(code, pattern, context=context) == expected(TEXT, pattern, context)
+    # Separators are skipped, and overlapping matches are all reported
+    spaced = b' '.join(code[i:i + 3] for i in range(0, len(code), 3))
+    assert found(spaced, "o", context=context) == expected(TEXT, "o", context)
+    assert found(encode("aaaa").encode('ascii'), "aa") == [(0, "", ""), (1, "", ""), (2, "", "")]
+
+def test_only_code_aligned_hits_count():
+    # "BA" encodes to 0100, which contains "10" ('K') at an odd offset
+    assert found(encode("BA").encode('ascii'), "K") == []
+    codec = get_codec({f'{i:03d}': char for i, char in enumerate(list(char_to_number) + ['é'])})
+    text = "é é café"
+    assert found(codec.encode(text).encode('ascii'), "é", codec=codec) == expected(text, "é")
+
+def test_damaged_context_does_not_abort():
+    code = ("99" + encode("hello world") + "99" + encode("!") + "9").encode('ascii')
+    assert found(code, "world", context=3) == [(7, "lo ", "\ufffd!")]
+    assert found(code, "!", context=2) == [(13, "d\ufffd", "")]
+
+def test_pattern_errors():
+    with pytest.raises(ValueError, match="not supported"):
+        encode_pattern("é")
+    with pytest.raises(ValueError, match="empty"):
+        encode_pattern("")
+    # Spaces in the pattern are kept, not collapsed
+    assert encode_pattern("a  b") == b"2694942 7".replace(b" ", b"")
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_grep_files(tmp_path, workers):
+    plain = tmp_path / 'a.lc'
+    plain.write_text(encode(TEXT))
+    packed = tmp_path / 'b.lc.gz'
+    packed.write_bytes(gzip.compress(encode("no match here, World").encode('ascii')))
+    empty = tmp_path / 'c.lc'
+    empty.write_bytes(b'')
+    matches = list(grep([plain, packed, empty], "World", context=2, workers=workers))
+    assert matches == [Match(plain, 6, "o ", " —"), Match(plain, 27, ", ", "! "),
+                       Match(packed, 15, ", ", "")]
+
+def test_registered_codec_reaches_spawned_workers(tmp_path, monkeypatch):
+    # Spawned workers start without this process's registered codecs
+    monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor',
+                        partial(concurrent.futures.ProcessPoolExecutor,
+                                mp_context=multiprocessing.get_context('spawn')))
+    codec = register_codec('grep-reversed', dict(zip(char_to_number.values(), reversed(char_to_number))))
+    paths = [tmp_path / 'a.lc', tmp_path / 'b.lc']
+    for path in paths:
+        path.write_text(codec.encode(TEXT))
+    matches = list(grep(paths, "World", codec='grep-reversed', workers=2))
+    assert [(m.path, m.offset) for m in matches] == [(path, offset) for path in paths for offset in (6, 27)]
+
+def test_cli(tmp_path, capsys):
+    path = tmp_path / 'a.lc'
+    path.write_text(encode(TEXT))
+    assert leecode_cli.main(['grep', 'World', str(path), '-C', '1']) == 0
+    assert capsys.readouterr().out.splitlines() == [f"{path}:6: World ", f"{path}:27: World!"]
+    assert leecode_cli.main(['grep', '-c', 'Hello', str(path)]) == 0
+    assert capsys.readouterr().out == f"{path}:2\n"
+    assert leecode_cli.main(['grep', 'absent', str(path)]) == 1
+    path.write_text(encode(TEXT) + "99")
+    assert leecode_cli.main(['grep', 'Hello', str(path), '-C', '2']) == 0
+    assert capsys.readouterr().out.splitlines()[-1] == f"{path}:34:! Hello\ufffd"
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Startup budget: the codec modules import with the standard library only,
+load accelerators lazily, and stay within a measured -X importtime budget.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Modules that must only be loaded on first use
+LAZY = {'json', 'numpy', 'multiprocessing', 'concurrent.futures', 'logging', 'gzip', 'bz2', 'lzma',
+        'kivy', 'streamlit', 'tkinter', 'pyperclip'}
+
+# Cumulative -X importtime budget per module, in microseconds (best of three runs)
+BUDGET_US = {
+    'leecode_core': 15_000,
+    'leecode_codecs': 15_000,
+    'leecode_dispatch': 20_000,
+    'leecode_io': 20_000,
+    'leecode_cli': 40_000,
+}
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def run(*args):
+    """Run python in a fresh interpreter that may write bytecode caches; returns (stdout, stderr)."""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    result = subprocess.run([sys.executable, *args], cwd=HERE, env=env, capture_output=True, text=True, check=True)
+    return result.stdout, result.stderr
+
+@pytest.mark.parametrize('module', sorted(BUDGET_US))
+def test_no_eager_optional_imports(module):
+    out, _ = run('-c', f"import sys, {module}; print(' '.join(sys.modules))")
+    assert LAZY.isdisjoint(out.split())
+
+def test_core_needs_no_regex():
+    out, _ = run('-c', "import sys, leecode_core; print('re' in sys.modules)")
+    assert out.strip() == 'False'
+
+@pytest.mark.parametrize('module', sorted(BUDGET_US))
+def test_import_time_budget(module):
+    run('-c', f"import {module}")  # warm the bytecode cache
+    best = None
+    for _ in range(3):
+        _, err = run('-X', 'importtime', '-c', f"import {module}")
+        line = next(line for line in err.splitlines() if line.rstrip().endswith(f"| {module}"))
+        cumulative = int(line.split('|')[1])
+        best = cumulative if best is None else min(best, cumulative)
+    assert best <= BUDGET_US[module], f"{module} took {best} us to import"
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the n-gram index; every query is checked against a plain search.
+"""
+
+import os
+import random
+import re
+
+import pytest
+
+import leecode_cli
+import leecode_index
+from leecode_core import char_to_number, encode, get_codec
+from leecode_index import NgramIndex
+
+def offsets(text, pattern):
+    return [m.start() for m in re.finditer(f'(?={re.escape(pattern)})', text)]
+
+def random_text(seed, size):
+    rng = random.Random(seed)
+    words = ["alpha", "beta", "gamma", "delta", "Leecode", "—", "index", "x1", "\n"]
+    return ' '.join(rng.choice(words) for _ in range(size))
+
+@pytest.fixture
+def corpus(tmp_path):
+    texts = {tmp_path / f'{i}.lc': random_text(i, 120) for i in range(3)}
+    texts[tmp_path / 'short.lc'] = "ab"
+    for path, text in texts.items():
+        path.write_text(encode(text))
+    # Separators inside the digit stream are skipped
+    wrapped = tmp_path / 'wrapped.lc'
+    code = encode(texts[tmp_path / '0.lc'])
+    wrapped.write_text('\n'.join(code[i:i + 11] for i in range(0, len(code), 11)))
+    texts[wrapped] = texts[tmp_path / '0.lc']
+    return texts
+
+def check(index, texts, patterns):
+    for pattern in patterns:
+        found = sorted((m.path, m.offset) for m in index.search(pattern))
+        assert found == sorted((str(path), offset) for path, text in texts.items()
+                               for offset in offsets(text, pattern)), pattern
+
+@pytest.mark.parametrize('n,block_size', [(3, 16), (2, 5), (4, 1 << 14)])
+def test_search_matches_plain_search(monkeypatch, tmp_path, corpus, n, block_size):
+    monkeypatch.setattr(leecode_index, '_CHUNK_SIZE', 7)
+    with NgramIndex(tmp_path / 'idx', n=n, block_size=block_size) as index:
+        assert index.update(corpus).indexed == 5
+        check(index, corpus, ["alpha", "a", "ab", "b", "— ind", "x1\n", "Leecode gamma", "zzz", "mma d"])
+
+def test_incremental_updates(tmp_path, corpus):
+    with NgramIndex(tmp_path / 'idx', block_size=32) as index:
+        index.update(corpus)
+        assert index.update(corpus) == (0, 5, 0)
+
+        changed = tmp_path / '1.lc'
+        corpus[changed] = "brand new alpha"
+        changed.write_text(encode(corpus[changed]))
+        # Stale files are searched in full until they are re-indexed
+        check(index, corpus, ["new alpha", "alpha"])
+        assert index.update(corpus).indexed == 1
+
+        os.remove(tmp_path / '2.lc')
+        assert index.update(corpus).removed == 1
+        del corpus[tmp_path / '2.lc']
+        check(index, corpus, ["new alpha", "alpha", "gamma"])
+        assert len(index.files) == 4
+
+    # The index reopens from disk with its own settings
+    with NgramIndex(tmp_path / 'idx', n=5) as index:
+        assert index.n == 3 and index.block_size == 32
+        check(index, corpus, ["delta"])
+
+def test_segments_flush_and_are_dropped(monkeypatch, tmp_path, corpus):
+    monkeypatch.setattr(leecode_index, '_SEGMENT_POSTINGS', 10)
+    with NgramIndex(tmp_path / 'idx', block_size=8) as index:
+        index.update(corpus)
+        segments = [name for name in os.listdir(tmp_path / 'idx') if name.endswith('.bin')]
+        assert len(segments) > 1
+        check(index, corpus, ["beta", "Leecode"])
+        index.remove(list(corpus))
+        assert index.files == [] and index.search("beta") == []
+        index.update([])
+    assert [name for name in os.listdir(tmp_path / 'idx') if name.endswith('.bin')] == []
+
+def test_three_digit_codec(tmp_path):
+    codec = get_codec({f'{i:03d}': char for i, char in enumerate(list(char_to_number) + ['é'])})
+    text = "café é crème brûlée"[:6] * 20
+    path = tmp_path / 'a.lc'
+    path.write_text(codec.encode(text))
+    with NgramIndex(tmp_path / 'idx', codec=codec, block_size=7) as index:
+        index.update([path])
+        check(index, {path: text}, ["é c", "é", "café"])
+    with pytest.raises(ValueError, match="not supported"):
+        NgramIndex(tmp_path / 'idx').search("ü")
+
+def test_cli(tmp_path, capsys):
+    path = tmp_path / 'a.lc'
+    path.write_text(encode("find the needle here"))
+    assert leecode_cli.main(['index', str(tmp_path / 'idx'), str(path)]) == 0
+    assert leecode_cli.main(['index', str(tmp_path / 'idx')]) == 0
+    assert "unchanged 1" in capsys.readouterr().err
+    assert leecode_cli.main(['query', str(tmp_path / 'idx'), 'needle']) == 0
+    assert capsys.readouterr().out == f"{path}:9\n"
+    assert leecode_cli.main(['query', str(tmp_path / 'idx'), 'absent']) == 1
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming file I/O and compressed archives.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import random
+import time
+import types
+import zlib
+
+import pytest
+
+import leecode_cli
+import leecode_io
+from leecode_core import clean_input, encode
+from leecode_io import (
+    PrefetchReader, compression_for, decode_file, encode_file, format_report, pipeline_stream, transcode_stream,
+    verify_file, verify_stream,
+)
+
+TEXT = "Hello   World — streamed\r\n" * 500 + "end  "
+
+def test_compression_for():
+    assert compression_for('out.txt.gz') == 'gzip'
+    assert compression_for('out.BZ2') == 'bz2'
+    assert compression_for('out.lzma') == 'xz'
+    assert compression_for('out.txt') is None
+    assert compression_for('out.gz', 'none') is None
+    assert compression_for('out.txt', 'xz') == 'xz'
+    with pytest.raises(ValueError, match="Unknown compression"):
+        compression_for('out.txt', 'zip')
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1 << 20])
+def test_transcode_stream_matches_codec(chunk_size):
+    dst = io.BytesIO()
+    transcode_stream(io.BytesIO(TEXT.encode('utf-8')), dst, 'encode', chunk_size=chunk_size)
+    assert dst.getvalue() == encode(TEXT).encode('ascii')
+    back = io.BytesIO()
+    transcode_stream(io.BytesIO(dst.getvalue()), back, 'decode', chunk_size=chunk_size)
+    assert back.getvalue().decode('utf-8') == clean_input(TEXT)
+
+@pytest.mark.parametrize('suffix,module', [('.gz', gzip), ('.bz2', bz2), ('.xz', lzma)])
+@pytest.mark.parametrize('threaded', [True, False])
+def test_compressed_round_trip(tmp_path, suffix, module, threaded):
+    plain = tmp_path / 'plain.txt'
+    plain.write_bytes(TEXT.encode('utf-8'))
+    archive = tmp_path / ('encoded.lc' + suffix)
+    encode_file(plain, archive, chunk_size=100, threaded=threaded)
+    assert module.decompress(archive.read_bytes()) == encode(TEXT).encode('ascii')
+
+    restored = tmp_path / ('restored.txt' + suffix)
+    read, written = decode_file(archive, restored, chunk_size=100, threaded=threaded)
+    assert module.decompress(restored.read_bytes()).decode('utf-8') == clean_input(TEXT)
+    assert read == len(encode(TEXT)) and written == len(clean_input(TEXT).encode('utf-8'))
+
+def test_errors_propagate_from_threads(tmp_path):
+    bad = tmp_path / 'bad.lc'
+    bad.write_bytes(b'0798')
+    with pytest.raises(ValueError, match="Code '98'"):
+        decode_file(bad, tmp_path / 'out.txt.gz')
+
+def test_cli_flags_override_extension(tmp_path, capsys):
+    plain = tmp_path / 'plain.txt'
+    plain.write_text("Hi  there", encoding='utf-8')
+    packed = tmp_path / 'packed.bin'
+    assert leecode_cli.main(['encode', str(plain), str(packed), '--compress', 'gzip']) == 0
+    assert gzip.decompress(packed.read_bytes()) == encode("Hi there").encode('ascii')
+    out = tmp_path / 'out.txt'
+    assert leecode_cli.main(['decode', str(packed), str(out), '--decompress', 'gzip']) == 0
+    assert out.read_text(encoding='utf-8') == "Hi there"
+    plain.write_text("123", encoding='utf-8')
+    assert leecode_cli.main(['decode', str(plain), str(out)]) == 1
+    assert "Error:" in capsys.readouterr().err
+
+@pytest.mark.parametrize('chunk_size,buffers', [(1, 1), (7, 2), (1 << 20, 3)])
+def test_pipeline_matches_codec(chunk_size, buffers):
+    dst = io.BytesIO()
+    report = pipeline_stream(io.BytesIO(TEXT.encode('utf-8')), dst, 'encode', chunk_size=chunk_size, buffers=buffers)
+    assert dst.getvalue() == encode(TEXT).encode('ascii')
+    assert (report.bytes_read, report.bytes_written) == (len(TEXT.encode('utf-8')), len(dst.getvalue()))
+    back = io.BytesIO()
+    pipeline_stream(io.BytesIO(dst.getvalue()), back, 'decode', chunk_size=chunk_size, buffers=buffers)
+    assert back.getvalue().decode('utf-8') == clean_input(TEXT)
+
+def test_prefetch_reader_reuses_buffers():
+    reader = PrefetchReader(io.BytesIO(b'abcdefgh'), chunk_size=3, depth=2)
+    chunks = []
+    while chunk := reader.read():
+        chunks.append(bytes(chunk))
+    reader.close()
+    assert chunks == [b'abc', b'def', b'gh']
+    assert reader.read() == b''
+
+def test_pipeline_errors_propagate():
+    with pytest.raises(ValueError, match="Code '98'"):
+        pipeline_stream(io.BytesIO(b'07' * 100 + b'98'), io.BytesIO(), 'decode', chunk_size=16)
+
+    class Broken(io.BytesIO):
+        def write(self, data):
+            raise OSError("disk full")
+    with pytest.raises(OSError, match="disk full"):
+        pipeline_stream(io.BytesIO(TEXT.encode('utf-8')), Broken(), 'encode', chunk_size=64)
+
+def test_pipeline_reports_slow_stage():
+    class SlowDisk(io.BytesIO):
+        def write(self, data):
+            time.sleep(0.01)
+            return super().write(data)
+    report = pipeline_stream(io.BytesIO(TEXT.encode('utf-8')), SlowDisk(), 'encode', chunk_size=1024)
+    assert report.write.busy > report.codec.busy
+    # The codec waits on the full output queue while the writer works
+    assert report.codec.stalled > 0
+    assert "bottleneck: write" in format_report(report)
+
+def test_cli_stats(tmp_path, capsys):
+    plain = tmp_path / 'plain.txt'
+    plain.write_text(TEXT, encoding='utf-8')
+    assert leecode_cli.main(['encode', str(plain), str(tmp_path / 'out.lc'), '--stats']) == 0
+    err = capsys.readouterr().err
+    assert "bottleneck:" in err and "codec busy" in err
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 1 << 20])
+def test_verify_stream(chunk_size):
+    dst = io.BytesIO()
+    report = verify_stream(io.BytesIO(TEXT.encode('utf-8')), dst, chunk_size=chunk_size)
+    assert dst.getvalue() == encode(TEXT).encode('ascii')
+    assert report.mismatch is None
+    assert report.symbols == len(clean_input(TEXT))
+    assert report.source_crc == report.decoded_crc == zlib.crc32(clean_input(TEXT).encode('utf-8'))
+    assert (report.bytes_read, report.bytes_written) == (len(TEXT.encode('utf-8')), len(dst.getvalue()))
+
+def test_verify_reports_first_mismatch(monkeypatch):
+    info = leecode_io.codec_info(None)
+
+    class Corrupting(info.incrementaldecoder):
+        def decode(self, data, final=False):
+            return super().decode(data, final).replace('W', 'w')
+
+    monkeypatch.setattr(leecode_io, 'codec_info', lambda codec: types.SimpleNamespace(
+        incrementalencoder=info.incrementalencoder, incrementaldecoder=Corrupting))
+    report = verify_stream(io.BytesIO(TEXT.encode('utf-8')), None, chunk_size=5)
+    assert report.mismatch == clean_input(TEXT).index('W')
+    assert report.source_crc != report.decoded_crc
+
+def test_verify_catches_encoder_space_bugs(monkeypatch):
+    info = leecode_io.codec_info(None)
+
+    class Forgetful(info.incrementalencoder):
+        def encode(self, input, final=False):
+            # Loses track of space runs that straddle chunks
+            self.after_space = False
+            return super().encode(input, final)
+
+    monkeypatch.setattr(leecode_io, 'codec_info', lambda codec: types.SimpleNamespace(
+        incrementalencoder=Forgetful, incrementaldecoder=info.incrementaldecoder))
+    report = verify_stream(io.BytesIO(b"ab    cd"), None, chunk_size=3)
+    assert report.mismatch == 3
+
+def test_verify_space_runs_across_chunks():
+    rng = random.Random(5)
+    for _ in range(200):
+        text = ''.join(rng.choice("a  —") for _ in range(rng.randrange(30)))
+        report = verify_stream(io.BytesIO(text.encode('utf-8')), None, chunk_size=rng.randint(1, 5))
+        assert report.mismatch is None
+        assert report.symbols == len(clean_input(text))
+
+def test_verify_errors_propagate():
+    with pytest.raises(ValueError, match="Unicode: 8364"):
+        verify_stream(io.BytesIO("abc€".encode('utf-8')), io.BytesIO(), chunk_size=2)
+
+def test_cli_verify(tmp_path, capsys):
+    plain = tmp_path / 'plain.txt'
+    plain.write_text(TEXT, encoding='utf-8')
+    assert leecode_cli.main(['encode', str(plain), str(tmp_path / 'out.lc.gz'), '--verify']) == 0
+    assert f"Verified {len(clean_input(TEXT))} characters" in capsys.readouterr().err
+    assert gzip.decompress((tmp_path / 'out.lc.gz').read_bytes()) == encode(TEXT).encode('ascii')
+    assert verify_file(str(plain)).mismatch is None
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental directory mirror.
+"""
+
+import concurrent.futures
+import multiprocessing
+import os
+from functools import partial
+
+import pytest
+
+import leecode_cli
+from leecode_core import clean_input, decode, encode, get_codec, register_codec
+from leecode_mirror import MANIFEST_NAME, mirror, watch
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+
+@pytest.fixture
+def tree(tmp_path):
+    src = tmp_path / 'src'
+    write(src / 'a.txt', "Hello  World")
+    write(src / 'sub' / 'b.txt', "Em — dash")
+    write(src / 'sub' / 'deep' / 'c.txt', "x" * 5000)
+    return src
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_mirror_round_trip(tmp_path, tree, workers):
+    enc = tmp_path / 'enc'
+    result = mirror(tree, enc, workers=workers, batch_bytes=10)
+    assert (result.processed, result.skipped, result.removed, result.errors) == (3, 0, 0, [])
+    assert decode((enc / 'sub' / 'b.txt.lc').read_text()) == "Em — dash"
+    assert (enc / MANIFEST_NAME).exists()
+
+    dec = tmp_path / 'dec'
+    assert mirror(enc, dec, mode='decode', workers=workers).processed == 3
+    assert (dec / 'a.txt').read_text(encoding='utf-8') == clean_input("Hello  World")
+
+def test_registered_codec_reaches_spawned_workers(tmp_path, tree, monkeypatch):
+    # Spawned workers start without this process's registered codecs
+    monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor',
+                        partial(concurrent.futures.ProcessPoolExecutor,
+                                mp_context=multiprocessing.get_context('spawn')))
+    reversed_codec = dict(zip(get_codec().char_to_number.values(), reversed(get_codec().char_to_number)))
+    register_codec('mirror-reversed', reversed_codec)
+    enc = tmp_path / 'enc'
+    result = mirror(tree, enc, codec='mirror-reversed', workers=2, batch_bytes=10)
+    assert (result.processed, result.errors) == (3, [])
+    assert get_codec('mirror-reversed').decode((enc / 'a.txt.lc').read_text()) == clean_input("Hello  World")
+    assert mirror(tree, enc, codec='mirror-reversed').skipped == 3
+
+def test_mirror_skips_unchanged_and_prunes(tmp_path, tree):
+    enc = tmp_path / 'enc'
+    mirror(tree, enc)
+    assert mirror(tree, enc).skipped == 3
+
+    # Touched but identical content is skipped after a hash check
+    stat = os.stat(tree / 'a.txt')
+    os.utime(tree / 'a.txt', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    write(tree / 'sub' / 'b.txt', "Changed")
+    os.remove(tree / 'sub' / 'deep' / 'c.txt')
+    result = mirror(tree, enc)
+    assert (result.processed, result.skipped, result.removed) == (1, 1, 1)
+    assert (enc / 'sub' / 'b.txt.lc').read_text() == encode("Changed")
+    assert not (enc / 'sub' / 'deep' / 'c.txt.lc').exists()
+
+    # A different codec invalidates the whole manifest
+    swapped = {'00': 'C', '01': 'h', '02': 'a', '03': 'n', '04': 'g', '05': 'e', '06': 'd',
+               '07': 'H', '08': 'l', '09': 'o', '10': ' ', '11': 'W', '12': 'r'}
+    assert mirror(tree, enc, codec=swapped).processed == 2
+
+def test_mirror_reports_failures_and_retries(tmp_path, tree):
+    write(tree / 'bad.txt', "é")
+    enc = tmp_path / 'enc'
+    result = mirror(tree, enc)
+    assert [path for path, _ in result.errors] == ['bad.txt']
+    assert not (enc / 'bad.txt.lc').exists() and not (enc / 'bad.txt.lc.part').exists()
+    write(tree / 'bad.txt', "e")
+    assert mirror(tree, enc).processed == 1
+
+def test_decode_only_takes_encoded_files(tmp_path, tree):
+    enc = tmp_path / 'enc'
+    mirror(tree, enc)
+    write(enc / 'README', "not encoded")
+    dec = tmp_path / 'dec'
+    result = mirror(enc, dec, mode='decode')
+    assert (result.processed, result.errors) == (3, [])
+    assert not (dec / 'README').exists()
+
+def test_failed_file_target_is_still_pruned(tmp_path, tree):
+    enc = tmp_path / 'enc'
+    mirror(tree, enc)
+    write(tree / 'a.txt', "é")
+    assert [path for path, _ in mirror(tree, enc).errors] == ['a.txt']
+    os.remove(tree / 'a.txt')
+    assert mirror(tree, enc).removed == 1
+    assert not (enc / 'a.txt.lc').exists()
+
+def test_watch_and_cli(tmp_path, tree):
+    updates = []
+    watch(tree, tmp_path / 'enc', interval=0, rounds=2, on_update=updates.append)
+    assert len(updates) == 1 and updates[0].processed == 3
+    assert leecode_cli.main(['mirror', str(tree), str(tmp_path / 'enc'), '--workers', '0']) == 0
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests for the NumPy engine: results and error messages must match the core codec.
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from leecode_core import char_to_number, get_codec
+from leecode_fuzz import outcome
+from leecode_numpy import decode, encode
+
+WIDE = {f"{100 + i:03d}": char for i, char in enumerate(char_to_number)}
+
+@pytest.mark.parametrize('mapping', [None, WIDE])
+def test_matches_codec(mapping):
+    codec = get_codec(mapping)
+    rng = random.Random(7)
+    alphabet = ''.join(codec.char_to_number) + '  '
+    for size in (1, 2, 17, 1000):
+        text = ''.join(rng.choice(alphabet) for _ in range(size))
+        code = codec.encode(text)
+        assert encode(text, codec) == code
+        assert decode(code, codec) == codec.decode(code)
+        assert decode(' '.join(code), codec) == codec.decode(code)
+
+@pytest.mark.parametrize('mapping', [None, WIDE])
+def test_errors_match_codec(mapping):
+    codec = get_codec(mapping)
+    for text in ["abc€", "\U0001F600", "ok" * 50 + "\x01"]:
+        assert outcome(encode, text, codec) == outcome(codec.encode, text)
+    for code in ["1", "99" * 3, "1 2 3", "0" * (codec.width * 5) + "9" * codec.width]:
+        assert outcome(decode, code, codec) == outcome(codec.decode, code)
+
+def test_empty():
+    assert encode("") == ""
+    assert decode("") == ""
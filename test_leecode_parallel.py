@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the thread-pool backend; sharding is forced so it runs on GIL builds too.
+"""
+
+import random
+
+import pytest
+
+import leecode_parallel
+from leecode_core import DEFAULT_CODEC, char_to_number, clean_input, get_codec
+from leecode_fuzz import outcome
+from leecode_parallel import (
+    decode, decode_into, decode_many, encode, encode_into, encode_many, gil_enabled, shard_size,
+)
+
+@pytest.fixture(autouse=True)
+def small_shards(monkeypatch):
+    monkeypatch.setattr(leecode_parallel, '_MIN_SHARD', 5)
+    monkeypatch.setattr(leecode_parallel, '_MIN_ITEMS', 2)
+
+def random_text(rng, size):
+    alphabet = ''.join(char_to_number) + ' ' * 20
+    return ''.join(rng.choice(alphabet) for _ in range(size))
+
+def test_shard_size_follows_gil():
+    assert shard_size(1000, workers=4, parallel=False) == 1000
+    assert shard_size(1000, workers=4, parallel=True, minimum=1) == 125
+    assert shard_size(1000, workers=1, parallel=True) == 1000
+    if gil_enabled():
+        assert shard_size(10**9, workers=8) == 10**9
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_large_paths_match_codec(parallel):
+    rng = random.Random(35)
+    for size in (0, 1, 7, 200):
+        text = random_text(rng, size) + "a     b"
+        encoded = DEFAULT_CODEC.encode(text)
+        assert encode(text, workers=4, parallel=parallel) == encoded
+        assert decode(encoded[:3] + " \n" + encoded[3:], workers=4, parallel=parallel) == clean_input(text)
+
+        dst = bytearray(4 * len(text.encode('utf-8')) + 8)
+        written = encode_into(text.encode('utf-8'), dst, workers=4, parallel=parallel)
+        assert dst[:written] == encoded.encode('ascii')
+        out = bytearray(2 * len(encoded) + 8)
+        written = decode_into(dst[:written], out, workers=4, parallel=parallel)
+        assert out[:written].decode('utf-8') == clean_input(text)
+
+def test_large_paths_errors_match():
+    text = "a" * 40 + "é" + "b" * 40 + "ü"
+    assert outcome(encode, text, workers=4, parallel=True) == outcome(DEFAULT_CODEC.encode, text)
+    for code in ["00" * 30 + "98" + "00" * 30 + "99", "00" * 30 + "1", "00" * 20 + "99" + "0"]:
+        assert outcome(decode, code, workers=4, parallel=True) == outcome(DEFAULT_CODEC.decode, code)
+    assert "too small" in outcome(encode_into, b"abcdefghijkl", bytearray(10), workers=4, parallel=True)[1]
+
+def test_batch_paths_renumber_errors():
+    items = ["ok", "bad é", "x", "y", "z", "also bad ü"]
+    results = encode_many(items, workers=3, parallel=True)
+    assert results == DEFAULT_CODEC.encode_many(items)
+    assert [r.index for r in results if not isinstance(r, str)] == [1, 5]
+    codes = ["0714", "123", "00", "9899", "30"]
+    assert decode_many(codes, workers=3, parallel=True) == DEFAULT_CODEC.decode_many(codes)
+
+def test_three_digit_codec():
+    codec = get_codec({f'{i:03d}': char for i, char in enumerate(list(char_to_number) + list('éü'))})
+    text = "éü  Hello" * 30
+    encoded = codec.encode(text)
+    assert encode(text, codec, workers=4, parallel=True) == encoded
+    assert decode(encoded, codec, workers=4, parallel=True) == codec.decode(encoded)
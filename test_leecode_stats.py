@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for corpus statistics; counts are checked against a direct count of clean_input.
+"""
+
+import csv
+import gzip
+import io
+import json
+import re
+from collections import Counter
+
+import pytest
+
+import leecode_cli
+import leecode_stats
+from leecode_core import char_to_number, clean_input, encode, number_to_char
+from leecode_stats import collect_stats, merge_stats, write_csv, write_json
+
+TEXT = ("Hello   World — 42!\n" * 30 + " " * 50 + "tabs\t\tand  é ünsupported   " + "—" * 7) * 3
+
+def expected_counts(text):
+    cleaned = Counter(clean_input(text))
+    return {code: cleaned[char] for code, char in number_to_char.items()}
+
+@pytest.fixture(params=[False, True], ids=['bytes-count', 'numpy'])
+def backend(request, monkeypatch):
+    if request.param:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(leecode_stats, '_numpy', False)
+
+@pytest.mark.parametrize('chunk_size,shard_size', [(1, 1 << 30), (5, 17), (1 << 20, 64)])
+def test_plain_and_encoded_counts(tmp_path, monkeypatch, backend, chunk_size, shard_size):
+    monkeypatch.setattr(leecode_stats, '_CHUNK_SIZE', chunk_size)
+    plain = tmp_path / 'a.txt'
+    plain.write_bytes(TEXT.encode('utf-8'))
+    stats = collect_stats([plain], shard_size=shard_size)
+    cleaned = clean_input(TEXT)
+    assert stats.counts == expected_counts(TEXT)
+    assert stats.symbols == len(cleaned) and stats.unsupported == 6
+    assert stats.space_runs == len(re.findall(' {2,}', TEXT))
+    assert stats.spaces_removed == len(TEXT) - len(cleaned)
+    assert stats.bytes == len(TEXT.encode('utf-8'))
+
+    supported = TEXT.replace('é', 'e').replace('ü', 'u')
+    encoded = tmp_path / 'a.lc'
+    encoded.write_text(encode(supported))
+    stats = collect_stats([encoded], shard_size=shard_size)
+    assert stats.counts == expected_counts(supported)
+    assert (stats.unsupported, stats.space_runs) == (0, 0)
+
+def test_encoded_separators_unknown_and_partial_codes(tmp_path):
+    path = tmp_path / 'b.lc'
+    # Wrapped lines force a single-shard recount after a split
+    path.write_text("0714\n94\n9899\n0")
+    stats = collect_stats([path], shard_size=3)
+    assert stats.counts['07'] == stats.counts['14'] == stats.counts['94'] == 1
+    assert stats.symbols == 6 and stats.unsupported == 3
+
+def test_merge_parallel_and_compressed(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'{i}.txt.gz'
+        path.write_bytes(gzip.compress(("abc  " * (i + 1)).encode()))
+        paths.append(path)
+    stats = collect_stats(paths, workers=2)
+    assert stats == merge_stats(collect_stats([path]) for path in paths)
+    assert stats.counts[char_to_number['a']] == 6 and stats.space_runs == 6
+    assert collect_stats([]).symbols == 0
+
+def test_reports(tmp_path, capsys):
+    stats = collect_stats([])
+    out = io.StringIO()
+    write_csv(stats, out)
+    rows = list(csv.reader(io.StringIO(out.getvalue(), newline="")))
+    assert rows[0] == ['code', 'char', 'count', 'share'] and len(rows) == 99
+    out = io.StringIO()
+    write_json(stats, out)
+    report = json.loads(out.getvalue())
+    assert report['symbols'] == 0 and len(report['codes']) == 98
+    assert {row['char'] for row in report['codes']} == set(char_to_number)
+
+    path = tmp_path / 'a.txt'
+    path.write_text("aab", encoding='utf-8')
+    assert leecode_cli.main(['stats', str(path), '--workers', '0']) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report['symbols'] == 3
+    row = next(row for row in report['codes'] if row['char'] == 'a')
+    assert row['count'] == 2 and row['share'] == pytest.approx(2 / 3, abs=1e-6)
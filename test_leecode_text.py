@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the lazy LeecodeText view.
+"""
+
+import mmap
+import random
+
+import pytest
+
+import leecode_text
+from leecode_core import char_to_number, decode, encode, get_codec
+from leecode_text import LeecodeText
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(leecode_text, '_RAW_BLOCK', 7)
+    monkeypatch.setattr(leecode_text, '_SCAN_BLOCK', 5)
+
+def random_text(seed, size):
+    rng = random.Random(seed)
+    return ''.join(rng.choice(''.join(char_to_number)) for _ in range(size)).replace('  ', ' x')
+
+@pytest.mark.parametrize('make', [
+    lambda code: code,
+    lambda code: code.encode('ascii'),
+    lambda code: bytearray(code.encode('ascii')),
+    # Separators between codes are skipped like decode() does
+    lambda code: ' '.join(code[i:i + 5] for i in range(0, len(code), 5)),
+    lambda code: '\n'.join(code[i:i + 9] for i in range(0, len(code), 9)).encode('ascii'),
+])
+def test_view_behaves_like_decoded_str(make):
+    text = random_text(36, 150)
+    view = LeecodeText(make(encode(text)), block_size=4, max_blocks=3)
+    assert len(view) == len(text)
+    assert str(view) == text and ''.join(view) == text
+    for i in (0, 1, 37, -1, -150):
+        assert view[i] == text[i]
+    for key in (slice(3, 40), slice(None, None, 3), slice(100, 2, -7), slice(-5, None), slice(9, 3)):
+        assert view[key] == text[key]
+    assert len(view._blocks) <= 3
+    with pytest.raises(IndexError):
+        view[150]
+
+def test_find_and_startswith():
+    text = "Hello World, hello Leecode — the end"
+    view = LeecodeText(encode(text))
+    for sub in ["World", "ello", "end", "—", "missing", "", "Hello World, hello"]:
+        assert view.find(sub) == text.find(sub)
+        assert view.find(sub, 3, 30) == text.find(sub, 3, 30)
+    assert view.startswith("Hello") and view.startswith(("x", "He"))
+    assert view.startswith("World", 6) and not view.startswith("World")
+    assert "Leecode" in view
+    with pytest.raises(ValueError):
+        view.index("absent")
+
+def test_errors_are_lazy_and_match_decode():
+    with pytest.raises(ValueError, match="even"):
+        LeecodeText("0714 3")
+    view = LeecodeText("0714" + "98" + "0714", block_size=1)
+    assert view[:2] == "HO" and view[3] == "H"
+    with pytest.raises(ValueError, match="Code '98'"):
+        view[2]
+
+def test_mmap_and_three_digit_codec(tmp_path):
+    codec = get_codec({f'{i:03d}': char for i, char in enumerate(list(char_to_number) + ['é'])})
+    text = "café " * 40
+    path = tmp_path / 'blob.lc'
+    path.write_bytes(codec.encode(text).encode('ascii'))
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = LeecodeText(mapped, codec)
+        assert len(view) == len(text)
+        assert view[3] == 'é' and view.find("é c") == 3
+        assert view[-5:] == text[-5:]
+        view.close()
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with LeecodeText(mapped, codec) as view:
+            assert view[:4] == "café"
+        with pytest.raises(ValueError):
+            view[0]
+
+def test_default_codec_round_trip():
+    code = encode("abc")
+    assert str(LeecodeText(code)) == decode(code)
+    assert list(LeecodeText("")) == [] and len(LeecodeText(b"")) == 0
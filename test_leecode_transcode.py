@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSONL/CSV field transcoder.
+"""
+
+import io
+import json
+
+import pytest
+
+from leecode_core import decode, encode
+from leecode_transcode import main, transcode_csv, transcode_jsonl
+
+JSONL = (
+    '{"id": 1, "msg": "Hello World!", "meta": {"note": "a  b"}}\n'
+    '{"id": 2, "other": "untouched",   "spacing": true}\n'
+    '\n'
+    '{"id": 3, "msg": "Bye", "meta": {"note": 5}}\n'
+)
+
+def run_jsonl(text, fields, **kwargs):
+    dst = io.StringIO()
+    transcode_jsonl(io.StringIO(text), dst, fields, **kwargs)
+    return dst.getvalue()
+
+def test_jsonl_encodes_selected_fields():
+    lines = run_jsonl(JSONL, ['msg', 'meta.note']).splitlines(keepends=True)
+    first = json.loads(lines[0])
+    assert first['msg'] == encode("Hello World!")
+    assert first['meta']['note'] == encode("a  b")
+    assert first['id'] == 1
+    # Lines without the selected keys keep their original bytes
+    assert lines[1] == JSONL.splitlines(keepends=True)[1]
+    assert lines[2] == '\n'
+    assert json.loads(lines[3])['meta']['note'] == 5
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_jsonl_round_trip(workers):
+    encoded = run_jsonl(JSONL, ['msg'], batch_size=1, workers=workers)
+    decoded = run_jsonl(encoded, ['msg'], mode='decode', batch_size=1, workers=workers)
+    assert [json.loads(line).get('msg') for line in decoded.splitlines() if line] == ["Hello World!", None, "Bye"]
+
+def test_jsonl_errors():
+    bad = '{"msg": "ok"}\n{"msg": "é"}\n'
+    with pytest.raises(ValueError, match="Line 2, field 'msg'"):
+        run_jsonl(bad, ['msg'])
+    kept = run_jsonl(bad, ['msg'], errors='keep').splitlines()
+    assert json.loads(kept[1])['msg'] == "é"
+
+def test_jsonl_escaped_keys():
+    # Keys written with \uXXXX escapes must not slip past the line prefilter
+    text = '{"\\u006dsg": "Hi"}\n{"caf\\u00e9": "Hi"}\n{"other": "Hi"}\n'
+    lines = run_jsonl(text, ['msg', 'café']).splitlines()
+    assert json.loads(lines[0]) == {'msg': encode("Hi")}
+    assert json.loads(lines[1]) == {'café': encode("Hi")}
+    assert lines[2] == '{"other": "Hi"}'
+
+def test_jsonl_keeps_unselected_bytes():
+    # Only the selected values are rewritten; numbers, spacing, escapes and duplicates stay as written
+    line = '{"big":1e400,"pi":3.14159265358979323846,"n":"caf\\u00e9","msg":"Hi","msg":"Yo"}\n'
+    out = run_jsonl(line, ['msg'])
+    assert out == ('{"big":1e400,"pi":3.14159265358979323846,"n":"caf\\u00e9",'
+                   f'"msg":"{encode("Hi")}","msg":"{encode("Yo")}"}}\n')
+    # A line whose values all fail under errors='keep' is left byte-identical
+    kept = '{"msg" :  "\\u00e9", "x": 1.0}\n'
+    assert run_jsonl(kept, ['msg'], errors='keep') == kept
+    with pytest.raises(ValueError, match="Line 1: Expecting"):
+        run_jsonl('{"msg": "Hi",}\n', ['msg'])
+    assert run_jsonl('["msg"]\n', ['msg']) == '["msg"]\n'
+
+def test_csv_transcodes_columns():
+    src = io.StringIO('id,name,note\n1,Alice,"x, y"\n2,Bob,z\n')
+    dst = io.StringIO()
+    assert transcode_csv(src, dst, ['name', 'note']) == 2
+    rows = dst.getvalue().splitlines()
+    assert rows[0] == 'id,name,note'
+    assert rows[1] == f"1,{encode('Alice')},{encode('x, y')}"
+
+    back = io.StringIO()
+    transcode_csv(io.StringIO(dst.getvalue()), back, ['name'], mode='decode')
+    assert back.getvalue().splitlines()[2] == f"2,Bob,{encode('z')}"
+
+def test_csv_errors():
+    with pytest.raises(ValueError, match="Column 'missing'"):
+        transcode_csv(io.StringIO('a\n1\n'), io.StringIO(), ['missing'])
+    with pytest.raises(ValueError, match="Row 3, column 1"):
+        transcode_csv(io.StringIO('a\n00\n123\n'), io.StringIO(), ['a'], mode='decode')
+
+def test_cli(tmp_path):
+    src = tmp_path / 'in.csv'
+    dst = tmp_path / 'out.csv'
+    src.write_text('name\nHi\n', encoding='utf-8')
+    assert main(['encode', str(src), str(dst), '--fields', 'name']) == 0
+    assert decode(dst.read_text(encoding='utf-8').splitlines()[1]) == "Hi"
+
+def test_cli_tsv(tmp_path):
+    src = tmp_path / 'in.tsv'
+    dst = tmp_path / 'out.tsv'
+    src.write_text('id\tname\n1\tHi, there\n', encoding='utf-8')
+    assert main(['encode', str(src), str(dst), '--fields', 'name']) == 0
+    assert dst.read_text(encoding='utf-8').splitlines()[1] == f"1\t{encode('Hi, there')}"
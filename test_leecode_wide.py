@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for the wide-table engine: results and error messages must match the core codec.
+"""
+
+import random
+
+import pytest
+
+from leecode_core import char_to_number, get_codec
+from leecode_fuzz import outcome
+from leecode_wide import _fold_groups, _tables_for, decode, encode
+
+WIDE = {f"{100 + i:03d}": char for i, char in enumerate(char_to_number)}
+
+def test_tables():
+    codec = get_codec()
+    groups, _, pairs = _tables_for(codec)
+    assert len(groups) == 10000
+    assert groups[int(char_to_number['h'] + char_to_number['i'])] == 'hi'
+    assert groups[9999] is None or '99' in codec.number_to_char
+    assert pairs['hi'] == char_to_number['h'] + char_to_number['i']
+
+def test_fold_groups():
+    folded = memoryview(_fold_groups(b'000112349999')).cast('H')
+    assert list(folded) == [1, 1234, 9999]
+
+@pytest.mark.parametrize('mapping', [None, WIDE])
+def test_matches_codec(mapping):
+    codec = get_codec(mapping)
+    rng = random.Random(11)
+    alphabet = ''.join(codec.char_to_number) + '  '
+    for size in range(0, 12):
+        for _ in range(20):
+            text = ''.join(rng.choice(alphabet) for _ in range(size))
+            code = codec.encode(text)
+            assert encode(text, codec) == code
+            assert decode(code, codec) == codec.decode(code)
+            assert decode(' '.join(code), codec) == codec.decode(code)
+    ascii_text = ''.join(rng.choice('abc xyz!') for _ in range(1001))
+    assert encode(ascii_text, codec) == codec.encode(ascii_text)
+
+@pytest.mark.parametrize('mapping', [None, WIDE])
+def test_errors_match_codec(mapping):
+    codec = get_codec(mapping)
+    for text in ["abc€", "\U0001F600", "ok" * 50 + "\x01", "a\x01", "\x01a", "é\x02"]:
+        assert outcome(encode, text, codec) == outcome(codec.encode, text)
+    unknown = next(f"{i:02d}" for i in range(100) if f"{i:02d}" not in codec.number_to_char)
+    valid = next(iter(codec.number_to_char))
+    for code in ["1", "123", "1 2 3", unknown, valid + unknown, unknown + valid,
+                 valid * 3 + unknown, valid * 2 + unknown + "1"]:
+        assert outcome(decode, code, codec) == outcome(codec.decode, code)